@@ -1,10 +1,18 @@
 from typing import Dict, Any, List, Optional
 from langchain_openai import ChatOpenAI
 
+from supervisor_modules.utils.tracing import traced
+
 class BaseAgent:
     """
     모든 에이전트의 기본 클래스
+    하위 클래스의 process는 자동으로 trace span(agent.<클래스명>.process)으로 기록됩니다.
     """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "process" in cls.__dict__:
+            cls.process = traced(f"agent.{cls.__name__}.process", kind="agent")(cls.__dict__["process"])
+
     def __init__(self, model: ChatOpenAI):
         self.model = model
     
@@ -1,10 +1,9 @@
 from typing import Dict, Any, List, Optional
 from ..base_agent import BaseAgent
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
-from .workflows.workout_workflow import create_workout_workflow
+from .workflows.workout_workflow import get_workout_workflow
 from .models.state_models import RoutingState
 from dotenv import load_dotenv
-from IPython.display import Image, display
 
 load_dotenv()
 
@@ -54,7 +53,7 @@ class ExerciseAgent(BaseAgent):
         if user_type == "trainer":
             member_id = 0  # 트레이너인 경우 member_id는 기본값으로 설정
 
-        workflow = create_workout_workflow()
+        workflow = get_workout_workflow()
 
         initial_state = RoutingState(
             message=message,
@@ -64,11 +63,6 @@ class ExerciseAgent(BaseAgent):
         )
 
         # 워크플로우 실행
-        final_state = workflow.invoke(initial_state)
-
-        try:
-            display(Image(workflow.get_graph().draw_mermaid_png()))
-        except Exception:
-            pass
+        final_state = await workflow.ainvoke(initial_state)
 
         return {"type": "exercise", "response": final_state["result"]}
\ No newline at end of file
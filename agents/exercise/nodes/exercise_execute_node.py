@@ -3,6 +3,7 @@ from langchain_openai import ChatOpenAI
 import json
 from ..tools.exercise_member_tools import master_select_db_multi, web_search, search_exercise_by_name, retrieve_exercise_info_by_similarity
 from ..models.state_models import RoutingState
+from supervisor_modules.utils.stream_events import emit_event, final_answer_config
 import re
 
 # ----------------------------
@@ -110,6 +111,7 @@ def execute_plan(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
 
         print(f"\n🔥 STEP {idx+1}: {description}")
         print(f"📦 TOOL: {tool_name if tool_name else '없음 (LLM 지식 사용)'}")
+        emit_event("tool_step", agent="exercise", step=idx + 1, tool=tool_name, description=description)
 
         input_data = resolve_placeholders(raw_input_data, context)
 
@@ -157,7 +159,7 @@ def execute_plan(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
         f"지금까지 수집된 정보:\n{json.dumps(context, ensure_ascii=False, indent=2)}",
         f"최종 목적: 위 정보를 바탕으로 사용자가 이해하기 쉽게 정리해서 질문에 답하세요. 단, 질문과 무관한 정보는 제외해야 합니다."
     ])
-    final_response = llm.invoke([HumanMessage(content=final_llm_input)])
+    final_response = llm.invoke([HumanMessage(content=final_llm_input)], config=final_answer_config())
     print("final_response: ", final_response.content)
     final_result = final_response.content
 
@@ -4,31 +4,34 @@ from langchain.agents import AgentExecutor, create_tool_calling_agent
 from ..models.state_models import RoutingState
 
 from ..prompts.exercise_judge_prompts import EXERCISE_JUDGE_PROMPT_ENGLISH
+from supervisor_modules.utils.workflow_registry import get_agent_executor
 
 tools = []
 
-def judge(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
-    """사용자의 메시지에 대한 답변이 적합한지 판단하는 노드"""
-    message = state.message
-    result = state.result
-    context = state.context
-
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", EXERCISE_JUDGE_PROMPT_ENGLISH),
-        ("user", "{message}"),
-        ("user", "{result}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad")
-    ])
-
-    agent = create_tool_calling_agent(llm, tools, prompt)
+JUDGE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EXERCISE_JUDGE_PROMPT_ENGLISH),
+    ("user", "{message}"),
+    ("user", "{result}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
 
-    agent_executor = AgentExecutor(
+def build_judge_executor(llm: ChatOpenAI) -> AgentExecutor:
+    agent = create_tool_calling_agent(llm, tools, JUDGE_PROMPT)
+    return AgentExecutor(
         agent=agent,
         verbose=True,
         tools=tools,
         handle_parse_errors=True,
     )
 
+def judge(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
+    """사용자의 메시지에 대한 답변이 적합한지 판단하는 노드"""
+    message = state.message
+    result = state.result
+    context = state.context
+
+    agent_executor = get_agent_executor("exercise_judge", llm, lambda: build_judge_executor(llm))
+
     response = agent_executor.invoke({
         "message": message,
         "result": result,
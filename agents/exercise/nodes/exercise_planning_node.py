@@ -3,6 +3,7 @@ from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langchain_core.prompts import MessagesPlaceholder, ChatPromptTemplate
 from ..models.state_models import RoutingState
 from ..prompts.exercise_planning_prompts import EXERCISE_PLANNING_PROMPT_4
+from supervisor_modules.utils.workflow_registry import get_agent_executor
 import json
 
 TABLE_SCHEMA_FOR_MEMBER = {
@@ -131,6 +132,31 @@ TOOL_DESCRIPTIONS_FOR_TRAINER = [
 
 tools = []
 
+PLANNING_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", EXERCISE_PLANNING_PROMPT_4),
+    ("user", "{message}"),
+    ("user", "{member_id}"),
+    ("user", "{table_schema}"),
+    ("user", "{tool_descriptions}"),
+    ("user", "{feedback}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+# 테이블 스키마/도구 설명은 고정값이므로 직렬화도 한 번만 수행
+TABLE_SCHEMA_FOR_MEMBER_JSON = json.dumps(TABLE_SCHEMA_FOR_MEMBER, indent=2, ensure_ascii=False)
+TOOL_DESCRIPTIONS_FOR_MEMBER_JSON = json.dumps(TOOL_DESCRIPTIONS_FOR_MEMBER, indent=2, ensure_ascii=False)
+TABLE_SCHEMA_FOR_TRAINER_JSON = json.dumps(TABLE_SCHEMA_FOR_TRAINER, indent=2, ensure_ascii=False)
+TOOL_DESCRIPTIONS_FOR_TRAINER_JSON = json.dumps(TOOL_DESCRIPTIONS_FOR_TRAINER, indent=2, ensure_ascii=False)
+
+def build_planning_executor(llm: ChatOpenAI) -> AgentExecutor:
+    agent = create_tool_calling_agent(llm, tools, PLANNING_PROMPT)
+    return AgentExecutor(
+        agent=agent,
+        verbose=True,
+        tools=tools,
+        handle_parse_errors=True,
+    )
+
 def planning(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
     """사용자 질문과 테이블 정보를 통해 답변 생성 절차를 계획하는 노드"""
 
@@ -139,24 +165,7 @@ def planning(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
     member_id = state.member_id
     trainer_id = state.trainer_id
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", EXERCISE_PLANNING_PROMPT_4),
-        ("user", "{message}"),
-        ("user", "{member_id}"),
-        ("user", "{table_schema}"),
-        ("user", "{tool_descriptions}"),
-        ("user", "{feedback}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad")
-    ])
-
-    agent = create_tool_calling_agent(llm, tools, prompt)
-
-    agent_executor = AgentExecutor(
-        agent=agent,
-        verbose=True,
-        tools=tools,
-        handle_parse_errors=True,
-    )
+    agent_executor = get_agent_executor("exercise_planning", llm, lambda: build_planning_executor(llm))
 
     print("User type: ", state.user_type)
     if state.user_type == "member":
@@ -164,8 +173,8 @@ def planning(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
             "message": message,
             "member_id": member_id,
             "trainer_id": None,
-            "table_schema": json.dumps(TABLE_SCHEMA_FOR_MEMBER, indent=2, ensure_ascii=False),
-            "tool_descriptions": json.dumps(TOOL_DESCRIPTIONS_FOR_MEMBER, indent=2, ensure_ascii=False),
+            "table_schema": TABLE_SCHEMA_FOR_MEMBER_JSON,
+            "tool_descriptions": TOOL_DESCRIPTIONS_FOR_MEMBER_JSON,
             "feedback": feedback
         })
     elif state.user_type == "trainer":
@@ -173,8 +182,8 @@ def planning(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
             "message": message,
             "member_id": None,
             "trainer_id": trainer_id,
-            "table_schema": json.dumps(TABLE_SCHEMA_FOR_TRAINER, indent=2, ensure_ascii=False),
-            "tool_descriptions": json.dumps(TOOL_DESCRIPTIONS_FOR_TRAINER, indent=2, ensure_ascii=False),
+            "table_schema": TABLE_SCHEMA_FOR_TRAINER_JSON,
+            "tool_descriptions": TOOL_DESCRIPTIONS_FOR_TRAINER_JSON,
             "feedback": feedback
         })
     else:
@@ -184,8 +193,8 @@ def planning(state: RoutingState, llm: ChatOpenAI) -> RoutingState:
             "message": message,
             "member_id": None,
             "trainer_id": trainer_id,
-            "table_schema": json.dumps(TABLE_SCHEMA_FOR_TRAINER, indent=2, ensure_ascii=False),
-            "tool_descriptions": json.dumps(TOOL_DESCRIPTIONS_FOR_TRAINER, indent=2, ensure_ascii=False),
+            "table_schema": TABLE_SCHEMA_FOR_TRAINER_JSON,
+            "tool_descriptions": TOOL_DESCRIPTIONS_FOR_TRAINER_JSON,
             "feedback": feedback
         })
 
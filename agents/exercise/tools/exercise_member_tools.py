@@ -7,9 +7,8 @@ from dotenv import load_dotenv
 from psycopg2 import sql
 import json
 from elasticsearch import Elasticsearch
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
-from qdrant_client.models import SearchParams
+from supervisor_modules.utils.embedding_service import EmbeddingService, load_sentence_transformer
+from supervisor_modules.utils.lazy import lazy_resource
 
 load_dotenv()
 
@@ -17,19 +16,38 @@ elasticsearch_host = os.getenv("ELASTICSEARCH_HOST")
 elasticsearch_username = os.getenv("ELASTICSEARCH_USERNAME")
 elasticsearch_password = os.getenv("ELASTICSEARCH_PASSWORD")
 
-es = Elasticsearch(
-    elasticsearch_host,
-    http_auth=(elasticsearch_username, elasticsearch_password)
-).options(ignore_status=400)
-
 exercise_index_name = "exercises"
+# Qdrant exercises 컬렉션의 문서 벡터를 만든 모델 (crawling/qdrant_test.py)
+EMBEDDING_MODEL_NAME = "all-mpnet-base-v2"
+
+# ES / Qdrant 클라이언트와 임베딩 모델은 처음 검색할 때 생성 (임포트 시 네트워크 연결·모델 로딩 없음)
+@lazy_resource("exercise.elasticsearch")
+def get_es() -> Elasticsearch:
+    return Elasticsearch(
+        elasticsearch_host,
+        http_auth=(elasticsearch_username, elasticsearch_password)
+    ).options(ignore_status=400)
+
 
-qdrant_client = QdrantClient(
-    url="https://9429a5d7-55d9-43fa-8ad7-8e6cfcd37e22.europe-west3-0.gcp.cloud.qdrant.io:6333", 
-    api_key=os.getenv("QDRANT_API_KEY")
-)
+@lazy_resource("exercise.qdrant")
+def get_qdrant_client():
+    from qdrant_client import QdrantClient
+
+    return QdrantClient(
+        url="https://9429a5d7-55d9-43fa-8ad7-8e6cfcd37e22.europe-west3-0.gcp.cloud.qdrant.io:6333",
+        api_key=os.getenv("QDRANT_API_KEY")
+    )
 
-model = SentenceTransformer('all-mpnet-base-v2')
+
+# 모델은 연결이 없으므로 gunicorn preload 마스터에서 로딩해 두면 워커가 fork로 공유 (supervisor_modules.utils.warmup)
+@lazy_resource("exercise.embedding_model", fork_safe=True, warmup=lambda model: model.encode(["워밍업"]))
+def get_embedding_model():
+    # EMBEDDING_QUANTIZE / EMBEDDING_MAX_SEQ_LENGTH로 CPU int8 모드 선택 (기본 fp32)
+    return load_sentence_transformer(EMBEDDING_MODEL_NAME)
+
+
+# 동시에 들어온 질의를 모아 한 번에 인코딩하고, 같은 질의는 LRU 캐시에서 반환
+embedding_service = EmbeddingService("exercise", get_embedding_model)
 
 DB_CONFIG = {
     "dbname": os.getenv("DB_DB"),
@@ -334,7 +352,7 @@ def search_exercise_by_name(name: str):
     name_compact = name.replace(" ", "")
 
     try:
-        res = es.search(
+        res = get_es().search(
             index=exercise_index_name,
             query={
                 "bool": {
@@ -394,9 +412,11 @@ def search_exercise_by_name(name: str):
     
 def retrieve_exercise_info_by_similarity(query: str):
     """Qdrant - 운동 정보 검색"""
-    query_vector = model.encode(query).tolist()
+    from qdrant_client.models import SearchParams
+
+    query_vector = embedding_service.encode(query).tolist()
     try:
-        res = qdrant_client.search(
+        res = get_qdrant_client().search(
             collection_name="exercises",
             query_vector=query_vector,
             limit=3,
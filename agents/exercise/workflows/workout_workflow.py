@@ -4,17 +4,15 @@ from ..nodes.exercise_judge_node import judge
 from ..nodes.exercise_execute_node import execute_plan
 from ..nodes.exercise_routing_node import routing
 from ..models.state_models import RoutingState
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from supervisor_modules.utils.workflow_registry import get_workflow
+from supervisor_modules.utils.llm_registry import get_llm
 
 load_dotenv()
 
 def create_workout_workflow():
     """운동 워크플로우 생성"""
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7
-    )
+    llm = get_llm("workflow")
 
     workflow = StateGraph(RoutingState)
 
@@ -38,4 +36,9 @@ def create_workout_workflow():
         }
     )
 
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+
+def get_workout_workflow():
+    """컴파일된 운동 워크플로우를 프로세스 단위로 재사용 (요청마다 다시 컴파일하지 않음)"""
+    return get_workflow("exercise", create_workout_workflow)
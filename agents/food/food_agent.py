@@ -7,6 +7,8 @@ from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
 from agents.food.new_agent_graph import run_super_agent
+from supervisor_modules.utils.llm_registry import get_llm
+from supervisor_modules.utils.tracing import traced
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -22,13 +24,12 @@ class FoodAgent(BaseModel):
         """음식 에이전트 초기화"""
         super().__init__(**data)
         if model is None:
-            self.model = ChatOpenAI(
-                model=self.DEFAULT_MODEL,
-                temperature=0.7
-            )
+            self.model = get_llm("food", model=self.DEFAULT_MODEL)
         else:
             self.model = model
             
+    # BaseAgent를 상속하지 않으므로 trace span을 직접 지정
+    @traced("agent.FoodAgent.process", kind="agent")
     async def process(self, message: str, email: Optional[str] = None, chat_history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
             # 사용자 ID 설정
             user_id = int(email) if email else 4
@@ -1,3 +1,4 @@
-from langchain_openai import ChatOpenAI
+from supervisor_modules.utils.llm_registry import get_llm
 
-llm = ChatOpenAI(temperature=0.7, model="gpt-4o-mini")
+# 식단 에이전트 노드 공용 LLM (프로필: food, 공유 연결 풀 사용)
+llm = get_llm("food")
@@ -2,6 +2,7 @@
 from langchain.schema import HumanMessage
 from agents.food.llm_config import llm
 from agents.food.agent_state import AgentState
+from supervisor_modules.utils.stream_events import final_answer_config
 import json
 import re
 def refine_node(state: AgentState) -> AgentState:
@@ -51,7 +52,7 @@ def refine_node(state: AgentState) -> AgentState:
 """
 
     try:
-        response = llm.invoke([HumanMessage(content=prompt)])
+        response = llm.invoke([HumanMessage(content=prompt)], config=final_answer_config())
         refined = response.content.strip()
         return state.copy(update={
             "agent_out": f"{refined}"
@@ -2,6 +2,7 @@
 import json
 from langchain.schema import HumanMessage
 from agents.food.llm_config import llm
+from supervisor_modules.utils.llm_cache import cached_invoke
 from agents.food.tool.recommend_diet_tool import tool_list
 from agents.food.agent_state import AgentState
 
@@ -37,7 +38,7 @@ def retry_node(state: AgentState) -> AgentState:
 
         형식: planner / final
         """
-        response = llm.invoke([HumanMessage(content=prompt)]).content.strip().lower()
+        response = cached_invoke(llm, [HumanMessage(content=prompt)], site="retry_eval").content.strip().lower()
         if response == "planner":
             return state.copy(update={
                 "retry_count": retry_count + 1,
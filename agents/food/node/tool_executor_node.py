@@ -4,6 +4,7 @@ from agents.food.tool.recommend_diet_tool import tool_list
 from langchain.schema import HumanMessage
 from agents.food.llm_config import llm
 from agents.food.agent_state import AgentState
+from supervisor_modules.utils.stream_events import emit_event
 
 tool_map = {tool.name: tool for tool in tool_list}
 
@@ -43,6 +44,7 @@ def tool_executor_node(state: AgentState) -> AgentState:
             tool_input["input"] = state.user_input
 
         # ✅ 도구 실행 (LangChain Tool은 {"params": ...} 구조 필요)
+        emit_event("tool_step", agent="food", tool=tool_name)
         result = tool_fn.invoke({"params": tool_input})
 
         # ✅ 저장 완료 여부 표시
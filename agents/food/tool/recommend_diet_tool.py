@@ -29,7 +29,6 @@
 # save_user_goal_and_diet_info | 자연어로부터 사용자 식단 정보 추출 및 DB 저장
 
 
-from cgitb import text
 from datetime import datetime
 import json
 import re
@@ -42,6 +41,8 @@ from langchain.schema import HumanMessage
 from langchain_community.retrievers import TavilySearchAPIRetriever
 from agents.food.util.table_schema import table_schema
 from agents.food.llm_config import llm
+from supervisor_modules.utils.lazy import lazy_resource
+from supervisor_modules.utils.llm_cache import cached_invoke
 import psycopg2
 import traceback
 from elasticsearch import Elasticsearch
@@ -60,10 +61,13 @@ load_dotenv()
 elasticsearch_username = os.getenv("ELASTICSEARCH_USERNAME")
 elasticsearch_password = os.getenv("ELASTICSEARCH_PASSWORD")
 
-es = Elasticsearch(
-    os.getenv("ELASTICSEARCH_HOST"),
-    http_auth=(elasticsearch_username, elasticsearch_password)
-)
+# ES 클라이언트는 처음 검색할 때 생성
+@lazy_resource("food.elasticsearch")
+def get_es() -> Elasticsearch:
+    return Elasticsearch(
+        os.getenv("ELASTICSEARCH_HOST"),
+        http_auth=(elasticsearch_username, elasticsearch_password)
+    )
 
 def call_spring_api(endpoint: str, data: dict, method: str = "POST") -> dict:
     """
@@ -99,8 +103,45 @@ def get_db_connection():
         print(f"데이터베이스 연결 오류: {str(e)}")
         return None
 
-pg_conn = get_db_connection()
-pg_cur = pg_conn.cursor() if pg_conn else None
+# 연결은 처음 조회할 때 생성 (임포트 시 DB에 접속하지 않음)
+pg_conn = None
+pg_cur = None
+
+def _get_cursor():
+    """공유 연결의 커서를 반환합니다. 연결이 없거나 끊어졌으면 다시 연결 (실패 시 None)"""
+    global pg_conn, pg_cur
+    if not pg_conn or pg_conn.closed:
+        pg_conn = get_db_connection()
+        pg_cur = pg_conn.cursor() if pg_conn else None
+    return pg_cur
+
+def _reset_connection():
+    """오류 후 연결을 닫아 다음 조회에서 새로 연결하게 함 (트랜잭션 오류 상태로 남지 않도록)"""
+    global pg_conn, pg_cur
+    for resource in (pg_cur, pg_conn):
+        if resource:
+            try:
+                resource.close()
+            except Exception:
+                pass
+    pg_cur = None
+    pg_conn = None
+
+def fetch_food_nutrition(food_id):
+    """food_nutrition 한 행을 {컬럼: 값}으로 조회합니다. (없으면 None)"""
+    cur = _get_cursor()
+    if cur is None:
+        raise RuntimeError("데이터베이스 연결 실패")
+    try:
+        cur.execute("SELECT * FROM food_nutrition WHERE id = %s", (food_id,))
+        row = cur.fetchone()
+    except psycopg2.Error:
+        _reset_connection()
+        raise
+    if not row:
+        return None
+    columns = [desc[0] for desc in cur.description]
+    return dict(zip(columns, row))
 
 # 실제 DB 실행 유틸 (psycopg2 기반)
 def execute_sql(query: str) -> str:
@@ -112,16 +153,12 @@ def execute_sql(query: str) -> str:
             return obj.strftime("%H:%M:%S")
         raise TypeError(f"Type {type(obj)} not serializable")
     
-    global pg_conn, pg_cur
-    
     try:
         # 연결이 끊어졌거나 없는 경우 재연결
-        if not pg_conn or pg_conn.closed:
-            pg_conn = get_db_connection()
-            if not pg_conn:
-                return json.dumps({"status": "❌ 데이터베이스 연결 실패"}, ensure_ascii=False)
-            pg_cur = pg_conn.cursor()
-        
+        pg_cur = _get_cursor()
+        if pg_cur is None:
+            return json.dumps({"status": "❌ 데이터베이스 연결 실패"}, ensure_ascii=False)
+
         pg_cur.execute(query)
 
         if query.strip().lower().startswith("select"):
@@ -138,19 +175,8 @@ def execute_sql(query: str) -> str:
     except Exception as e:
         import traceback
         # 에러 발생 시 연결 초기화
-        if pg_cur:
-            try:
-                pg_cur.close()
-            except:
-                pass
-        if pg_conn:
-            try:
-                pg_conn.close()
-            except:
-                pass
-        pg_cur = None
-        pg_conn = None
-        
+        _reset_connection()
+
         return json.dumps({
             "status": "❌ SQL 실행 오류",
             "error": str(e),
@@ -382,7 +408,7 @@ def lookup_nutrition_tool(params: dict) -> str:
             }
         }
 
-        results = es.search(index="food_nutrition_index", query=es_query["query"])
+        results = get_es().search(index="food_nutrition_index", query=es_query["query"])
         hits = results["hits"]["hits"]
 
         if hits:
@@ -400,16 +426,12 @@ def lookup_nutrition_tool(params: dict) -> str:
             """)
             
             formatted_prompt = prompt.format(food_name=food_name, matched_food_name=matched_food_name)
-            response = llm.invoke([HumanMessage(content=formatted_prompt)])
+            response = cached_invoke(llm, [HumanMessage(content=formatted_prompt)], site="food_name_match")
             
             # 일치한다고 판단되면 PostgreSQL에서 영양 정보 조회
             if "맞습니다" in response.content:
-                pg_cur.execute("SELECT * FROM food_nutrition WHERE id = %s", (food_id,))
-                row = pg_cur.fetchone()
-                if row:
-                    columns = [desc[0] for desc in pg_cur.description]
-                    food_dict = dict(zip(columns, row))
-
+                food_dict = fetch_food_nutrition(food_id)
+                if food_dict:
                     # datetime → str 변환
                     for k, v in food_dict.items():
                         if hasattr(v, 'isoformat'):
@@ -981,7 +1003,8 @@ def meal_parser_tool(params: dict) -> str:
     """
     from datetime import datetime
     user_input = params.get("user_input", "")
-    now_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # 끼니 판단은 시 단위이므로 분/초를 빼서 같은 문장이 같은 시간대에 캐시되도록 함
+    now_time = datetime.now().strftime("%Y-%m-%d %H:00")
     default_meal_type = infer_meal_type_from_time()
 
     prompt = f"""
@@ -1016,7 +1039,7 @@ def meal_parser_tool(params: dict) -> str:
     }}
     """
 
-    response = llm.invoke([HumanMessage(content=prompt)])
+    response = cached_invoke(llm, [HumanMessage(content=prompt)], site="meal_parser")
     return response.content.strip()
 
 @tool
@@ -1327,7 +1350,7 @@ def search_food_tool(params: dict) -> str:
         }
     }
 
-    results = es.search(index="food_nutrition_index", body=es_query)
+    results = get_es().search(index="food_nutrition_index", body=es_query)
     hits = results["hits"]["hits"]
     if not hits:
         return f"'{params}'에 대한 음식 검색 결과가 없습니다."
@@ -1337,14 +1360,12 @@ def search_food_tool(params: dict) -> str:
     name = top_hit["name"]
 
     # ✅ PostgreSQL에서 영양정보 조회
-    pg_cur.execute("SELECT * FROM food_nutrition WHERE id = %s", (food_id,))
-    row = pg_cur.fetchone()
-    if not row:
+    food_dict = fetch_food_nutrition(food_id)
+    if not food_dict:
         return f"{name}의 영양 정보를 찾을 수 없습니다."
 
     result = f"🍽️ 추천 음식: {name}\n📊 영양정보:\n"
-    columns = [desc[0] for desc in pg_cur.description]
-    for col, val in zip(columns, row):
+    for col, val in food_dict.items():
         result += f"- {col}: {val}\n"
     return result
 def extract_json_block(text: str) -> str:
@@ -4,6 +4,7 @@ import re
 from ..base_agent import BaseAgent
 from langchain.prompts import ChatPromptTemplate
 from common_prompts.prompts import AGENT_CONTEXT_PROMPT
+from supervisor_modules.utils.stream_events import final_answer_config
 
 class GeneralAgent(BaseAgent):
     async def process(
@@ -40,6 +41,7 @@ class GeneralAgent(BaseAgent):
         ])
 
         response = await (prompt | self.model).ainvoke(
-            {"message": message}
+            {"message": message},
+            config=final_answer_config()
         )
         return {"type": "general", "response": response.content}
\ No newline at end of file
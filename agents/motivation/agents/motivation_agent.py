@@ -24,6 +24,9 @@ from ..tools.emotion_tools import EmotionDetectionTool
 from ..tools.motivation_tools import MotivationResponseTool
 from ..tools.db_tools import DBConnectionTool
 from ..workflows.workflow import is_cheer_request, is_system_query
+from supervisor_modules.utils.stream_events import final_answer_config
+from supervisor_modules.utils.blocking import run_blocking
+from supervisor_modules.utils.llm_registry import get_llm
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -52,19 +55,9 @@ class MotivationAgent(BaseAgent):
         self.model = model_to_use
         
         # 통합 감정 분석 및 응답 생성 모델 설정
-        self.unified_model = ChatOpenAI(
-            model="gpt-3.5-turbo", 
-            temperature=0.7,
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-            max_tokens=1000,
-            streaming=True
-        )
+        self.unified_model = get_llm("motivation")
         # 백업용 모델 - 필요시 사용
-        self.backup_emotion_model = ChatOpenAI(
-            model="gpt-3.5-turbo", 
-            temperature=0.2,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
+        self.backup_emotion_model = get_llm("motivation_backup")
         logger.info("통합 감정 분석 및 응답 생성 에이전트 초기화 완료")
         
     async def process(self, message: str, email: Optional[str] = None, chat_history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
@@ -112,7 +105,7 @@ class MotivationAgent(BaseAgent):
                     ("human", actual_message)
                 ])
                 formatted_prompt = prompt.format_messages()
-                response_message = await self.unified_model.ainvoke(formatted_prompt)
+                response_message = await self.unified_model.ainvoke(formatted_prompt, config=final_answer_config())
                 
                 return {
                     "type": "motivation",
@@ -131,7 +124,7 @@ class MotivationAgent(BaseAgent):
             if email:
                 logger.info(f"사용자 목표 조회 시작: {email}")
                 try:
-                    user_goals = DBConnectionTool.get_user_goals(email)
+                    user_goals = await run_blocking(DBConnectionTool.get_user_goals, email)
                     logger.info(f"사용자 목표 조회 결과: {user_goals}")
                 except Exception as e:
                     logger.warning(f"사용자 목표 조회 중 오류: {str(e)}")
@@ -162,7 +155,7 @@ class MotivationAgent(BaseAgent):
                         logger.info(f"context_data에서 감정 정보 추출: {emotion_data}")
                 else:
                     # context_data에 감정 정보가 없으면 분석 수행
-                    emotion_data = EmotionDetectionTool.analyze_emotion(actual_message)
+                    emotion_data = await run_blocking(EmotionDetectionTool.analyze_emotion, actual_message)
             except Exception as e:
                 logger.error(f"감정 분석 중 오류: {str(e)}")
                 # 기본 감정 데이터 유지
@@ -194,7 +187,7 @@ class MotivationAgent(BaseAgent):
             
             # 응답 생성
             logger.info("동기부여 응답 생성 시작")
-            response_message = await self.unified_model.ainvoke(formatted_prompt)
+            response_message = await self.unified_model.ainvoke(formatted_prompt, config=final_answer_config())
             response_text = response_message.content
             
             # 전략 추출
@@ -219,7 +212,7 @@ class MotivationAgent(BaseAgent):
             # 예외 처리 - 에러가 발생하면 기본 응답 반환
             logger.error(f"동기부여 에이전트 처리 중 오류: {str(e)}")
             logger.error(traceback.format_exc())
-            return self._create_fallback_response(message)
+            return await self._create_fallback_response(message)
 
     def _extract_strategy(self, text: str) -> str:
         """응답 텍스트에서 전략을 추출하는 시도"""
@@ -245,7 +238,7 @@ class MotivationAgent(BaseAgent):
         # 기본값
         return "motivation_boost"
 
-    def _create_fallback_response(self, message: str) -> Dict[str, Any]:
+    async def _create_fallback_response(self, message: str) -> Dict[str, Any]:
         """
         오류 발생 시 대체 응답을 생성합니다.
         필요한 경우 별도의 감정 분석을 수행합니다.
@@ -258,7 +251,7 @@ class MotivationAgent(BaseAgent):
         """
         try:
             # 감정 분석 시도
-            emotion_data = EmotionDetectionTool.analyze_emotion(message)
+            emotion_data = await run_blocking(EmotionDetectionTool.analyze_emotion, message)
             emotion = emotion_data.get("emotion", "neutral")
             intensity = emotion_data.get("intensity", 0.5)
         except:
@@ -4,13 +4,13 @@
 import json
 import logging
 from typing import Dict, Any, Optional, List
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 import os
 import re
 
 from agents.motivation.tools.emotion_validation import EmotionValidationTool
 from agents.motivation.tools.emotion_keywords import EmotionKeywordsTool
+from supervisor_modules.utils.llm_registry import get_llm
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -148,11 +148,7 @@ class EmotionDetectionTool:
                 return {"emotion": "neutral", "intensity": 0.0}
             
             # LangChain 모델 초기화
-            model = ChatOpenAI(
-                model="gpt-3.5-turbo",
-                temperature=0.3,
-                openai_api_key=api_key
-            )
+            model = get_llm("emotion")
             
             # 프롬프트 템플릿 생성
             prompt = ChatPromptTemplate.from_messages([
@@ -1,7 +1,7 @@
 from typing import Dict, Any, TypedDict, List, Annotated, Literal
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from ..prompts.prompt_templates import get_cheer_prompt, UNIFIED_PROMPT, SYSTEM_QUERY_RESPONSE
+from supervisor_modules.utils.llm_registry import get_llm
 import os
 import re
 
@@ -77,12 +77,7 @@ def generate_emotional_response(user_message: str, emotion: str, intensity: floa
     """감정에 기반한 동기부여 메시지를 생성합니다."""
     try:
         # LangChain 모델 초기화
-        model = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            streaming=False,
-            max_tokens=500
-        )
+        model = get_llm("motivation_response")
         
         # 응원 요청 확인
         if is_cheer_request(user_message):
@@ -118,12 +113,7 @@ def generate_general_response(user_message: str) -> str:
     """일반적인 응답을 생성합니다."""
     try:
         # LangChain 모델 초기화
-        model = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0.7,
-            streaming=False,
-            max_tokens=500
-        )
+        model = get_llm("motivation_response")
         
         # LangChain 프롬프트 생성
         prompt = ChatPromptTemplate.from_messages([
@@ -158,12 +148,7 @@ def process_message(state: MotivationState) -> MotivationState:
     # 시스템 관련 질문 확인 (가장 먼저 체크)
     if is_system_query(user_message):
         # 시스템 관련 질문 응답 생성
-        model = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0.5,
-            streaming=False,
-            max_tokens=300
-        )
+        model = get_llm("motivation_system")
         
         # 시스템 보안 응답 프롬프트 설정
         prompt = ChatPromptTemplate.from_messages([
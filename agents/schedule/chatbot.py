@@ -15,7 +15,6 @@ from langchain_core.chat_history import InMemoryChatMessageHistory
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableMap
 from langchain_core.utils.function_calling import convert_to_openai_function
-from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor
 from langchain.agents.format_scratchpad import format_to_openai_function_messages
 from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
@@ -23,6 +22,8 @@ from langchain.agents.output_parsers import OpenAIFunctionsAgentOutputParser
 from .tools import get_user_schedule, add_schedule, modify_schedule, get_trainer_schedule, get_member_schedule
 from .utils.date_manager import DateManager
 from .utils.prompt_manager import PromptManager
+from supervisor_modules.utils.stream_events import final_answer_config
+from supervisor_modules.utils.llm_registry import get_llm
 
 
 class ScheduleChatbot:
@@ -42,11 +43,7 @@ class ScheduleChatbot:
 
     def _initialize_llm(self) -> None:
         """LLM 모델 초기화"""
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            streaming=True
-        )
+        self.llm = get_llm("schedule")
 
     def _initialize_tools(self, tools: Optional[List] = None) -> None:
         """도구 초기화
@@ -107,6 +104,45 @@ class ScheduleChatbot:
             return_intermediate_steps=True
         )
 
+    @staticmethod
+    def _build_agent_input(message: str, session_id: str) -> Dict[str, Any]:
+        """사용자 메시지(또는 JSON 메시지)를 AgentExecutor 입력으로 변환합니다."""
+        # 메시지가 JSON 형식인지 확인
+        try:
+            message_data = json.loads(message)
+            text_message = message_data.get("text", message)
+            member_id = message_data.get("member_id")
+            user_type = message_data.get("user_type", "member")
+            auth_token = message_data.get("auth_token")
+        except (json.JSONDecodeError, TypeError):
+            # JSON이 아닌 경우 원래 메시지 사용
+            text_message = message
+            member_id = None
+            user_type = "member"
+            auth_token = None
+
+        # member_id와 user_type 정보 추가
+        return {
+            "input": f"사용자 메시지: {text_message}" + (f" (member_id: {member_id}, user_type: {user_type})" if member_id else ""),
+            "session_id": session_id,
+            "member_id": member_id,
+            "user_type": user_type,
+            "auth_token": auth_token
+        }
+
+    @staticmethod
+    def _format_error(e: Exception) -> str:
+        error_msg = str(e)
+        if "timeout" in error_msg.lower():
+            return json.dumps({
+                "success": False,
+                "message": "응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
+            })
+        return json.dumps({
+            "success": False,
+            "message": f"오류가 발생했습니다: {error_msg}"
+        })
+
     def process_message(self, message: str, session_id: str = "default") -> str:
         """메시지를 처리하고 응답을 생성합니다.
         
@@ -118,44 +154,28 @@ class ScheduleChatbot:
             str: 생성된 응답
         """
         try:
-            # 메시지가 JSON 형식인지 확인
-            try:
-                message_data = json.loads(message)
-                text_message = message_data.get("text", message)
-                member_id = message_data.get("member_id")
-                user_type = message_data.get("user_type", "member")
-                auth_token = message_data.get("auth_token")
-            except (json.JSONDecodeError, TypeError):
-                # JSON이 아닌 경우 원래 메시지 사용
-                text_message = message
-                member_id = None
-                user_type = "member"
-                auth_token = None
-                
-            # AgentExecutor 실행 - member_id와 user_type 정보 추가
-            response = self.agent_executor.invoke({
-                "input": f"사용자 메시지: {text_message}" + (f" (member_id: {member_id}, user_type: {user_type})" if member_id else ""),
-                "session_id": session_id,
-                "member_id": member_id,
-                "user_type": user_type,
-                "auth_token": auth_token
-            })
-            
+            response = self.agent_executor.invoke(
+                self._build_agent_input(message, session_id), config=final_answer_config()
+            )
             return json.dumps({
                 "success": True,
                 "message": response["output"]
             })
         except Exception as e:
-            error_msg = str(e)
-            if "timeout" in error_msg.lower():
-                return json.dumps({
-                    "success": False,
-                    "message": "응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
-                })
+            return self._format_error(e)
+
+    async def aprocess_message(self, message: str, session_id: str = "default") -> str:
+        """process_message의 비동기 버전 (LLM 호출은 비동기, 동기 도구는 executor에서 실행)"""
+        try:
+            response = await self.agent_executor.ainvoke(
+                self._build_agent_input(message, session_id), config=final_answer_config()
+            )
             return json.dumps({
-                "success": False,
-                "message": f"오류가 발생했습니다: {error_msg}"
+                "success": True,
+                "message": response["output"]
             })
+        except Exception as e:
+            return self._format_error(e)
 
 
 def get_member_id_from_token(token: str) -> int:
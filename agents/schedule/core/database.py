@@ -1,9 +1,12 @@
 import psycopg2
 from langchain_community.utilities import SQLDatabase
+from supervisor_modules.utils.lazy import lazy_resource
 from ..config.database_config import PG_URI
 
-# 데이터베이스 연결
-db = SQLDatabase.from_uri(PG_URI)
+# 데이터베이스 연결 (SQLDatabase.from_uri는 접속해 테이블 정보를 읽으므로 처음 쿼리할 때 생성)
+@lazy_resource("schedule.database")
+def get_db() -> SQLDatabase:
+    return SQLDatabase.from_uri(PG_URI)
 
 def execute_query(query: str) -> str:
     """SQL 쿼리를 실행하고 결과를 반환합니다.
@@ -15,7 +18,7 @@ def execute_query(query: str) -> str:
         str: 쿼리 실행 결과 또는 에러 메시지
     """
     try:
-        result = db.run(query)
+        result = get_db().run(query)
         if not result or result.strip() == "":
             return "데이터가 없습니다."
 
@@ -37,7 +37,7 @@ class ScheduleAgent(BaseAgent):
             session_id = str(member_id) if member_id else "default"
             
             logger.info(f"ScheduleChatbot 호출 - session_id: {session_id}")
-            raw_result = self.chatbot.process_message(json_message, session_id=session_id)
+            raw_result = await self.chatbot.aprocess_message(json_message, session_id=session_id)
 
             # json.loads로 파싱
             parsed = json.loads(raw_result)
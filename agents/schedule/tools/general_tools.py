@@ -1,17 +1,17 @@
 from langchain.agents import tool
 from typing import Dict, Any, List
-from ..core.database import db
+from ..core.database import get_db
 
 @tool
 def get_schema():
     """데이터베이스 스키마 정보를 반환합니다."""
-    return db.get_table_info()
+    return get_db().get_table_info()
 
 @tool
 def run_query(query: str) -> str:
     """SQL 쿼리를 실행하고 결과를 반환합니다."""
     try:
-        result = db.run(query)
+        result = get_db().run(query)
         if not result or result.strip() == "":
             return "데이터가 없습니다."
         return result
@@ -1,9 +1,11 @@
 """
 API 서버 - FastAPI 기반 RestAPI 엔드포인트 정의 (수정본)
 """
-from fastapi import FastAPI, HTTPException, Header
+from fastapi import FastAPI, HTTPException, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.routing import Match
 from typing import Dict, Any, Optional, List
 import logging
 import os
@@ -11,18 +13,42 @@ import uvicorn
 import traceback
 import json
 import time
+import asyncio
 from datetime import datetime
 import uuid
 
-from pt_log.pt_log_workflow import create_pt_log_workflow
-from report.report_workflow import create_report_workflow
-from workout_log.workout_log_workflow import create_workout_log_workflow
+from pt_log.pt_log_workflow import get_pt_log_workflow
+from report.report_workflow import get_report_workflow
+from workout_log.workout_log_workflow import get_workout_log_workflow
 # 대화 내역 관리자 임포트
-from chat_history_manager import ChatHistoryManager
+from chat_history_manager import get_chat_history_manager
 
 # 수퍼바이저 모듈 임포트
 from supervisor import Supervisor
-from langchain_openai import ChatOpenAI
+from supervisor_modules.utils.stream_events import open_stream, format_sse
+from supervisor_modules.classification import get_router_stats
+from supervisor_modules.utils.blocking import install_default_executor
+from supervisor_modules.utils.conversation_memory import wait_for_summary_updates
+from supervisor_modules.utils.llm_registry import get_llm
+from supervisor_modules.utils.llm_cache import get_cache_stats
+from supervisor_modules.utils.metrics import (
+    CallbackGauge,
+    instrument_clients,
+    metrics_labels,
+    register_metric,
+    render_metrics,
+    track_stage,
+)
+from supervisor_modules.utils.llm_usage import track_usage
+from supervisor_modules.utils.tracing import current_trace_id, start_trace
+from supervisor_modules.utils.warmup import start_worker_warmup, warmup_status
+from supervisor_modules.utils.profiling import (
+    is_admin,
+    list_profiles,
+    profile_artifact_path,
+    profile_request,
+    profiling_requested,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,13 +69,24 @@ logging.getLogger('agents').setLevel(logging.INFO)
 from dotenv import load_dotenv
 load_dotenv()
 
-# LLM 초기화
-llm = ChatOpenAI(temperature=0.7)
+# true면 모든 /chat 응답에 LLM 사용량(debug 필드)을 포함
+CHAT_DEBUG_USAGE = os.getenv("CHAT_DEBUG_USAGE", "false").lower() == "true"
+
+# LLM 초기화 (공유 연결 풀을 쓰는 레지스트리 프로필)
+llm = get_llm("supervisor")
 
 # 대화 내역 관리자 & 수퍼바이저 초기화
-chat_history_manager = ChatHistoryManager()
+chat_history_manager = get_chat_history_manager()
 supervisor = Supervisor(model=llm)
 
+# Redis 장애 시 대화 내역을 보관하는 메모리 저장소 상태 (keys, bytes, pending_entries, dropped_pending 등)
+register_metric(CallbackGauge(
+    "ai_chat_history_fallback",
+    "대화 내역 메모리 저장소 상태 (Redis 장애 시 사용, 워커 단위)",
+    "kind",
+    chat_history_manager.fallback.stats,
+))
+
 # 유틸: JSON 데이터를 보기 좋게 출력
 def log_pretty_json(prefix, data):
     if not isinstance(data, dict):
@@ -77,6 +114,7 @@ class ChatRequest(BaseModel):
     member_id: Optional[str] = None
     trainer_id: Optional[str] = None
     user_type: Optional[str] = None
+    debug: Optional[bool] = False
 
 class ChatResponse(BaseModel):
     member_id: Optional[str] = None
@@ -89,6 +127,8 @@ class ChatResponse(BaseModel):
     final_response: str
     execution_time: Optional[float] = None
     emotion_type: Optional[str] = None
+    # 요청 시 debug=true 또는 CHAT_DEBUG_USAGE=true일 때만 채움 (LLM 호출 수/토큰/비용)
+    debug: Optional[Dict[str, Any]] = None
 
 class PtLogRequest(BaseModel):
     message: str
@@ -131,138 +171,268 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def configure_blocking_pool():
+    # asyncio.to_thread / LangGraph 동기 노드 실행도 제한된 공유 스레드 풀을 사용하도록 등록
+    install_default_executor()
+    # requests / ES / Qdrant / Redis / psycopg2 호출 시간 계측
+    instrument_clients()
+    # 모델 / 연결 풀을 백그라운드로 미리 준비 (끝나면 /ready가 200)
+    start_worker_warmup()
+
+@app.on_event("shutdown")
+async def close_chat_history_pool():
+    # 응답 후 백그라운드로 돌던 대화 요약 갱신을 잠시 기다린 뒤 연결 풀 종료 (못 끝낸 요약은 다음 턴에서 이어서 반영)
+    await wait_for_summary_updates()
+    await chat_history_manager.close()
+
+def _endpoint_label(request: Request) -> str:
+    """
+    지표 endpoint 라벨: 매칭되는 라우트 경로 템플릿 (/admin/profiles/{name} 등), 없으면 "other"
+    미들웨어는 라우팅 전에 실행되므로 라우터에 직접 매칭해 봅니다. (원래 경로를 쓰면 스캐너 요청마다 시계열이 늘어남)
+    """
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            # 경로는 맞고 메서드만 다른 경우 (405)
+            partial = route.path
+    return partial or "other"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    요청 전체 시간을 기록하고, 하위 단계 지표에 endpoint 라벨을 붙임 (스트리밍은 헤더 전송까지)
+    요청마다 trace를 시작하며 trace id가 곧 엔드포인트의 request_id (X-Trace-Id 응답 헤더)
+    """
+    if request.url.path in ("/metrics", "/ready"):
+        return await call_next(request)
+    endpoint = _endpoint_label(request)
+    with metrics_labels(endpoint=endpoint), \
+            start_trace(name=f"{request.method} {endpoint}") as trace_id, \
+            track_stage("request"):
+        response = await call_next(request)
+        response.headers["X-Trace-Id"] = trace_id
+        return response
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 형식 단계별 지연 시간 / 오류 / 폴백 지표 (워커 프로세스 단위)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def _profile_scope(request: Request, request_id: str, response: Optional[Response] = None):
+    """관리자가 X-Profile 헤더로 요청한 경우에만 이 요청을 프로파일링 (결과 ID는 X-Profile-Id 헤더로 반환)"""
+    enabled = profiling_requested(request)
+    if enabled and response is not None:
+        response.headers["X-Profile-Id"] = request_id
+    return profile_request(request_id, request.url.path, enabled)
+
+@app.get("/admin/profiles")
+async def admin_profiles(x_admin_token: Optional[str] = Header(None)):
+    """저장된 요청 프로파일 목록 (X-Admin-Token 필요)"""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+    return {"profiles": list_profiles()}
+
+@app.get("/admin/profiles/{name}")
+async def admin_profile_artifact(name: str, x_admin_token: Optional[str] = Header(None)):
+    """프로파일 결과 파일 다운로드 (.html / .speedscope.json / .pstats / .json)"""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+    path = profile_artifact_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="프로파일 파일을 찾을 수 없습니다.")
+    return FileResponse(path, filename=path.name)
+
+@app.get("/ready")
+async def ready():
+    """워커 준비(모델 로딩, 워크플로우 컴파일, 연결 풀) 완료 여부. 준비 전에는 503 (로드밸런서 readiness 검사용)"""
+    status = warmup_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
 @app.get("/")
 async def root():
     return {"message": "AI 피트니스 코치 API 서버에 오신 것을 환영합니다"}
 
+@app.get("/router/stats")
+async def router_stats():
+    """로컬 라우터 적중률 / LLM 분류 일치율 (워커 프로세스 단위)"""
+    return get_router_stats()
+
+@app.get("/llm/cache/stats")
+async def llm_cache_stats():
+    """호출 지점별 LLM 응답 캐시 hit/miss (워커 프로세스 단위)"""
+    return get_cache_stats()
+
 @app.post("/chat")
-async def chat(chat_request: ChatRequest):
-    request_id = str(uuid.uuid4())
+async def chat(chat_request: ChatRequest, request: Request, response: Response):
+    request_id = current_trace_id() or str(uuid.uuid4())
     message = chat_request.message
     member_id = chat_request.member_id
     trainer_id = chat_request.trainer_id
-    user_type = chat_request.user_type
+    user_type = chat_request.user_type or ("member" if member_id else "trainer")
 
-    if not user_type:
-        user_type = "member" if member_id else "trainer"
-    
     logger.info(f"[{request_id}] 채팅 요청 - user_type: {user_type}, member_id: {member_id}, trainer_id: {trainer_id}, msg: {message[:50]}...")
 
     try:
-        user_id = member_id if user_type == "member" else trainer_id
-        chat_history: List[Dict[str, Any]] = []
-
-        # 대화 내역 조회
-        if user_id:
+        with _profile_scope(request, request_id, response) as profile:
+            response_data, elapsed_time = await _run_chat(request_id, chat_request, user_type)
+            if profile:
+                profile.annotate(llm_usage=response_data.get("llm_usage"))
+        return _build_chat_response(chat_request, user_type, response_data, elapsed_time)
+    except Exception as e:
+        logger.error(f"[{request_id}] 채팅 처리 중 오류: {str(e)}")
+        logger.error(traceback.format_exc())
+        return _build_chat_error_response(chat_request, user_type, e)
+
+@app.post("/chat/stream")
+async def chat_stream(chat_request: ChatRequest, request: Request):
+    """
+    /chat 의 Server-Sent Events 버전
+    단계 이벤트(context_built, category_selected, agent_started, tool_step)와
+    최종 에이전트 토큰(answer_start, token)을 먼저 보내고,
+    마지막에 /chat 과 동일한 ChatResponse를 result 이벤트로 보냅니다.
+    """
+    request_id = current_trace_id() or str(uuid.uuid4())
+    user_type = chat_request.user_type or ("member" if chat_request.member_id else "trainer")
+
+    logger.info(f"[{request_id}] 스트리밍 채팅 요청 - user_type: {user_type}, msg: {chat_request.message[:50]}...")
+    profiling = profiling_requested(request)
+
+    async def event_generator():
+        # 스트림은 이 제너레이터의 컨텍스트에 연결되고, 아래에서 만드는 Task가 컨텍스트를 복사해 사용
+        stream = open_stream(request_id)
+        yield format_sse("accepted", {"request_id": request_id})
+
+        async def run():
             try:
-                chat_history = chat_history_manager.get_recent_messages(user_id, limit=6)
-                logger.info(f"[{request_id}] 대화 내역 조회 - {len(chat_history)}개")
+                # 스트리밍은 응답 헤더 전송 후에도 처리가 계속되므로 처리 Task 안에서 프로파일링
+                with profile_request(request_id, request.url.path, profiling) as profile:
+                    response_data, elapsed_time = await _run_chat(request_id, chat_request, user_type)
+                    if profile:
+                        profile.annotate(llm_usage=response_data.get("llm_usage"))
+                final_resp = _build_chat_response(chat_request, user_type, response_data, elapsed_time)
+                stream.emit("result", final_resp.model_dump())
             except Exception as e:
-                logger.warning(f"[{request_id}] 대화 내역 조회 실패: {str(e)}")
+                logger.error(f"[{request_id}] 스트리밍 채팅 처리 중 오류: {str(e)}")
+                logger.error(traceback.format_exc())
+                stream.emit("error", _build_chat_error_response(chat_request, user_type, e).model_dump())
+            finally:
+                stream.close()
+
+        task = asyncio.create_task(run())
+        try:
+            async for event, data in stream.events():
+                yield format_sse(event, data)
+        finally:
+            # 클라이언트 연결이 끊긴 경우에도 대화 저장까지는 마치도록 작업은 취소하지 않음
+            if not task.done():
+                logger.info(f"[{request_id}] 스트림 종료 - 백그라운드에서 처리 계속")
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            **({"X-Profile-Id": request_id} if profiling else {}),
+        }
+    )
+
+async def _run_chat(request_id: str, chat_request: ChatRequest, user_type: str):
+    """Supervisor 실행 (대화 내역 / 이전 대화 요약 조회와 저장은 Supervisor.process가 담당) (/chat, /chat/stream 공통)"""
+    message = chat_request.message
+    member_id = chat_request.member_id
+    trainer_id = chat_request.trainer_id
 
-        start_time = time.time()
-        # Supervisor 호출
+    start_time = time.time()
+    # Supervisor 호출 (스트리밍 요청도 전체 처리 시간이 남도록 별도 단계로 기록)
+    with track_stage("supervisor"), track_usage(request_id) as usage:
         response_data = await supervisor.process(
             message=message,
             member_id=member_id,
             trainer_id=trainer_id,
             user_type=user_type,
-            chat_history=chat_history
-        )
-        elapsed_time = time.time() - start_time
-        logger.info(f"[{request_id}] Supervisor 처리 완료 (소요: {elapsed_time:.2f}s)")
-        
-        # 응답 로깅
-        log_pretty_json(f"[{request_id}] AI 응답 데이터", response_data)
-
-        # 대화 내역 저장 (동기 메서드 add_chat_entry 사용)
-        if user_id:
-            # 사용자 메시지
-            user_message_saved = chat_history_manager.add_chat_entry(user_id, "user", message)
-            if not user_message_saved:
-                logger.warning(f"[{request_id}] 사용자 메시지 저장 실패: {user_id}")
-
-            # 에이전트(assistant) 메시지
-            assistant_message_saved = chat_history_manager.add_chat_entry(
-                user_id,
-                "assistant",
-                response_data.get("response", "")
-            )
-            if not assistant_message_saved:
-                logger.warning(f"[{request_id}] 어시스턴트 메시지 저장 실패: {user_id}")
-
-        # 응답 변환
-        final_resp = ChatResponse(
-            member_id=member_id,
-            trainer_id=trainer_id,
-            user_type=user_type,
-            timestamp=datetime.now().isoformat(),
-            member_input=message,
-            clarified_input=message,
-            selected_agents=response_data.get("selected_agents", ["general"]),
-            final_response=response_data.get("response", ""),
-            execution_time=elapsed_time,
-            emotion_type=response_data.get("emotion_type", None)
+            request_id=request_id
         )
-        return final_resp
-    
-    except Exception as e:
-        logger.error(f"[{request_id}] 채팅 처리 중 오류: {str(e)}")
-        logger.error(traceback.format_exc())
-        error_resp = ChatResponse(
-            member_id=member_id,
-            trainer_id=trainer_id,
-            user_type=user_type,
-            timestamp=datetime.now().isoformat(),
-            member_input=message,
-            clarified_input=None,
-            selected_agents=[],
-            final_response=f"처리 중 오류가 발생했습니다: {str(e)}",
-            execution_time=0,
-            emotion_type=None
-        )
-        return error_resp
+    elapsed_time = time.time() - start_time
+    llm_usage = usage.summary()
+    logger.info(
+        f"[{request_id}] Supervisor 처리 완료 (소요: {elapsed_time:.2f}s, LLM 호출 {llm_usage['calls']}회, "
+        f"토큰 {llm_usage['prompt_tokens']}+{llm_usage['completion_tokens']}, ${llm_usage['cost_usd']})"
+    )
+    logger.info(f"[{request_id}] LLM 호출 위치별 사용량: {json.dumps(llm_usage['by_site'], ensure_ascii=False)}")
+    response_data = {**response_data, "llm_usage": llm_usage}
+
+    # 응답 로깅
+    log_pretty_json(f"[{request_id}] AI 응답 데이터", response_data)
+
+    # 대화 내역 저장은 Supervisor.process가 사용자/응답 한 턴을 한 번에 기록함
+    return response_data, elapsed_time
+
+def _build_chat_response(chat_request: ChatRequest, user_type: str, response_data: Dict[str, Any], elapsed_time: float) -> ChatResponse:
+    return ChatResponse(
+        member_id=chat_request.member_id,
+        trainer_id=chat_request.trainer_id,
+        user_type=user_type,
+        timestamp=datetime.now().isoformat(),
+        member_input=chat_request.message,
+        clarified_input=chat_request.message,
+        selected_agents=response_data.get("selected_agents", ["general"]),
+        final_response=response_data.get("response", ""),
+        execution_time=elapsed_time,
+        emotion_type=response_data.get("emotion_type", None),
+        debug={"llm_usage": response_data.get("llm_usage")} if chat_request.debug or CHAT_DEBUG_USAGE else None
+    )
+
+def _build_chat_error_response(chat_request: ChatRequest, user_type: str, error: Exception) -> ChatResponse:
+    return ChatResponse(
+        member_id=chat_request.member_id,
+        trainer_id=chat_request.trainer_id,
+        user_type=user_type,
+        timestamp=datetime.now().isoformat(),
+        member_input=chat_request.message,
+        clarified_input=None,
+        selected_agents=[],
+        final_response=f"처리 중 오류가 발생했습니다: {str(error)}",
+        execution_time=0,
+        emotion_type=None
+    )
 
 @app.post("/pt_log")
-async def pt_log(pt_log_request: PtLogRequest):
-    request_id = str(uuid.uuid4())
+async def pt_log(pt_log_request: PtLogRequest, request: Request, response: Response):
+    request_id = current_trace_id() or str(uuid.uuid4())
     message = pt_log_request.message
     ptScheduleId = pt_log_request.ptScheduleId
 
     logger.info(f"[{request_id}] PT 로그 요청 - ptScheduleId: {ptScheduleId}, msg: {message[:50]}...")
 
     try:
-        workflow = create_pt_log_workflow()
+        workflow = get_pt_log_workflow()
 
-        chat_history = chat_history_manager.get_recent_messages_by_pt_log_key(ptScheduleId, 6)
+        chat_history = await chat_history_manager.get_recent_messages_by_pt_log_key(ptScheduleId, 6)
 
         start_time = datetime.now()
-        result = workflow.invoke({
-            "message": message,
-            "ptScheduleId": ptScheduleId,
-            "chat_history": chat_history
-        })
+        with _profile_scope(request, request_id, response):
+            result = await workflow.ainvoke({
+                "message": message,
+                "ptScheduleId": ptScheduleId,
+                "chat_history": chat_history
+            })
         elapsed = (datetime.now() - start_time).total_seconds()
 
         logger.info(f"[{request_id}] PT 로그 처리 완료 (소요: {elapsed:.2f}s)")
 
-        # 사용자 메시지 저장
-        user_message_saved = chat_history_manager.add_pt_log_entry(
-            ptScheduleId,
-            "user",
-            message
-        )
-        if not user_message_saved:
-            logger.warning(f"[{request_id}] 사용자 메시지 저장 실패: {ptScheduleId}")
-
-        # 에이전트(assistant) 메시지 저장
-        assistant_message_saved = chat_history_manager.add_pt_log_entry(
+        # 사용자 메시지 + 에이전트(assistant) 메시지 저장
+        saved = await chat_history_manager.add_pt_log_turn(
             ptScheduleId,
-            "assistant",
+            message,
             result.get("response", "")
         )
-        if not assistant_message_saved:
-            logger.warning(f"[{request_id}] 어시스턴트 메시지 저장 실패: {ptScheduleId}")
+        if not saved:
+            logger.warning(f"[{request_id}] 대화 내역 저장 실패: {ptScheduleId}")
 
         return PtLogResponse(
             ptScheduleId=ptScheduleId,
@@ -281,8 +451,8 @@ async def pt_log(pt_log_request: PtLogRequest):
         )
 
 @app.post("/workout_log")
-async def workout_log(workout_log_request: WorkoutLogRequest):
-    request_id = str(uuid.uuid4())
+async def workout_log(workout_log_request: WorkoutLogRequest, request: Request, response: Response):
+    request_id = current_trace_id() or str(uuid.uuid4())
     message = workout_log_request.message
     memberId = workout_log_request.memberId
     date = workout_log_request.date
@@ -290,40 +460,31 @@ async def workout_log(workout_log_request: WorkoutLogRequest):
     logger.info(f"[{request_id}] 운동 기록 요청 - memberId: {memberId}, date: {date}, msg: {message[:50]}...")
 
     try:
-        workflow = create_workout_log_workflow()
+        workflow = get_workout_log_workflow()
 
-        chat_history = chat_history_manager.get_recent_messages_by_workout_log_key(memberId, date, 6)
+        chat_history = await chat_history_manager.get_recent_messages_by_workout_log_key(memberId, date, 6)
 
         start_time = datetime.now()
-        result = workflow.invoke({
-            "message": message,
-            "memberId": memberId,
-            "date": date,
-            "chat_history": chat_history
-        })
+        with _profile_scope(request, request_id, response):
+            result = await workflow.ainvoke({
+                "message": message,
+                "memberId": memberId,
+                "date": date,
+                "chat_history": chat_history
+            })
         elapsed = (datetime.now() - start_time).total_seconds()
 
         logger.info(f"[{request_id}] 운동 기록 처리 완료 (소요: {elapsed:.2f}s)")
 
-        # 사용자 메시지 저장
-        user_message_saved = chat_history_manager.add_workout_log_entry(
-            memberId,
-            date,
-            "user",
-            message
-        )
-        if not user_message_saved:
-            logger.warning(f"[{request_id}] 사용자 메시지 저장 실패: {memberId}")
-
-        # 에이전트(assistant) 메시지 저장
-        assistant_message_saved = chat_history_manager.add_workout_log_entry(
+        # 사용자 메시지 + 에이전트(assistant) 메시지 저장
+        saved = await chat_history_manager.add_workout_log_turn(
             memberId,
             date,
-            "assistant",
+            message,
             result.get("response", "")
         )
-        if not assistant_message_saved:
-            logger.warning(f"[{request_id}] 어시스턴트 메시지 저장 실패: {memberId}")
+        if not saved:
+            logger.warning(f"[{request_id}] 대화 내역 저장 실패: {memberId}")
 
         return WorkoutLogResponse(
             memberId=memberId,
@@ -342,16 +503,17 @@ async def workout_log(workout_log_request: WorkoutLogRequest):
         )
 
 @app.post("/report")
-async def report(ptContractId: int):
-    request_id = str(uuid.uuid4())
+async def report(ptContractId: int, request: Request, response: Response):
+    request_id = current_trace_id() or str(uuid.uuid4())
 
     logger.info(f"[{request_id}] 보고서 요청 - ptContractId: {ptContractId}")
 
     try:
-        workflow = create_report_workflow()
+        workflow = get_report_workflow()
 
         start_time = datetime.now()
-        result = workflow.invoke({"ptContractId": ptContractId})
+        with _profile_scope(request, request_id, response):
+            result = await workflow.ainvoke({"ptContractId": ptContractId})
         elapsed = (datetime.now() - start_time).total_seconds()
 
         logger.info(f"[{request_id}] 보고서 처리 완료 (소요: {elapsed:.2f}s)")
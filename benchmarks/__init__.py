@@ -0,0 +1,4 @@
+"""
+성능 측정 스크립트 모음
+각 스크립트는 프로젝트 루트에서 `python -m benchmarks.<모듈명>` 형태로 실행합니다.
+"""
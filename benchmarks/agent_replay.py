@@ -0,0 +1,263 @@
+"""
+agent_replay.py
+- 에이전트/워크플로우 한 번의 실제 실행을 카세트로 기록하고(record),
+  기록된 카세트를 네트워크 없이 반복 재생해 우리 코드의 순수 처리 시간(bench)을 측정합니다.
+  (그래프 순회, 프롬프트 렌더링, JSON 직렬화/파싱, 정규식 파싱 등. 외부 응답은 즉시 돌아오므로 지연에 포함되지 않음)
+- 대상: exercise / food / schedule / motivation / general 에이전트, pt_log / workout_log / report 워크플로우
+
+실행:
+    # 기록 (실제 OpenAI / DB / Redis / ES / Qdrant 필요, .env 사용)
+    python -m benchmarks.agent_replay record --target food --message "점심에 닭가슴살 샐러드 먹었어" --email a@b.com
+    python -m benchmarks.agent_replay record --target report --input '{"ptContractId": 1}'
+
+    # 재생 벤치마크 (네트워크 불필요)
+    python -m benchmarks.agent_replay bench benchmarks/cassettes/*.json --iterations 50 --output now.json
+    python -m benchmarks.agent_replay bench benchmarks/cassettes/*.json --baseline before.json --fail-threshold 0.2
+
+종료 코드(bench): 기준 결과(--baseline) 대비 p50이 fail-threshold 비율 이상 느려진 카세트가 있거나
+                  재생 중 기록에 없는 호출이 있으면 1
+카세트에는 실제 사용자 데이터와 LLM 응답이 들어가므로 저장소에 커밋하지 않습니다. (기본 경로 benchmarks/cassettes/ 는 .gitignore)
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from benchmarks.cassette import Cassette, install_patches
+from benchmarks.loadtest.loop_lag import percentile
+
+DEFAULT_CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+AGENTS = {
+    "exercise": "ExerciseAgent",
+    "food": "FoodAgent",
+    "schedule": "ScheduleAgent",
+    "motivation": "MotivationAgent",
+    "general": "GeneralAgent",
+}
+
+# (모듈, 워크플로우 접근 함수)
+WORKFLOWS = {
+    "pt_log": ("pt_log.pt_log_workflow", "get_pt_log_workflow"),
+    "workout_log": ("workout_log.workout_log_workflow", "get_workout_log_workflow"),
+    "report": ("report.report_workflow", "get_report_workflow"),
+}
+
+
+def configure_environment() -> None:
+    """기록/재생 모두 같은 호출 경로를 타도록 트레이싱과 LLM 응답 캐시를 끕니다. (모듈 임포트 전에 호출)"""
+    load_dotenv()
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+
+
+def build_target(target: str) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+    """대상 이름에 맞는 실행 함수를 만듭니다. (에이전트는 Supervisor와 같은 방식으로 생성)"""
+    if target in AGENTS:
+        import agents
+        from supervisor_modules.utils.llm_registry import get_llm
+
+        agent = getattr(agents, AGENTS[target])(get_llm("supervisor"))
+        return lambda kwargs: agent.process(**kwargs)
+    if target in WORKFLOWS:
+        module_name, attr = WORKFLOWS[target]
+        workflow = getattr(importlib.import_module(module_name), attr)()
+        return lambda kwargs: workflow.ainvoke(kwargs)
+    raise SystemExit(f"알 수 없는 대상: {target} (가능: {', '.join([*AGENTS, *WORKFLOWS])})")
+
+
+def build_input(args) -> Dict[str, Any]:
+    """Supervisor._dispatch_agent 와 같은 인자 형식으로 에이전트 입력을 만듭니다. (--input 값이 우선)"""
+    member_id = int(args.member_id) if args.member_id and args.member_id.isdigit() else None
+    chat_history: List[Dict[str, Any]] = []
+    kwargs: Dict[str, Any]
+    if args.target == "general":
+        kwargs = {"message": args.message, "context_info": args.message, "chat_history": chat_history}
+    elif args.target == "schedule":
+        kwargs = {"message": args.message, "member_id": member_id, "user_type": args.user_type}
+    elif args.target == "exercise":
+        kwargs = {"message": args.message, "member_id": member_id, "user_type": args.user_type, "chat_history": chat_history}
+    elif args.target in ("food", "motivation"):
+        kwargs = {"message": args.message, "email": args.email, "chat_history": chat_history}
+    else:
+        kwargs = {}
+    if args.input:
+        kwargs.update(json.loads(args.input))
+    if args.target in AGENTS and not kwargs.get("message"):
+        raise SystemExit("에이전트 기록에는 --message 가 필요합니다.")
+    return kwargs
+
+
+def to_jsonable(value: Any) -> Any:
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+# ---------------- record ----------------
+async def record(args) -> None:
+    kwargs = build_input(args)
+    cassette = Cassette("record")
+    with cassette.activate():
+        with cassette.in_phase("setup"):
+            run = build_target(args.target)
+        started = time.perf_counter()
+        output = await run(kwargs)
+        elapsed = time.perf_counter() - started
+
+    output_path = args.output or DEFAULT_CASSETTE_DIR / f"{args.target}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    cassette.save(
+        output_path,
+        target=args.target,
+        input=to_jsonable(kwargs),
+        output=to_jsonable(output),
+        recorded_at=datetime.now().isoformat(),
+        recorded_seconds=round(elapsed, 3),
+    )
+    print(json.dumps({"cassette": str(output_path), "elapsed": round(elapsed, 3), "interactions": cassette.summary()},
+                     ensure_ascii=False, indent=2))
+
+
+# ---------------- bench ----------------
+async def bench_cassette(path: Path, iterations: int, warmup: int) -> Dict[str, Any]:
+    cassette = Cassette.load(path)
+    target = cassette.meta["target"]
+    kwargs = cassette.meta.get("input", {})
+    expected = json.dumps(cassette.meta.get("output"), ensure_ascii=False, sort_keys=True)
+
+    samples: List[float] = []
+    mismatches = 0
+    errors: List[str] = []
+    with cassette.activate():
+        with cassette.in_phase("setup"):
+            run = build_target(target)
+        for i in range(warmup + iterations):
+            cassette.rewind("run")
+            started = time.perf_counter()
+            try:
+                output = await run(dict(kwargs))
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            if i < warmup:
+                continue
+            samples.append(elapsed)
+            if json.dumps(to_jsonable(output), ensure_ascii=False, sort_keys=True) != expected:
+                mismatches += 1
+
+    return {
+        "cassette": path.name,
+        "target": target,
+        "iterations": len(samples),
+        "interactions": sum(1 for item in cassette.interactions if item.get("phase") == "run"),
+        "recorded_ms": round(cassette.meta.get("recorded_seconds", 0) * 1000, 1),
+        "mean_ms": round(statistics.mean(samples), 3) if samples else None,
+        "p50_ms": round(percentile(samples, 0.50), 3) if samples else None,
+        "p95_ms": round(percentile(samples, 0.95), 3) if samples else None,
+        "min_ms": round(min(samples), 3) if samples else None,
+        # 출력에 현재 시각 등이 들어가면 불일치할 수 있음 (참고용)
+        "output_mismatches": mismatches,
+        "cassette_misses": cassette.misses,
+        # 요청 키가 달라 같은 엔드포인트/명령의 다른 기록으로 대신 재생한 수 (실패로 보지는 않음)
+        "cassette_fallbacks": cassette.fallbacks,
+        "errors": errors[:3],
+    }
+
+
+def aggregate(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    by_target: Dict[str, List[float]] = {}
+    for result in results:
+        if result["p50_ms"] is not None:
+            by_target.setdefault(result["target"], []).append(result["p50_ms"])
+    return {
+        target: {
+            "cassettes": len(values),
+            "mean_of_p50_ms": round(statistics.mean(values), 3),
+            "max_p50_ms": round(max(values), 3),
+        }
+        for target, values in sorted(by_target.items())
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> List[Dict[str, Any]]:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    before = {item["cassette"]: item for item in baseline.get("cassettes", [])}
+    regressions = []
+    for result in results:
+        previous = before.get(result["cassette"])
+        if not previous or not previous.get("p50_ms") or result["p50_ms"] is None:
+            continue
+        ratio = result["p50_ms"] / previous["p50_ms"] - 1
+        if ratio >= threshold:
+            regressions.append({
+                "cassette": result["cassette"],
+                "target": result["target"],
+                "baseline_p50_ms": previous["p50_ms"],
+                "p50_ms": result["p50_ms"],
+                "change": f"{ratio:+.1%}",
+            })
+    return regressions
+
+
+async def bench(args) -> int:
+    paths = sorted({Path(p) for p in args.cassettes}) or sorted(DEFAULT_CASSETTE_DIR.glob("*.json"))
+    if not paths:
+        raise SystemExit(f"재생할 카세트가 없습니다. (먼저 record 실행, 기본 경로: {DEFAULT_CASSETTE_DIR})")
+
+    results = [await bench_cassette(path, args.iterations, args.warmup) for path in paths]
+    report: Dict[str, Any] = {"cassettes": results, "targets": aggregate(results)}
+    failed = any(result["cassette_misses"] for result in results)
+    if args.baseline:
+        report["regressions"] = compare(results, args.baseline, args.fail_threshold)
+        failed = failed or bool(report["regressions"])
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="에이전트 실행 기록(record) / 오프라인 재생 벤치마크(bench)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="실제 실행을 카세트로 기록")
+    rec.add_argument("--target", required=True, choices=[*AGENTS, *WORKFLOWS])
+    rec.add_argument("--message", default="")
+    rec.add_argument("--member-id", default="1")
+    rec.add_argument("--user-type", default="member")
+    rec.add_argument("--email", default=None)
+    rec.add_argument("--input", help="입력 인자 JSON (워크플로우 상태 또는 에이전트 인자 덮어쓰기)")
+    rec.add_argument("--output", type=Path, help=f"카세트 경로 (기본: {DEFAULT_CASSETTE_DIR}/<target>_<시각>.json)")
+
+    ben = sub.add_parser("bench", help="카세트를 반복 재생하여 처리 시간 측정")
+    ben.add_argument("cassettes", nargs="*", help=f"카세트 파일 (기본: {DEFAULT_CASSETTE_DIR}/*.json)")
+    ben.add_argument("--iterations", type=int, default=20)
+    ben.add_argument("--warmup", type=int, default=2)
+    ben.add_argument("--baseline", type=Path, help="비교할 이전 bench 결과 JSON")
+    ben.add_argument("--fail-threshold", type=float, default=0.2, help="p50 증가 비율이 이 값 이상이면 회귀로 판단")
+    ben.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    configure_environment()
+    # 임포트 시점에 연결하는 모듈이 있으므로 에이전트 모듈보다 먼저 적용
+    install_patches()
+
+    if args.command == "record":
+        asyncio.run(record(args))
+        return
+    sys.exit(asyncio.run(bench(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,629 @@
+"""
+cassette.py
+- 실제 실행 중 발생한 외부 호출(LLM, DB, Elasticsearch, Qdrant, Redis, HTTP)을 카세트 파일(JSON)에 기록하고
+  오프라인에서 같은 응답으로 재생합니다.
+- 가로채는 지점
+  - httpx Client.send / AsyncClient.send   → OpenAI(채팅, 스트리밍, 임베딩), Qdrant REST
+  - requests Session.send                  → Spring 백엔드, Tavily
+  - Elasticsearch.search                   → 응답 body(dict)
+  - redis Redis.execute_command / Pipeline.execute
+  - psycopg2.connect                       → 커서의 execute 결과(컬럼/행)
+- 재생 시 요청 키(요청 내용 해시)가 같은 기록을 먼저 찾고, 없으면 요청 정보(request)가 같은 기록
+  (HTTP는 method + host + path, ES는 index, Redis는 명령, DB는 쿼리문) 중 아직 쓰지 않은 것을 기록 순서대로 돌려줍니다.
+  (프롬프트에 현재 시각이 들어가는 등 본문만 조금씩 달라지는 경우) 이렇게 대신 돌려준 횟수는 fallbacks(소프트 미스)로 셉니다.
+- 일부 모듈은 임포트 시점에 DB/Redis에 연결하므로 install_patches()는 에이전트 모듈 임포트 전에 호출해야 합니다.
+
+사용:
+    install_patches()
+    cassette = Cassette("record")
+    with cassette.activate():
+        ...  # 실제 호출
+    cassette.save(path, target="food")
+
+    cassette = Cassette.load(path)
+    with cassette.activate():
+        ...  # 네트워크 없이 기록된 응답으로 재생
+"""
+
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+# 2: HTTP 요청 정보를 url 대신 method / host / path로 기록 (대체 재생 범위 제한)
+CASSETTE_VERSION = 2
+
+# 기록/재생하지 않고 그대로 통과시키는 호스트 (트레이싱, 모델 다운로드)
+DEFAULT_PASSTHROUGH_HOSTS = ("api.smith.langchain.com", "huggingface.co", "cdn-lfs.huggingface.co")
+
+# 재생 응답에 남길 헤더 (본문은 이미 디코딩되어 저장되므로 content-encoding/length는 버림)
+KEPT_RESPONSE_HEADERS = ("content-type",)
+
+Column = namedtuple("Column", "name type_code display_size internal_size precision scale null_ok")
+
+
+class CassetteMiss(RuntimeError):
+    """재생 중 기록에 없는 외부 호출이 발생함"""
+
+
+def request_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def encode_value(value: Any) -> Any:
+    """JSON으로 표현되지 않는 값(bytes, 날짜, Decimal 등)을 타입 표식과 함께 변환합니다."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {"__time__": value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {"__timedelta__": value.total_seconds()}
+    if isinstance(value, decimal.Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, dict):
+        return {"__dict__": [[encode_value(k), encode_value(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode_value(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": [encode_value(v) for v in value]}
+    if isinstance(value, list):
+        return [encode_value(v) for v in value]
+    return str(value)
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    (tag, data), = value.items()
+    if tag == "__bytes__":
+        return base64.b64decode(data)
+    if tag == "__datetime__":
+        return datetime.datetime.fromisoformat(data)
+    if tag == "__date__":
+        return datetime.date.fromisoformat(data)
+    if tag == "__time__":
+        return datetime.time.fromisoformat(data)
+    if tag == "__timedelta__":
+        return datetime.timedelta(seconds=data)
+    if tag == "__decimal__":
+        return decimal.Decimal(data)
+    if tag == "__dict__":
+        return {decode_value(k): decode_value(v) for k, v in data}
+    if tag == "__tuple__":
+        return tuple(decode_value(v) for v in data)
+    if tag == "__set__":
+        return {decode_value(v) for v in data}
+    return value
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(body: Dict[str, str]) -> bytes:
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body.get("text", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    mode="record": 실제 호출 결과를 interactions에 쌓습니다.
+    mode="replay": interactions에서 응답을 꺼내 돌려주며, 기록에 없는 호출은 CassetteMiss를 냅니다.
+    misses: 기록에 없는 호출 수 / fallbacks: 요청 키가 달라 같은 요청 정보의 다른 기록으로 대신 재생한 수
+    phase: "setup"(임포트/객체 생성) 과 "run"(측정 대상 실행) 기록을 구분해 반복 재생 시 run만 되감습니다.
+    """
+
+    def __init__(
+        self,
+        mode: str = "record",
+        interactions: Optional[List[Dict[str, Any]]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        passthrough_hosts=DEFAULT_PASSTHROUGH_HOSTS,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"지원하지 않는 모드: {mode}")
+        self.mode = mode
+        self.interactions: List[Dict[str, Any]] = list(interactions or [])
+        self.meta: Dict[str, Any] = dict(meta or {})
+        self.passthrough_hosts = tuple(passthrough_hosts)
+        self.phase = "run"
+        self._lock = threading.Lock()
+        self._consumed: set = set()
+        self.misses = 0
+        self.fallbacks = 0
+
+    # ---------------- 파일 ----------------
+    @classmethod
+    def load(cls, path, **kwargs) -> "Cassette":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"카세트 버전이 맞지 않습니다: {path} (version={data.get('version')})")
+        meta = {k: v for k, v in data.items() if k not in ("version", "interactions")}
+        return cls("replay", data.get("interactions", []), meta=meta, **kwargs)
+
+    def save(self, path, **meta) -> None:
+        self.meta.update(meta)
+        data = {"version": CASSETTE_VERSION, **self.meta, "interactions": self.interactions}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=1, default=str), encoding="utf-8")
+
+    # ---------------- 기록 / 재생 ----------------
+    @contextmanager
+    def activate(self) -> Iterator["Cassette"]:
+        global _active
+        previous, _active = _active, self
+        try:
+            yield self
+        finally:
+            _active = previous
+
+    @contextmanager
+    def in_phase(self, phase: str) -> Iterator["Cassette"]:
+        previous, self.phase = self.phase, phase
+        try:
+            yield self
+        finally:
+            self.phase = previous
+
+    def rewind(self, phase: str = "run") -> None:
+        """해당 단계의 기록을 다시 쓸 수 있게 되돌립니다. (같은 카세트 반복 재생용)"""
+        with self._lock:
+            self._consumed = {i for i in self._consumed if self.interactions[i].get("phase") != phase}
+
+    def passthrough(self, url: str) -> bool:
+        host = urlsplit(str(url)).hostname or ""
+        return any(host == h or host.endswith("." + h) for h in self.passthrough_hosts)
+
+    def record(self, kind: str, key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(
+                {"kind": kind, "phase": self.phase, "key": key, "request": request, "response": response}
+            )
+
+    def replay(self, kind: str, key: str, request: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            candidates = [
+                i for i, item in enumerate(self.interactions)
+                if i not in self._consumed and item["kind"] == kind and item.get("phase") == self.phase
+            ]
+            exact = [i for i in candidates if self.interactions[i]["key"] == key]
+            if exact:
+                chosen = exact[0]
+            else:
+                # 같은 엔드포인트/명령의 기록으로만 대신 재생 (다른 호출의 응답을 돌려주지 않음)
+                similar = [i for i in candidates if self.interactions[i].get("request") == request]
+                if not similar:
+                    self.misses += 1
+                    raise CassetteMiss(f"기록에 없는 {kind} 호출 (phase={self.phase}): {request or key}")
+                chosen = similar[0]
+                self.fallbacks += 1
+            self._consumed.add(chosen)
+            return self.interactions[chosen]["response"]
+
+    def unused(self, phase: str = "run") -> int:
+        return sum(
+            1 for i, item in enumerate(self.interactions)
+            if item.get("phase") == phase and i not in self._consumed
+        )
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for item in self.interactions:
+            name = f"{item.get('phase')}.{item['kind']}"
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+_active: Optional[Cassette] = None
+_installed = False
+_install_lock = threading.Lock()
+
+
+def active_cassette() -> Optional[Cassette]:
+    return _active
+
+
+# ---------------- httpx ----------------
+def _http_request_info(method: str, url: Any) -> Dict[str, Any]:
+    parts = urlsplit(str(url))
+    return {"method": method, "host": parts.netloc, "path": parts.path}
+
+
+def _httpx_key(request) -> str:
+    return request_key("http", request.method, str(request.url), hashlib.sha256(request.content or b"").hexdigest())
+
+
+def _httpx_response_data(response) -> Dict[str, Any]:
+    headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_RESPONSE_HEADERS}
+    return {"status": response.status_code, "headers": headers, "body": _encode_body(response.content)}
+
+
+def _httpx_build_response(httpx, request, data: Dict[str, Any]):
+    return httpx.Response(
+        data["status"], headers=data.get("headers", {}), content=_decode_body(data["body"]), request=request
+    )
+
+
+def _patch_httpx() -> None:
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    original_send = httpx.Client.send
+    original_async_send = httpx.AsyncClient.send
+
+    def send(self, request, **kwargs):
+        cassette = _active
+        if cassette is None or cassette.passthrough(request.url):
+            return original_send(self, request, **kwargs)
+        info = _http_request_info(request.method, request.url)
+        if cassette.mode == "replay":
+            data = cassette.replay("http", _httpx_key(request), info)
+            return _httpx_build_response(httpx, request, data)
+        response = original_send(self, request, **kwargs)
+        response.read()  # 스트리밍 응답도 전체를 읽어 기록 (이후 iter_bytes는 읽은 본문을 돌려줌)
+        cassette.record("http", _httpx_key(request), info, _httpx_response_data(response))
+        return response
+
+    async def async_send(self, request, **kwargs):
+        cassette = _active
+        if cassette is None or cassette.passthrough(request.url):
+            return await original_async_send(self, request, **kwargs)
+        info = _http_request_info(request.method, request.url)
+        if cassette.mode == "replay":
+            data = cassette.replay("http", _httpx_key(request), info)
+            return _httpx_build_response(httpx, request, data)
+        response = await original_async_send(self, request, **kwargs)
+        await response.aread()
+        cassette.record("http", _httpx_key(request), info, _httpx_response_data(response))
+        return response
+
+    httpx.Client.send = send
+    httpx.AsyncClient.send = async_send
+
+
+# ---------------- requests ----------------
+def _patch_requests() -> None:
+    try:
+        import requests
+        from requests.structures import CaseInsensitiveDict
+    except ImportError:
+        return
+
+    original_send = requests.Session.send
+
+    def key_of(request) -> str:
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return request_key("http", request.method, request.url, hashlib.sha256(body).hexdigest())
+
+    def send(self, request, **kwargs):
+        cassette = _active
+        if cassette is None or cassette.passthrough(request.url):
+            return original_send(self, request, **kwargs)
+        info = _http_request_info(request.method, request.url)
+        if cassette.mode == "replay":
+            data = cassette.replay("http", key_of(request), info)
+            response = requests.Response()
+            response.status_code = data["status"]
+            response.headers = CaseInsensitiveDict(data.get("headers", {}))
+            response._content = _decode_body(data["body"])
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            response.reason = "OK" if data["status"] < 400 else "Error"
+            return response
+        response = original_send(self, request, **kwargs)
+        headers = {k: v for k, v in response.headers.items() if k.lower() in KEPT_RESPONSE_HEADERS}
+        cassette.record(
+            "http", key_of(request), info,
+            {"status": response.status_code, "headers": headers, "body": _encode_body(response.content)},
+        )
+        return response
+
+    requests.Session.send = send
+
+
+# ---------------- Elasticsearch ----------------
+def _patch_elasticsearch() -> None:
+    try:
+        from elasticsearch import Elasticsearch
+    except ImportError:
+        return
+
+    original_search = Elasticsearch.search
+
+    def search(self, *args, **kwargs):
+        cassette = _active
+        if cassette is None:
+            return original_search(self, *args, **kwargs)
+        key = request_key("es.search", args, kwargs)
+        if cassette.mode == "replay":
+            return decode_value(cassette.replay("es", key, {"index": kwargs.get("index")})["body"])
+        response = original_search(self, *args, **kwargs)
+        body = getattr(response, "body", response)
+        cassette.record("es", key, {"index": kwargs.get("index")}, {"body": encode_value(dict(body))})
+        return response
+
+    Elasticsearch.search = search
+
+
+# ---------------- Redis ----------------
+def _patch_redis() -> None:
+    try:
+        import redis
+        from redis.client import Pipeline
+    except ImportError:
+        return
+
+    original_execute_command = redis.Redis.execute_command
+    original_pipeline_execute = Pipeline.execute
+
+    def execute_command(self, *args, **options):
+        cassette = _active
+        if cassette is None:
+            return original_execute_command(self, *args, **options)
+        key = request_key("redis", args)
+        info = {"command": str(args[0]) if args else ""}
+        if cassette.mode == "replay":
+            return decode_value(cassette.replay("redis", key, info)["result"])
+        result = original_execute_command(self, *args, **options)
+        cassette.record("redis", key, info, {"result": encode_value(result)})
+        return result
+
+    def pipeline_execute(self, *args, **kwargs):
+        cassette = _active
+        if cassette is None:
+            return original_pipeline_execute(self, *args, **kwargs)
+        commands = [command_args for command_args, _ in self.command_stack]
+        key = request_key("redis.pipeline", commands)
+        info = {"commands": [str(c[0]) for c in commands if c]}
+        if cassette.mode == "replay":
+            self.reset()
+            return decode_value(cassette.replay("redis", key, info)["result"])
+        result = original_pipeline_execute(self, *args, **kwargs)
+        cassette.record("redis", key, info, {"result": encode_value(result)})
+        return result
+
+    redis.Redis.execute_command = execute_command
+    Pipeline.execute = pipeline_execute
+
+
+# ---------------- psycopg2 ----------------
+def _query_text(query: Any) -> str:
+    # sql.Composed는 실제 연결 없이 문자열로 만들 수 없으므로 기록/재생 모두 repr을 키로 사용
+    if isinstance(query, bytes):
+        return query.decode("utf-8", "replace")
+    return query if isinstance(query, str) else repr(query)
+
+
+def _db_key(query: Any, params: Any) -> str:
+    return request_key("db", _query_text(query), encode_value(params))
+
+
+class _RecordingCursorMixin:
+    """execute 결과를 모두 읽어 카세트에 남기고, fetch*는 읽어 둔 행에서 돌려줍니다."""
+
+    _cassette_rows: Optional[List[Any]] = None
+    _cassette_pos = 0
+
+    def _cassette_capture(self, query, params) -> None:
+        cassette = _active
+        rows: List[Any] = []
+        columns: Optional[List[str]] = None
+        if self.description:
+            columns = [d[0] for d in self.description]
+            rows = list(super().fetchall())
+        self._cassette_rows, self._cassette_pos = rows, 0
+        if cassette is not None and cassette.mode == "record":
+            cassette.record(
+                "db", _db_key(query, params), {"query": _query_text(query)[:200]},
+                {
+                    "columns": columns,
+                    "rows": [encode_value(dict(r) if isinstance(r, dict) else tuple(r)) for r in rows],
+                    "rowcount": self.rowcount,
+                },
+            )
+
+    def execute(self, query, vars=None):
+        result = super().execute(query, vars)
+        self._cassette_capture(query, vars)
+        return result
+
+    def executemany(self, query, vars_list):
+        vars_list = list(vars_list)
+        result = super().executemany(query, vars_list)
+        self._cassette_capture(query, vars_list)
+        return result
+
+    def fetchone(self):
+        if self._cassette_rows is None:
+            return super().fetchone()
+        if self._cassette_pos >= len(self._cassette_rows):
+            return None
+        self._cassette_pos += 1
+        return self._cassette_rows[self._cassette_pos - 1]
+
+    def fetchmany(self, size=None):
+        if self._cassette_rows is None:
+            return super().fetchmany(size) if size is not None else super().fetchmany()
+        size = size or self.arraysize
+        rows = self._cassette_rows[self._cassette_pos:self._cassette_pos + size]
+        self._cassette_pos += len(rows)
+        return rows
+
+    def fetchall(self):
+        if self._cassette_rows is None:
+            return super().fetchall()
+        rows = self._cassette_rows[self._cassette_pos:]
+        self._cassette_pos = len(self._cassette_rows)
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+
+_recording_cursor_classes: Dict[type, type] = {}
+
+
+def _recording_cursor_class(base: type) -> type:
+    cls = _recording_cursor_classes.get(base)
+    if cls is None:
+        cls = type(f"Recording{base.__name__}", (_RecordingCursorMixin, base), {})
+        _recording_cursor_classes[base] = cls
+    return cls
+
+
+class ReplayCursor:
+    """기록된 execute 결과를 돌려주는 DB-API 커서 대역"""
+
+    arraysize = 1
+
+    def __init__(self, cassette: Cassette):
+        self._cassette = cassette
+        self._rows: List[Any] = []
+        self._pos = 0
+        self.description = None
+        self.rowcount = -1
+        self.closed = False
+
+    def execute(self, query, vars=None):
+        data = self._cassette.replay("db", _db_key(query, vars), {"query": _query_text(query)[:200]})
+        columns = data.get("columns")
+        self.description = [Column(name, None, None, None, None, None, None) for name in columns] if columns else None
+        self.rowcount = data.get("rowcount", -1)
+        self._rows = [decode_value(row) for row in data.get("rows", [])]
+        self._pos = 0
+
+    def executemany(self, query, vars_list):
+        self.execute(query, list(vars_list))
+
+    def fetchone(self):
+        if self._pos >= len(self._rows):
+            return None
+        self._pos += 1
+        return self._rows[self._pos - 1]
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class ReplayConnection:
+    """psycopg2 connection 대역 (commit/rollback/close는 아무 일도 하지 않음)"""
+
+    def __init__(self, cassette: Cassette):
+        self._cassette = cassette
+        self.closed = 0
+        self.autocommit = False
+        self.encoding = "UTF8"
+
+    def cursor(self, *args, **kwargs):
+        # RealDictCursor 등으로 기록된 행은 dict 그대로 저장되어 있으므로 cursor_factory는 무시
+        return ReplayCursor(self._cassette)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+    def set_session(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _patch_psycopg2() -> None:
+    try:
+        import psycopg2
+        import psycopg2.extensions
+    except ImportError:
+        return
+
+    class RecordingConnection(psycopg2.extensions.connection):
+        def cursor(self, *args, **kwargs):
+            base = kwargs.pop("cursor_factory", None) or self.cursor_factory or psycopg2.extensions.cursor
+            return super().cursor(*args, cursor_factory=_recording_cursor_class(base), **kwargs)
+
+    original_connect = psycopg2.connect
+
+    def connect(*args, **kwargs):
+        cassette = _active
+        if cassette is None:
+            return original_connect(*args, **kwargs)
+        if cassette.mode == "replay":
+            return ReplayConnection(cassette)
+        if "connection_factory" not in kwargs:
+            kwargs["connection_factory"] = RecordingConnection
+        return original_connect(*args, **kwargs)
+
+    psycopg2.connect = connect
+
+
+def install_patches() -> None:
+    """외부 호출 지점을 가로챕니다. (활성 카세트가 없으면 원래 동작 그대로, 여러 번 호출해도 한 번만 적용)"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _patch_httpx()
+        _patch_requests()
+        _patch_elasticsearch()
+        _patch_redis()
+        _patch_psycopg2()
+        _installed = True
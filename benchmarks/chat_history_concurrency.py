@@ -0,0 +1,123 @@
+"""
+chat_history_concurrency.py
+- 여러 스레드가 같은 대화 키에 동시에 턴(사용자 + 응답)을 쓰는 동안 읽기 스레드가 계속 조회하며
+  ChatHistoryManager 저장 형태가 깨지지 않는지 확인합니다.
+  - 목록 길이가 max_history를 넘지 않음 (RPUSH와 LTRIM 사이의 중간 상태가 보이지 않음)
+  - 사용자 메시지 바로 뒤에 같은 턴의 응답이 옴 (다른 요청의 메시지가 끼어들지 않음)
+  - 끝난 뒤 길이가 정확히 max_history
+- 대상 저장소
+    python -m benchmarks.chat_history_concurrency                 # .env의 REDIS_HOST/PORT (실제 Redis)
+    python -m benchmarks.chat_history_concurrency --backend fake  # fakeredis (같은 프로세스)
+    python -m benchmarks.chat_history_concurrency --backend memory
+
+종료 코드: 위반이 하나라도 있으면 1
+"""
+
+import argparse
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from chat_history_manager import ChatHistoryManager  # noqa: E402
+
+
+def check_history(messages: List[Dict[str, Any]], max_history: int) -> List[str]:
+    problems = []
+    if len(messages) > max_history:
+        problems.append(f"길이 {len(messages)} > max_history {max_history}")
+    # 앞쪽이 잘려 응답만 남은 경우는 없어야 함 (max_history는 짝수, 턴 단위로 추가)
+    for i in range(0, len(messages) - 1, 2):
+        user, reply = messages[i], messages[i + 1]
+        if user.get("role") != "user" or reply.get("role") != "ai":
+            problems.append(f"{i}번째 위치의 순서가 user/ai가 아님: {user.get('role')}/{reply.get('role')}")
+        elif user.get("content") != reply.get("turn"):
+            problems.append(f"{i}번째 턴에 다른 요청의 응답이 섞임")
+    if len(messages) % 2:
+        problems.append(f"길이 {len(messages)}가 홀수 (턴 일부만 기록됨)")
+    return problems
+
+
+def build_manager(backend: str) -> ChatHistoryManager:
+    manager = ChatHistoryManager()
+    if backend == "fake":
+        import fakeredis
+
+        manager.redis_client = fakeredis.FakeRedis(decode_responses=True)
+        manager.use_redis = True
+    elif backend == "memory":
+        manager.use_redis = False
+    elif not manager.use_redis:
+        sys.exit("Redis에 연결할 수 없습니다. --backend fake 또는 memory 를 사용하세요.")
+    return manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대화 내역 동시 쓰기 시 목록 길이/턴 순서 확인")
+    parser.add_argument("--backend", choices=["redis", "fake", "memory"], default="redis")
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=200, help="작성 스레드당 턴 수")
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    manager = build_manager(args.backend)
+    email = f"concurrency-check-{uuid.uuid4().hex[:8]}"
+    manager.clear_history(email)
+
+    problems: List[str] = []
+    failures = 0
+    reads = 0
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def writer(index: int) -> None:
+        nonlocal failures
+        for turn in range(args.turns):
+            turn_id = f"{index}-{turn}"
+            if not manager.add_chat_turn(email, turn_id, f"응답 {turn_id}", additional_data={"turn": turn_id}):
+                with lock:
+                    failures += 1
+
+    def reader() -> None:
+        nonlocal reads
+        while not done.is_set():
+            found = check_history(manager.get_recent_messages(email, manager.max_history), manager.max_history)
+            with lock:
+                reads += 1
+                problems.extend(found)
+
+    readers = [threading.Thread(target=reader) for _ in range(args.readers)]
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    started = time.perf_counter()
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    final = manager.get_recent_messages(email, manager.max_history)
+    problems.extend(check_history(final, manager.max_history))
+    if len(final) != manager.max_history:
+        problems.append(f"최종 길이 {len(final)} != max_history {manager.max_history}")
+    manager.clear_history(email)
+
+    total_turns = args.writers * args.turns
+    print(f"backend={args.backend} 턴 {total_turns}개 기록, {elapsed:.2f}s ({total_turns / elapsed:.0f} turns/s), "
+          f"조회 {reads}회, 저장 실패 {failures}회, 최종 길이 {len(final)}")
+    if problems or failures:
+        for problem in sorted(set(problems))[:20]:
+            print(f"  ✗ {problem}")
+        sys.exit(1)
+    print("  ✓ 동시 쓰기 중에도 길이 상한과 턴 순서 유지")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+concurrency_check.py
+- 실행 중인 API 서버에 N개의 요청을 동시에 보내 이벤트 루프가 막히지 않는지 확인합니다.
+- 같은 요청 N개를 먼저 하나씩 순서대로 보내 요청별 단독 지연을 잰 뒤, 동시에 다시 보냅니다.
+  비동기 경로가 올바르면 동시 실행 전체 소요 시간 ≈ max(단독 지연), 어딘가에서 루프를 막으면 ≈ sum(단독 지연)에 가까워집니다.
+  (동시 실행 중 잰 개별 지연은 막힌 루프 뒤에서 기다린 시간까지 포함하므로 비교 기준으로 쓰지 않음)
+- 워커 1개로 띄운 서버를 대상으로 실행해야 의미가 있습니다.
+    uvicorn api_server:app --port 8000 --workers 1
+    python -m benchmarks.concurrency_check --url http://localhost:8000 --endpoint /chat -n 8
+
+종료 코드: 200이 아닌 응답이 있거나, 동시 실행 전체 소요 시간이 max(단독 지연) * tolerance 를 넘으면 1
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+DEFAULT_MESSAGES = [
+    "스쿼트 자세 알려줘",
+    "오늘 점심 닭가슴살 샐러드 먹었어",
+    "이번 주 PT 일정 알려줘",
+    "요즘 운동하기 너무 싫어",
+    "안녕",
+    "하체 루틴 짜줘",
+    "단백질 많은 저녁 메뉴 추천해줘",
+    "오늘 며칠이야?",
+]
+
+
+def build_payload(endpoint: str, index: int, args) -> Dict[str, Any]:
+    message = DEFAULT_MESSAGES[index % len(DEFAULT_MESSAGES)]
+    if endpoint == "/pt_log":
+        return {"message": message, "ptScheduleId": args.pt_schedule_id}
+    if endpoint == "/workout_log":
+        return {"message": message, "memberId": int(args.member_id), "date": args.date}
+    return {"message": message, "member_id": args.member_id, "user_type": "member"}
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        response = await client.post(endpoint, json=payload)
+        status = response.status_code
+    except Exception as e:
+        status = f"error: {e}"
+    return {"status": status, "latency": time.perf_counter() - started}
+
+
+async def run_batch(args, concurrent: bool) -> Dict[str, Any]:
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        payloads = [build_payload(args.endpoint, i, args) for i in range(args.n)]
+        started = time.perf_counter()
+        if concurrent:
+            results: List[Dict[str, Any]] = await asyncio.gather(*[send(client, args.endpoint, p) for p in payloads])
+        else:
+            results = [await send(client, args.endpoint, p) for p in payloads]
+        wall = time.perf_counter() - started
+
+    latencies = [r["latency"] for r in results]
+    return {
+        "mode": "concurrent" if concurrent else "sequential",
+        "requests": args.n,
+        "statuses": sorted({str(r["status"]) for r in results}),
+        "wall": round(wall, 3),
+        "max_latency": round(max(latencies), 3),
+        "sum_latency": round(sum(latencies), 3),
+        "wall_over_max": round(wall / max(latencies), 3),
+        "wall_over_sum": round(wall / sum(latencies), 3),
+    }
+
+
+async def main_async(args) -> int:
+    sequential = await run_batch(args, concurrent=False)
+    report = await run_batch(args, concurrent=True)
+    solo_max, solo_sum = sequential["max_latency"], sequential["sum_latency"]
+    report["wall_over_solo_max"] = round(report["wall"] / solo_max, 3)
+    report["wall_over_solo_sum"] = round(report["wall"] / solo_sum, 3)
+    print(json.dumps([sequential, report], ensure_ascii=False, indent=2))
+
+    statuses = set(sequential["statuses"]) | set(report["statuses"])
+    ok_status = statuses == {"200"}
+    ok_wall = report["wall"] <= solo_max * args.tolerance
+    passed = ok_status and ok_wall
+    print(f"{'PASS' if passed else 'FAIL'}: 동시 wall={report['wall']}s, 단독 max={solo_max}s, 단독 sum={solo_sum}s "
+          f"(tolerance x{args.tolerance}), 응답 코드 {sorted(statuses)}")
+    if not ok_status:
+        print("  ✗ 200이 아닌 응답이 있음 (오류 응답은 빨리 끝나므로 지연 비교가 의미 없음)")
+    return 0 if passed else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 요청 시 전체 소요 시간이 max(지연)에 가까운지 확인")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/chat", choices=["/chat", "/pt_log", "/workout_log"])
+    parser.add_argument("-n", type=int, default=8, help="동시 요청 수")
+    parser.add_argument("--member-id", default="1")
+    parser.add_argument("--pt-schedule-id", type=int, default=1)
+    parser.add_argument("--date", default="2025-01-01")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="허용 배수 (동시 wall <= 단독 max * tolerance)")
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+embedding_batching.py
+- 동시 호출자 1/8/32명이 질의 임베딩을 요청할 때 처리량과 지연 시간을 비교합니다.
+  - direct: 기존 방식 (호출마다 model.encode(query) 1건, 호출 스레드에서 실행)
+  - service: EmbeddingService (마이크로 배치 + LRU 캐시)
+- 질의는 실제 채팅 메시지(benchmarks.micro.cases.MESSAGES)에 번호를 붙여 만들고, --repeat-ratio 비율만큼 이미 나온 질의를 다시 보냅니다.
+  (0이면 모두 다른 질의라 캐시 효과 없이 배치 효과만 측정)
+- 대상 모델
+    python -m benchmarks.embedding_batching                          # all-mpnet-base-v2 (sentence_transformers 필요)
+    python -m benchmarks.embedding_batching --fake                   # 고정 호출 비용 + 건당 비용을 갖는 가짜 모델
+    python -m benchmarks.embedding_batching --callers 1 8 32 --requests 256 --torch-threads 4
+"""
+
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from benchmarks.micro.cases import MESSAGES  # noqa: E402
+from supervisor_modules.utils.embedding_service import EmbeddingService  # noqa: E402
+
+
+class FakeModel:
+    """
+    model.encode 비용을 '호출당 고정 비용 + 건당 비용'으로 흉내 내는 모델
+    동시에 호출해도 같은 CPU를 나눠 쓰므로 호출 하나씩 순서대로 실행합니다.
+    """
+
+    def __init__(self, call_ms: float, item_ms: float, dim: int = 768):
+        self.call = call_ms / 1000
+        self.item = item_ms / 1000
+        self.dim = dim
+        self._lock = threading.Lock()
+
+    def encode(self, texts: Any, batch_size: int = 32) -> Any:
+        import numpy as np
+
+        single = isinstance(texts, str)
+        items = [texts] if single else list(texts)
+        with self._lock:
+            time.sleep(self.call + self.item * len(items))
+        vectors = np.stack([np.random.default_rng(abs(hash(t)) % 2 ** 32).random(self.dim, dtype=np.float32) for t in items])
+        return vectors[0] if single else vectors
+
+
+def make_queries(n: int, repeat_ratio: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    queries: List[str] = []
+    for i in range(n):
+        if queries and rng.random() < repeat_ratio:
+            queries.append(rng.choice(queries))
+        else:
+            queries.append(f"{MESSAGES[i % len(MESSAGES)]} #{i}")
+    return queries
+
+
+def run(encode: Callable[[str], Any], queries: List[str], callers: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def call(query: str) -> None:
+        started = time.perf_counter()
+        encode(query).tolist()
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(call, queries))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "wall_s": round(wall, 3),
+        "qps": round(len(queries) / wall, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질의 임베딩 마이크로 배치 / LRU 캐시 처리량 비교")
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=256, help="동시 호출자 수마다 보낼 질의 수")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="이미 보낸 질의를 다시 보낼 비율")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--torch-threads", type=int, default=0)
+    parser.add_argument("--model", default="all-mpnet-base-v2")
+    parser.add_argument("--fake", action="store_true", help="sentence_transformers 없이 가짜 모델로 측정")
+    parser.add_argument("--fake-call-ms", type=float, default=15, help="가짜 모델의 호출당 고정 비용")
+    parser.add_argument("--fake-item-ms", type=float, default=1, help="가짜 모델의 건당 비용")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fake:
+        model: Any = FakeModel(args.fake_call_ms, args.fake_item_ms)
+    else:
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(args.model)
+        model.encode(["워밍업"])
+
+    results = []
+    for callers in args.callers:
+        # 호출자 수마다 다른 질의를 써서 앞 단계의 캐시가 결과에 섞이지 않게 함
+        queries = make_queries(args.requests, args.repeat_ratio, args.seed + callers)
+        direct = run(model.encode, queries, callers)
+        service = EmbeddingService(
+            f"bench-{callers}", lambda: model,
+            max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, torch_threads=args.torch_threads,
+        )
+        batched = run(service.encode, queries, callers)
+        stats = service.stats()
+        service.shutdown()
+        results.append({
+            "callers": callers,
+            "direct": direct,
+            "service": batched,
+            "speedup": round(batched["qps"] / direct["qps"], 2),
+            "avg_batch": stats["avg_batch"],
+            "cache_hits": stats["hits"],
+        })
+        print(f"callers={callers:>3}: direct {direct['qps']:>7} q/s (p95 {direct['p95_ms']}ms) → "
+              f"service {batched['qps']:>7} q/s (p95 {batched['p95_ms']}ms), x{results[-1]['speedup']}, "
+              f"평균 배치 {stats['avg_batch']}, 캐시 적중 {stats['hits']}")
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
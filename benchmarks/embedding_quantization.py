@@ -0,0 +1,190 @@
+"""
+embedding_quantization.py
+- 운동 정보 유사도 검색(retrieve_exercise_info_by_similarity)의 질의 임베딩 모드별 검색 품질과 CPU 지연 시간을 비교합니다.
+  - 모드: fp32(기존) / int8(torch 동적 양자화), 각각 max_seq_length 제한 여부
+  - 질의: benchmarks/data/exercise_queries.jsonl (플래너가 보내는 것과 같은 영어 질의)
+- 기준 결과는 fp32 모델 질의 벡터로 Qdrant exercises 컬렉션을 정확 검색(exact=True)한 상위 k개이고,
+  각 모드는 실제 검색과 같은 설정(hnsw_ef=128)으로 검색해 다음을 기록합니다.
+  - recall@k: 기준 상위 k개 중 같이 찾은 비율 / top1: 1위가 같은 비율
+  - threshold: 점수 0.6 이상만 남기는 도구 필터를 통과한 결과 집합이 기준과 같은 비율
+  - cosine: 기준 질의 벡터와의 코사인 유사도 평균
+  - 지연 시간: 질의 1건 encode의 p50 / p95 (질의마다 --repeat회 중 중앙값), 모델 state_dict 크기
+- Qdrant 접속 정보(QDRANT_API_KEY)와 sentence_transformers / torch가 필요합니다.
+
+실행:
+    python -m benchmarks.embedding_quantization
+    python -m benchmarks.embedding_quantization --configs fp32 int8 int8:128 int8:64 --k 3 --torch-threads 4
+    python -m benchmarks.embedding_quantization --output quantization.json
+
+결과를 보고 EMBEDDING_QUANTIZE / EMBEDDING_MAX_SEQ_LENGTH를 정합니다.
+"""
+
+import argparse
+import io
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from agents.exercise.tools.exercise_member_tools import EMBEDDING_MODEL_NAME, get_qdrant_client  # noqa: E402
+from supervisor_modules.utils.embedding_service import load_sentence_transformer  # noqa: E402
+
+QUERIES_PATH = Path(__file__).resolve().parent / "data" / "exercise_queries.jsonl"
+COLLECTION = "exercises"
+# retrieve_exercise_info_by_similarity와 같은 값
+SCORE_THRESHOLD = 0.6
+HNSW_EF = 128
+
+
+def parse_config(text: str) -> Tuple[str, bool, int]:
+    """'int8:128' → (이름, 양자화 여부, max_seq_length, 0이면 모델 기본값)"""
+    mode, _, seq = text.partition(":")
+    if mode not in ("fp32", "int8"):
+        raise argparse.ArgumentTypeError(f"알 수 없는 모드: {mode} (fp32 | int8[:max_seq_length])")
+    return text, mode == "int8", int(seq or 0)
+
+
+def load_queries(path: Path) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["query"] for line in f if line.strip()]
+
+
+def model_size_mb(model: Any) -> float:
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return round(buffer.tell() / 1024 / 1024, 1)
+
+
+def encode_timed(model: Any, queries: List[str], repeat: int) -> Tuple[List[Any], List[float]]:
+    """질의마다 1건씩 encode (서비스 단독 호출과 같은 조건), 지연 시간은 repeat회 중 중앙값"""
+    vectors, latencies = [], []
+    for query in queries:
+        samples = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            vector = model.encode(query)
+            samples.append(time.perf_counter() - started)
+        vectors.append(vector)
+        latencies.append(statistics.median(samples))
+    return vectors, latencies
+
+
+def search(client: Any, vector: Any, k: int, exact: bool) -> List[Tuple[str, float]]:
+    from qdrant_client.models import SearchParams
+
+    hits = client.search(
+        collection_name=COLLECTION,
+        query_vector=vector.tolist(),
+        limit=k,
+        search_params=SearchParams(hnsw_ef=HNSW_EF, exact=exact),
+    )
+    return [(str(hit.id), hit.score) for hit in hits]
+
+
+def _cosine(a: Any, b: Any) -> float:
+    import numpy as np
+
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def evaluate(
+    name: str,
+    quantize: bool,
+    max_seq_length: int,
+    queries: List[str],
+    client: Any,
+    baseline: Optional[Dict[str, Any]],
+    k: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    model = load_sentence_transformer(EMBEDDING_MODEL_NAME, quantize=quantize, max_seq_length=max_seq_length)
+    model.encode(["워밍업"])
+    vectors, latencies = encode_timed(model, queries, repeat)
+    results = [search(client, vector, k, exact=False) for vector in vectors]
+
+    report: Dict[str, Any] = {
+        "config": name,
+        "int8": quantize,
+        "max_seq_length": model.max_seq_length,
+        "model_mb": model_size_mb(model),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+    }
+    if baseline is not None:
+        recall, top1, threshold = [], [], []
+        for hits, expected in zip(results, baseline["results"]):
+            expected_ids = [hit_id for hit_id, _ in expected]
+            found_ids = [hit_id for hit_id, _ in hits]
+            recall.append(len(set(found_ids) & set(expected_ids)) / max(len(expected_ids), 1))
+            top1.append(bool(found_ids) and bool(expected_ids) and found_ids[0] == expected_ids[0])
+            threshold.append(
+                {hit_id for hit_id, score in hits if score >= SCORE_THRESHOLD}
+                == {hit_id for hit_id, score in expected if score >= SCORE_THRESHOLD}
+            )
+        report.update({
+            f"recall@{k}": round(statistics.mean(recall), 4),
+            "top1": round(statistics.mean(top1), 4),
+            "threshold": round(statistics.mean(threshold), 4),
+            "cosine": round(statistics.mean(_cosine(a, b) for a, b in zip(vectors, baseline["vectors"])), 4),
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질의 임베딩 int8 양자화 / 길이 제한 모드의 recall 대비 지연 시간 평가")
+    parser.add_argument("--configs", nargs="+", type=parse_config,
+                        default=[parse_config(c) for c in ("fp32", "int8", "fp32:128", "int8:128", "int8:64")])
+    parser.add_argument("--queries", type=Path, default=QUERIES_PATH)
+    parser.add_argument("--k", type=int, default=3, help="검색 결과 수 (도구 기본값 3)")
+    parser.add_argument("--repeat", type=int, default=5, help="질의마다 encode 반복 횟수")
+    parser.add_argument("--torch-threads", type=int, default=0, help="0이면 torch 기본값")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.torch_threads > 0:
+        import torch
+
+        torch.set_num_threads(args.torch_threads)
+
+    queries = load_queries(args.queries)
+    client = get_qdrant_client()
+
+    # 기준: fp32 모델 + 정확 검색
+    reference = load_sentence_transformer(EMBEDDING_MODEL_NAME, quantize=False, max_seq_length=0)
+    reference_vectors = [reference.encode(query) for query in queries]
+    baseline = {
+        "vectors": reference_vectors,
+        "results": [search(client, vector, args.k, exact=True) for vector in reference_vectors],
+    }
+    del reference
+
+    reports = []
+    for name, quantize, max_seq_length in args.configs:
+        report = evaluate(name, quantize, max_seq_length, queries, client, baseline, args.k, args.repeat)
+        reports.append(report)
+        print(f"{name:>10}: p50 {report['p50_ms']:7.2f}ms  p95 {report['p95_ms']:7.2f}ms  "
+              f"recall@{args.k} {report[f'recall@{args.k}']:.3f}  top1 {report['top1']:.3f}  "
+              f"threshold {report['threshold']:.3f}  cosine {report['cosine']:.4f}  모델 {report['model_mb']}MB")
+
+    summary = {"queries": len(queries), "k": args.k, "model": EMBEDDING_MODEL_NAME, "results": reports}
+    if args.output:
+        args.output.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.output}")
+    else:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+first_use_check.py
+- 임포트 시점 대신 처음 사용할 때 만들도록 바꾼 클라이언트/연결을, 새 워커에서 처음 호출하는 경로가 실제로 만드는지 확인합니다.
+  (import_budget은 임포트만 보므로 '만들지 않고 None을 그대로 쓰는' 경로는 잡지 못함)
+- 외부 서비스는 가짜 객체로 바꿔 새 프로세스에서 실행합니다. (ES 검색 결과, psycopg2 연결, 음식명 일치 판단 LLM 응답)
+  - food.lookup_nutrition: ES 적중 + LLM '맞습니다' → Postgres 영양 정보 조회
+  - food.search_food: ES 적중 → Postgres 영양 정보 조회
+  - food.execute_sql: 연결 없는 상태에서 SELECT
+  - food.reconnect: 조회 오류 후 연결을 버리고 다음 호출에서 다시 연결
+
+실행:
+    python -m benchmarks.first_use_check
+
+종료 코드: 하나라도 실패하면 1
+"""
+
+import json
+import sys
+from types import SimpleNamespace
+from typing import Any, Callable, List, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+NUTRITION_ROW = (7, "닭가슴살", 109.0, 23.0)
+NUTRITION_COLUMNS = ("id", "name", "calories", "protein")
+
+
+class FakeCursor:
+    def __init__(self, connection: "FakeConnection"):
+        self.connection = connection
+        self.description = None
+        self._rows: List[Tuple[Any, ...]] = []
+
+    def execute(self, query: str, params: Any = None) -> None:
+        if self.connection.closed:
+            raise self.connection.error("connection already closed")
+        if self.connection.fail_next:
+            self.connection.fail_next = False
+            raise self.connection.error("server closed the connection unexpectedly")
+        self.connection.queries.append(query)
+        self.description = [(name,) for name in NUTRITION_COLUMNS]
+        self._rows = [NUTRITION_ROW]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self, error: type):
+        self.error = error
+        self.closed = 0
+        self.fail_next = False
+        self.queries: List[str] = []
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class FakeES:
+    def search(self, **kwargs: Any) -> dict:
+        return {"hits": {"hits": [{"_score": 10.0, "_source": {"id": NUTRITION_ROW[0], "name": NUTRITION_ROW[1]}}]}}
+
+
+def main() -> None:
+    import psycopg2
+
+    connections: List[FakeConnection] = []
+
+    def connect(*args: Any, **kwargs: Any) -> FakeConnection:
+        connections.append(FakeConnection(psycopg2.OperationalError))
+        return connections[-1]
+
+    psycopg2.connect = connect
+
+    from agents.food.tool import recommend_diet_tool as food
+
+    food.get_es = lambda: FakeES()
+    food.cached_invoke = lambda llm, messages, site=None: SimpleNamespace(content="맞습니다. 같은 음식입니다.")
+
+    def lookup_nutrition() -> str:
+        result = food.lookup_nutrition_tool.invoke({"params": {"food_name": "닭가슴살"}})
+        assert json.loads(result)["calories"] == NUTRITION_ROW[2], result
+        return f"영양 정보 조회 (연결 {len(connections)}개)"
+
+    def search_food() -> str:
+        result = food.search_food_tool.invoke({"params": {"food_name": "닭가슴살"}})
+        assert "protein: 23.0" in result, result
+        return "영양 정보 조회"
+
+    def execute_sql() -> str:
+        rows = json.loads(food.execute_sql("SELECT * FROM food_nutrition"))
+        assert rows and rows[0]["name"] == NUTRITION_ROW[1], rows
+        return f"{len(rows)}행"
+
+    def reconnect() -> str:
+        before = len(connections)
+        connections[-1].fail_next = True
+        try:
+            food.fetch_food_nutrition(NUTRITION_ROW[0])
+        except psycopg2.Error:
+            pass
+        else:
+            raise AssertionError("조회 오류가 전달되지 않음")
+        assert food.fetch_food_nutrition(NUTRITION_ROW[0])["id"] == NUTRITION_ROW[0]
+        assert len(connections) == before + 1, f"새 연결이 만들어지지 않음 ({before} → {len(connections)})"
+        return "오류 후 재연결"
+
+    checks: List[Tuple[str, Callable[[], str]]] = [
+        ("food.lookup_nutrition", lookup_nutrition),
+        ("food.search_food", search_food),
+        ("food.execute_sql", execute_sql),
+        ("food.reconnect", reconnect),
+    ]
+    failed = False
+    for name, check in checks:
+        try:
+            print(f"  ✓ {name}: {check()}")
+        except Exception as e:
+            failed = True
+            print(f"  ✗ {name}: {type(e).__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
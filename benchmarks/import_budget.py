@@ -0,0 +1,154 @@
+"""
+import_budget.py
+- 모듈을 새 프로세스에서 `python -X importtime`으로 임포트해 시작 비용을 확인합니다.
+- 다음 중 하나라도 해당하면 실패(종료 코드 1)합니다. (무거운 초기화가 다시 모듈 최상위로 새어 나온 경우)
+  - 임포트 중 네트워크 접속 시도 (socket.connect / getaddrinfo 감사 이벤트)
+  - 임포트만으로 지연 생성 객체(supervisor_modules.utils.lazy)가 만들어짐
+  - 처음 사용할 때 불러와야 하는 무거운 모듈(sentence_transformers, torch, qdrant_utils 분석기 등)이 임포트됨
+  - 누적 임포트 시간이 예산(--budget-ms, 대상별 기본값)을 넘음
+
+실행:
+    python -m benchmarks.import_budget                          # supervisor, agents, api_server
+    python -m benchmarks.import_budget --module agents --top 20  # 자체 시간이 큰 모듈 20개 출력
+    python -m benchmarks.import_budget --budget-ms 3000 --repeat 3
+
+임포트 시간은 .pyc가 없으면 크게 늘어나므로 대상마다 한 번 먼저 임포트한 뒤 --repeat회 측정해 최솟값을 씁니다.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# 대상별 누적 임포트 시간 예산(ms). 대부분은 langchain / openai 패키지 자체의 임포트 시간
+DEFAULT_BUDGETS_MS = {
+    "supervisor": 2500,
+    "agents": 4000,
+    "api_server": 5000,
+}
+
+# 요청을 처리할 때 처음 불러와야 하는 모듈 (임포트 시점에 보이면 실패)
+DEFERRED_MODULES = (
+    "sentence_transformers",
+    "torch",
+    "IPython",
+    "qdrant_utils.data_analyzer",
+    "qdrant_utils.qdrant_client",
+    "supervisor_modules.utils.qdrant_helper",
+)
+
+_MARKER = "__IMPORT_BUDGET__"
+
+# 자식 프로세스에서 실행: 감사 훅으로 네트워크 접속을 기록하면서 대상 모듈 임포트
+_CHILD = """
+import importlib, json, sys, traceback
+network = []
+def _audit(event, args):
+    if event in ("socket.connect", "socket.getaddrinfo") and len(network) < 20:
+        origin = next((f"{{f.filename}}:{{f.lineno}}" for f in reversed(traceback.extract_stack()[:-1])
+                       if {repo!r} in f.filename and "import_budget" not in f.filename), "?")
+        network.append(f"{{event}} {{args[0]!r}} ({{origin}})")
+sys.addaudithook(_audit)
+error = None
+try:
+    importlib.import_module({module!r})
+except BaseException as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+try:
+    from supervisor_modules.utils.lazy import initialized_resources
+    created = initialized_resources()
+except ImportError:
+    created = []
+deferred = [name for name in {deferred!r} if name in sys.modules]
+print({marker!r} + json.dumps({{"error": error, "network": network, "lazy": created, "deferred": deferred}}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(모듈, 자체 µs, 누적 µs, 깊이) 목록"""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return rows
+
+
+def measure(module: str) -> Dict[str, Any]:
+    code = _CHILD.format(repo=str(REPO_DIR), module=module, deferred=DEFERRED_MODULES, marker=_MARKER)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_DIR), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_DIR, env=env, capture_output=True, text=True,
+    )
+    report = next(
+        (json.loads(line[len(_MARKER):]) for line in proc.stdout.splitlines() if line.startswith(_MARKER)),
+        {"error": f"자식 프로세스 종료 코드 {proc.returncode}: {proc.stderr.strip()[-300:]}",
+         "network": [], "lazy": [], "deferred": []},
+    )
+    rows = _parse_importtime(proc.stderr)
+    top_level = [row for row in rows if row[3] == 0]
+    report["total_us"] = sum(row[2] for row in top_level)
+    report["target_us"] = next((row[2] for row in top_level if row[0] == module), 0)
+    report["rows"] = rows
+    return report
+
+
+def _is_repo_module(name: str) -> bool:
+    root = name.split(".")[0]
+    return (REPO_DIR / root).is_dir() or (REPO_DIR / f"{root}.py").exists()
+
+
+def check(module: str, budget_ms: float, repeat: int, top: int) -> List[str]:
+    measure(module)  # .pyc 생성 / 디스크 캐시 준비
+    reports = [measure(module) for _ in range(max(repeat, 1))]
+    report = min(reports, key=lambda r: r["total_us"])
+    total_ms = report["total_us"] / 1000
+
+    problems = []
+    if report["error"]:
+        problems.append(f"임포트 실패: {report['error']}")
+    problems.extend(f"임포트 중 네트워크 접속: {event}" for event in report["network"])
+    problems.extend(f"임포트만으로 생성된 지연 객체: {name}" for name in report["lazy"])
+    problems.extend(f"처음 사용할 때 불러와야 하는 모듈이 임포트됨: {name}" for name in report["deferred"])
+    if total_ms > budget_ms:
+        problems.append(f"임포트 시간 {total_ms:.0f}ms > 예산 {budget_ms:.0f}ms")
+
+    print(f"{module}: {total_ms:.0f}ms (예산 {budget_ms:.0f}ms, {len(reports)}회 중 최소), 모듈 {len(report['rows'])}개")
+    if top:
+        for name, self_us, cumulative_us, _ in sorted(report["rows"], key=lambda r: -r[1])[:top]:
+            mark = "*" if _is_repo_module(name) else " "
+            print(f"  {mark} {self_us / 1000:8.1f}ms  (누적 {cumulative_us / 1000:8.1f}ms)  {name}")
+    for problem in problems:
+        print(f"  ✗ {problem}")
+    if not problems:
+        print("  ✓ 네트워크 접속 / 지연 객체 생성 / 지연 모듈 임포트 없음")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 임포트 시간 예산 및 임포트 시점 초기화 검사")
+    parser.add_argument("--module", nargs="+", default=list(DEFAULT_BUDGETS_MS))
+    parser.add_argument("--budget-ms", type=float, default=None, help="모든 대상에 같은 예산 적용 (기본: 대상별 값)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="자체 임포트 시간이 큰 모듈 n개 출력 (*: 이 저장소 모듈)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.module:
+        budget = args.budget_ms if args.budget_ms is not None else DEFAULT_BUDGETS_MS.get(module, 3000)
+        failed |= bool(check(module, budget, args.repeat, args.top))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+오프라인 부하 테스트 도구
+- fake_openai: OpenAI 호환 대역 서버, fake_backend: Spring 백엔드 / Tavily 대역 서버
+- serve: 대역 서버를 바라보는 api_server 실행 (+ 이벤트 루프 지연 측정)
+- driver: 요청 코퍼스를 동시에 재생하고 엔드포인트별 지연 / 처리량 보고
+"""
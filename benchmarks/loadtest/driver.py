@@ -0,0 +1,180 @@
+"""
+driver.py
+- 요청 코퍼스(JSONL)를 정해진 동시성으로 api_server에 반복 재생하고
+  엔드포인트별 처리량, p50/p95/p99 지연, 오류 수와 서버 이벤트 루프 지연을 보고합니다.
+- 서버는 benchmarks.loadtest.serve로 띄워야 루프 지연(/loadtest/loop_lag)까지 수집됩니다.
+
+실행:
+    python -m benchmarks.loadtest.driver --url http://localhost:8000 -c 16 -n 400
+    python -m benchmarks.loadtest.driver --endpoints /chat --duration 60 --output result.json
+
+코퍼스 형식 (benchmarks/loadtest/data/requests.jsonl)
+    {"endpoint": "/chat", "payload": {"message": "...", "member_id": "1", "user_type": "member"}}
+    {"endpoint": "/report", "params": {"ptContractId": 1}}
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from benchmarks.loadtest.loop_lag import percentile
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "requests.jsonl"
+
+# 200 응답이지만 서버 내부에서 처리에 실패한 경우
+APP_ERROR_MARKERS = ("처리 중 오류가 발생했습니다", "문제가 발생했습니다")
+
+
+def load_corpus(path: Path, endpoints: Optional[List[str]]) -> List[Dict[str, Any]]:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            if endpoints and entry["endpoint"] not in endpoints:
+                continue
+            entries.append(entry)
+    if not entries:
+        raise SystemExit(f"코퍼스에 실행할 요청이 없습니다: {path} (endpoints={endpoints})")
+    return entries
+
+
+def is_app_error(body: Any) -> bool:
+    if not isinstance(body, dict):
+        return False
+    text = str(body.get("final_response", ""))
+    return any(marker in text for marker in APP_ERROR_MARKERS)
+
+
+async def send(client: httpx.AsyncClient, entry: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    status: Any
+    app_error = False
+    try:
+        response = await client.post(entry["endpoint"], json=entry.get("payload"), params=entry.get("params"))
+        status = response.status_code
+        try:
+            app_error = is_app_error(response.json())
+        except ValueError:
+            pass
+    except Exception as e:
+        status = type(e).__name__
+    return {
+        "endpoint": entry["endpoint"],
+        "status": status,
+        "app_error": app_error,
+        "latency": time.perf_counter() - started,
+    }
+
+
+async def fetch_loop_lag(client: httpx.AsyncClient, reset: bool) -> Optional[Dict[str, Any]]:
+    try:
+        response = await client.get("/loadtest/loop_lag", params={"reset": str(reset).lower()})
+        return response.json() if response.status_code == 200 else None
+    except Exception:
+        return None
+
+
+def summarize(results: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    by_endpoint: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for result in results:
+        by_endpoint[result["endpoint"]].append(result)
+
+    def stats(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        latencies = [r["latency"] for r in items]
+        return {
+            "requests": len(items),
+            "throughput_rps": round(len(items) / wall, 2) if wall else 0,
+            "http_errors": sum(1 for r in items if r["status"] != 200),
+            "app_errors": sum(1 for r in items if r["app_error"]),
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "mean": round(statistics.mean(latencies), 3) if latencies else 0,
+            "max": round(max(latencies, default=0), 3),
+        }
+
+    return {
+        "wall": round(wall, 3),
+        "total": stats(results),
+        "endpoints": {endpoint: stats(items) for endpoint, items in sorted(by_endpoint.items())},
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    corpus = load_corpus(args.corpus, args.endpoints)
+    if args.shuffle:
+        random.Random(args.seed).shuffle(corpus)
+    entries: Iterator[Dict[str, Any]] = itertools.cycle(corpus)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        for _ in range(args.warmup):
+            await send(client, next(entries))
+        await fetch_loop_lag(client, reset=True)
+
+        results: List[Dict[str, Any]] = []
+        remaining = args.n
+        deadline = time.perf_counter() + args.duration if args.duration else None
+
+        def take() -> Optional[Dict[str, Any]]:
+            nonlocal remaining
+            if deadline is not None:
+                return next(entries) if time.perf_counter() < deadline else None
+            if remaining <= 0:
+                return None
+            remaining -= 1
+            return next(entries)
+
+        async def worker():
+            while True:
+                entry = take()
+                if entry is None:
+                    return
+                results.append(await send(client, entry))
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+        wall = time.perf_counter() - started
+
+        report = summarize(results, wall)
+        report["concurrency"] = args.concurrency
+        report["loop_lag"] = await fetch_loop_lag(client, reset=False)
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코퍼스를 동시에 재생하여 엔드포인트별 처리량/지연과 루프 지연 측정")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--endpoints", nargs="*", help="실행할 엔드포인트만 선택 (예: /chat /pt_log)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("-n", type=int, default=200, help="총 요청 수 (--duration 지정 시 무시)")
+    parser.add_argument("--duration", type=float, default=0, help="지정한 시간(초) 동안 반복")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 순차 요청 수")
+    parser.add_argument("--shuffle", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
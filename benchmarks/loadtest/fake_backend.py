@@ -0,0 +1,78 @@
+"""
+fake_backend.py
+- 부하 테스트용 Spring 백엔드(EC2_BACKEND_URL)와 Tavily 검색 API 대역 서버
+- /api/** 는 모든 메서드에 성공 응답을, /search · /extract 는 Tavily 형식의 고정 결과를 돌려줍니다.
+
+실행:
+    python -m benchmarks.loadtest.fake_backend --port 9200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def build_app(latency: float, search_latency: float) -> FastAPI:
+    app = FastAPI(title="fake-backend")
+    stats: Dict[str, int] = {"api": 0, "search": 0}
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    # ---------------- Tavily ----------------
+    @app.post("/search")
+    async def search(request: Request):
+        body = await request.json()
+        stats["search"] += 1
+        await asyncio.sleep(search_latency)
+        query = body.get("query", "")
+        return {
+            "query": query,
+            "answer": f"{query}에 대한 요약입니다.",
+            "results": [
+                {
+                    "title": f"{query} 가이드 {i}",
+                    "url": f"https://example.com/{i}",
+                    "content": f"{query} 관련 테스트 본문 {i}. 100g 기준 열량 120kcal, 단백질 23g, 지방 2g, 탄수화물 0g.",
+                    "score": 0.9 - i * 0.05,
+                }
+                for i in range(3)
+            ],
+            "response_time": search_latency,
+        }
+
+    @app.post("/extract")
+    async def extract(request: Request):
+        body = await request.json()
+        await asyncio.sleep(search_latency)
+        return {"results": [{"url": url, "raw_content": "테스트 본문"} for url in body.get("urls", [])], "failed_results": []}
+
+    # ---------------- Spring 백엔드 ----------------
+    @app.api_route("/api/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def backend(path: str, request: Request) -> Any:
+        stats["api"] += 1
+        await asyncio.sleep(latency)
+        if request.method == "GET":
+            return {"success": True, "data": []}
+        return {"success": True, "data": {"id": 1}}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 Spring 백엔드 / Tavily 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=0.05, help="백엔드 API 응답 지연(초)")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Tavily 검색 응답 지연(초)")
+    args = parser.parse_args()
+    print(f"fake-backend: http://{args.host}:{args.port} (/api/**, /search)")
+    uvicorn.run(build_app(args.latency, args.search_latency), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+fake_openai.py
+- 부하 테스트용 OpenAI 호환 로컬 서버 (/v1/chat/completions, /v1/embeddings)
+- 응답은 스크립트(JSONL 규칙)나 녹화된 응답에서 고르고, 첫 토큰 지연과 초당 토큰 수로 모델 지연을 흉내냅니다.
+- 스트리밍(SSE), stream_options.include_usage, tools/functions 호출, response_format(json_schema)을 지원합니다.
+
+실행:
+    python -m benchmarks.loadtest.fake_openai --port 9100 --latency 0.4 --tokens-per-sec 60
+
+스크립트 규칙 (benchmarks/loadtest/data/llm_script.jsonl, 위에서부터 처음 일치하는 규칙 사용)
+    {"name": "classify", "prompt": "카테고리로", "after": "사용자 메시지:", "match": "스쿼트|루틴", "response": "[\"exercise\"]"}
+    - prompt: 전체 메시지 텍스트에서 찾는 정규식 (생략 시 항상 일치)
+    - after / match: after 마커 뒤의 텍스트에서 match 정규식을 찾음 (사용자 메시지만 보고 판단할 때 사용)
+    - response: 응답 텍스트. {tail}은 after 마커 뒤 텍스트(최대 40자)로 치환
+    - tool_call: {"name": ..., "arguments": {...}} 요청에 같은 이름의 도구가 있고 직전 메시지가 도구 결과가 아니면 도구 호출로 응답
+녹화된 응답: {"prompt_sha256": ..., "response": ...} 형식의 줄은 메시지가 정확히 같을 때만 사용
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_SCRIPT = Path(__file__).parent / "data" / "llm_script.jsonl"
+DEFAULT_RESPONSE = "네, 요청하신 내용을 확인했습니다. 테스트 응답입니다."
+
+
+class FakeLLM:
+    def __init__(self, script_path: Optional[Path], latency: float, tokens_per_sec: float, embedding_latency: float):
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.embedding_latency = embedding_latency
+        self.rules: List[Dict[str, Any]] = []
+        self.recorded: Dict[str, str] = {}
+        self.stats: Dict[str, int] = {"chat": 0, "stream": 0, "embeddings": 0, "tool_calls": 0, "recorded_hits": 0}
+        if script_path and script_path.exists():
+            self.load(script_path)
+
+    def load(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                entry = json.loads(line)
+                if "prompt_sha256" in entry:
+                    self.recorded[entry["prompt_sha256"]] = entry["response"]
+                else:
+                    self.rules.append(entry)
+
+    @staticmethod
+    def prompt_digest(messages: List[Dict[str, Any]]) -> str:
+        payload = json.dumps([[m.get("role"), m.get("content")] for m in messages], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _text(messages: List[Dict[str, Any]]) -> str:
+        parts = []
+        for message in messages:
+            content = message.get("content") or ""
+            if isinstance(content, list):
+                content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+            parts.append(content)
+        return "\n".join(parts)
+
+    def choose(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        digest = self.prompt_digest(messages)
+        if digest in self.recorded:
+            self.stats["recorded_hits"] += 1
+            return {"response": self.recorded[digest]}
+
+        text = self._text(messages)
+        for rule in self.rules:
+            if rule.get("prompt") and not re.search(rule["prompt"], text):
+                continue
+            tail = text
+            if rule.get("after"):
+                index = text.rfind(rule["after"])
+                if index < 0:
+                    continue
+                tail = text[index + len(rule["after"]):]
+            if rule.get("match") and not re.search(rule["match"], tail):
+                continue
+            chosen = dict(rule)
+            if "response" in chosen:
+                chosen["response"] = chosen["response"].replace("{tail}", tail.strip().replace('"', "'")[:40])
+            return chosen
+        return {"response": DEFAULT_RESPONSE}
+
+    def completion_delay(self, text: str) -> float:
+        return self.latency + (count_tokens(text) / self.tokens_per_sec if self.tokens_per_sec > 0 else 0)
+
+
+def count_tokens(text: str) -> int:
+    # 한국어 기준 대략 2자 = 1토큰
+    return max(1, len(text) // 2)
+
+
+def schema_example(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None) -> Any:
+    """JSON schema에 맞는 최소 예시 값"""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return schema_example(defs.get(schema["$ref"].split("/")[-1], {}), defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "anyOf" in schema:
+        return schema_example(schema["anyOf"][0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: schema_example(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [schema_example(schema.get("items", {}), defs)]
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    return "테스트"
+
+
+def structured_content(rule: Dict[str, Any], schema: Dict[str, Any]) -> str:
+    """규칙 응답이 JSON이면 그대로, 아니면 스키마 예시를 사용"""
+    try:
+        return json.dumps(json.loads(rule.get("response", "")), ensure_ascii=False)
+    except (TypeError, ValueError):
+        return json.dumps(schema_example(schema), ensure_ascii=False)
+
+
+def build_app(fake: FakeLLM) -> FastAPI:
+    app = FastAPI(title="fake-openai")
+
+    @app.get("/stats")
+    async def stats():
+        return fake.stats
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input", "")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        model = body.get("model", "text-embedding-3-small")
+        dimensions = body.get("dimensions") or (3072 if "large" in model else 1536)
+        fake.stats["embeddings"] += 1
+        await asyncio.sleep(fake.embedding_latency)
+
+        data = []
+        for index, text in enumerate(inputs):
+            seed = hashlib.sha256(str(text).encode("utf-8")).digest()
+            raw = [((seed[i % len(seed)] + i * 31) % 256) / 255.0 - 0.5 for i in range(dimensions)]
+            norm = sum(v * v for v in raw) ** 0.5 or 1.0
+            data.append({"object": "embedding", "index": index, "embedding": [v / norm for v in raw]})
+        tokens = sum(count_tokens(str(t)) for t in inputs)
+        return {"object": "list", "data": data, "model": model, "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        model = body.get("model", "gpt-4o-mini")
+        rule = fake.choose(messages)
+
+        message: Dict[str, Any] = {"role": "assistant", "content": rule.get("response", DEFAULT_RESPONSE)}
+        finish_reason = "stop"
+
+        tools = {t.get("function", {}).get("name"): t.get("function", {}) for t in body.get("tools") or []}
+        functions = {f.get("name"): f for f in body.get("functions") or []}
+        last_role = messages[-1].get("role") if messages else None
+        response_format = body.get("response_format") or {}
+
+        tool_call = rule.get("tool_call")
+        forced = body.get("tool_choice")
+        if isinstance(forced, dict) and forced.get("function", {}).get("name") in tools:
+            # with_structured_output(method="function_calling")처럼 특정 도구를 강제한 경우
+            name = forced["function"]["name"]
+            tool_call = {"name": name, "arguments": json.loads(structured_content(rule, tools[name].get("parameters", {})))}
+
+        if tool_call and last_role not in ("tool", "function") and (tool_call["name"] in tools or tool_call["name"] in functions):
+            fake.stats["tool_calls"] += 1
+            arguments = json.dumps(tool_call.get("arguments", {}), ensure_ascii=False)
+            message["content"] = None
+            if tool_call["name"] in tools:
+                message["tool_calls"] = [{
+                    "id": f"call_{uuid.uuid4().hex[:12]}",
+                    "type": "function",
+                    "function": {"name": tool_call["name"], "arguments": arguments},
+                }]
+                finish_reason = "tool_calls"
+            else:
+                message["function_call"] = {"name": tool_call["name"], "arguments": arguments}
+                finish_reason = "function_call"
+        elif response_format.get("type") == "json_schema":
+            message["content"] = structured_content(rule, response_format.get("json_schema", {}).get("schema", {}))
+
+        prompt_tokens = count_tokens(FakeLLM._text(messages))
+        completion_text = message["content"] or json.dumps(message.get("tool_calls") or message.get("function_call"), ensure_ascii=False)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": count_tokens(completion_text),
+            "total_tokens": prompt_tokens + count_tokens(completion_text),
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            fake.stats["stream"] += 1
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(
+                stream_chunks(fake, completion_id, created, model, message, finish_reason, usage if include_usage else None),
+                media_type="text/event-stream",
+            )
+
+        fake.stats["chat"] += 1
+        await asyncio.sleep(fake.completion_delay(completion_text))
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": usage,
+        })
+
+    return app
+
+
+async def stream_chunks(fake: FakeLLM, completion_id: str, created: int, model: str,
+                        message: Dict[str, Any], finish_reason: str, usage: Optional[Dict[str, int]]):
+    def chunk(delta: Dict[str, Any], finish: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}],
+        }
+        if extra:
+            payload.update(extra)
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    await asyncio.sleep(fake.latency)
+    yield chunk({"role": "assistant", "content": ""})
+
+    if message.get("tool_calls"):
+        call = message["tool_calls"][0]
+        yield chunk({"tool_calls": [{"index": 0, **call}]})
+    elif message.get("function_call"):
+        yield chunk({"function_call": message["function_call"]})
+    else:
+        content = message["content"] or ""
+        # 2자(≈1토큰) 단위로 나눠 초당 토큰 수에 맞춰 전송
+        delay = 1.0 / fake.tokens_per_sec if fake.tokens_per_sec > 0 else 0
+        for start in range(0, len(content), 2):
+            yield chunk({"content": content[start:start + 2]})
+            if delay:
+                await asyncio.sleep(delay)
+
+    yield chunk({}, finish_reason)
+    if usage is not None:
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                   "model": model, "choices": [], "usage": usage}
+        yield f"data: {json.dumps(payload)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부하 테스트용 OpenAI 호환 로컬 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--script", type=Path, default=DEFAULT_SCRIPT, help="응답 규칙/녹화 JSONL")
+    parser.add_argument("--latency", type=float, default=0.4, help="첫 토큰까지 지연(초)")
+    parser.add_argument("--tokens-per-sec", type=float, default=60, help="완성 토큰 생성 속도 (0이면 즉시)")
+    parser.add_argument("--embedding-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    fake = FakeLLM(args.script, args.latency, args.tokens_per_sec, args.embedding_latency)
+    print(f"fake-openai: 규칙 {len(fake.rules)}개, 녹화 응답 {len(fake.recorded)}개 → http://{args.host}:{args.port}/v1")
+    uvicorn.run(build_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
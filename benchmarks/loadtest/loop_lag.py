@@ -0,0 +1,54 @@
+"""
+loop_lag.py
+- 이벤트 루프 지연(lag) 측정기
+- interval마다 sleep을 걸고 실제로 깨어난 시각과의 차이를 기록합니다.
+  어딘가에서 루프를 막는 동기 호출이 있으면 그 시간만큼 lag이 커집니다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.05, max_samples: int = 100_000):
+        self.interval = interval
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        samples = list(self.samples)
+        if reset:
+            self.samples.clear()
+        return {
+            "samples": len(samples),
+            "interval": self.interval,
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(max(samples, default=0.0) * 1000, 2),
+        }
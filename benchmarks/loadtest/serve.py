@@ -0,0 +1,85 @@
+"""
+serve.py
+- 부하 테스트용으로 api_server를 띄웁니다.
+  - OpenAI 호출 → fake_openai, EC2_BACKEND_URL → fake_backend, Tavily → fake_backend(/search)
+  - 이벤트 루프 지연 측정기를 붙이고 GET /loadtest/loop_lag 로 노출 (?reset=true 로 초기화)
+- Postgres / Redis / Elasticsearch / Qdrant 는 대역이 없으므로 로컬(docker 등)에 띄워 두고 .env로 지정합니다.
+
+실행 (각각 다른 터미널):
+    python -m benchmarks.loadtest.fake_openai --port 9100
+    python -m benchmarks.loadtest.fake_backend --port 9200
+    python -m benchmarks.loadtest.serve --port 8000
+    python -m benchmarks.loadtest.driver --url http://localhost:8000 -c 16 -n 400
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from benchmarks.loadtest.loop_lag import LoopLagMonitor
+
+
+def configure_environment(openai_url: str, backend_url: str) -> None:
+    """api_server 임포트 전에 외부 서비스 주소를 대역 서버로 바꿉니다. (모듈 임포트 시점에 읽는 값이 있음)"""
+    os.environ["OPENAI_BASE_URL"] = openai_url
+    os.environ["OPENAI_API_BASE"] = openai_url
+    os.environ.setdefault("OPENAI_API_KEY", "sk-loadtest")
+    os.environ["EC2_BACKEND_URL"] = backend_url
+    os.environ.setdefault("TAVILY_API_KEY", "tvly-loadtest")
+    # LangSmith로 트레이스를 보내지 않음
+    os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+
+def redirect_tavily(backend_url: str) -> None:
+    """Tavily 클라이언트는 API 주소가 고정되어 있어 클래스/모듈 값을 대역 서버로 바꿉니다."""
+    try:
+        import tavily
+
+        original_init = tavily.TavilyClient.__init__
+
+        def init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            self.base_url = backend_url
+
+        tavily.TavilyClient.__init__ = init
+    except ImportError:
+        pass
+
+    try:
+        from langchain_community.utilities import tavily_search
+
+        tavily_search.TAVILY_API_URL = backend_url
+    except ImportError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대역 서버를 바라보는 api_server 실행 (부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--openai-url", default="http://127.0.0.1:9100/v1")
+    parser.add_argument("--backend-url", default="http://127.0.0.1:9200")
+    parser.add_argument("--lag-interval", type=float, default=0.05, help="루프 지연 측정 간격(초)")
+    args = parser.parse_args()
+
+    configure_environment(args.openai_url, args.backend_url)
+    redirect_tavily(args.backend_url)
+
+    from api_server import app  # noqa: E402 - 환경 변수 설정 후 임포트
+
+    monitor = LoopLagMonitor(interval=args.lag_interval)
+    app.add_event_handler("startup", monitor.start)
+    app.add_event_handler("shutdown", monitor.stop)
+
+    async def loop_lag(reset: bool = False):
+        return monitor.snapshot(reset=reset)
+
+    app.add_api_route("/loadtest/loop_lag", loop_lag, methods=["GET"])
+
+    # 워커 1개: 한 이벤트 루프의 블로킹/직렬화 병목을 보기 위함
+    uvicorn.run(app, host=args.host, port=args.port, workers=1, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
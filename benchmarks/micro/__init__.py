@@ -0,0 +1,14 @@
+"""
+micro
+- 요청마다 실행되는 순수 파이썬 경로(키워드 매칭, 정규식, 날짜 파싱, 플레이스홀더 치환, JSON 직렬화 등)의
+  호출당 시간과 메모리 할당량을 측정합니다. 외부 서비스 호출은 없습니다.
+- 두 git 리비전을 각각 임시 worktree로 꺼내 같은 케이스를 실행하고 결과를 비교할 수 있습니다.
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.micro                              # 전체 케이스
+    python -m benchmarks.micro -k emotion schedule          # 이름에 포함된 케이스만
+    python -m benchmarks.micro --compare main               # main vs 현재 작업 트리
+    python -m benchmarks.micro --compare v1.0 HEAD --output compare.json
+
+이 패키지는 비교 시 다른 리비전의 트리에 그대로 복사되어 실행되므로 내부에서는 상대 임포트만 사용합니다.
+"""
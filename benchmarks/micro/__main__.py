@@ -0,0 +1,116 @@
+"""
+python -m benchmarks.micro [옵션]
+- 옵션 없이 실행하면 현재 트리에서 측정하고 표로 출력합니다.
+- --compare BASE [CANDIDATE]: 각 리비전을 임시 git worktree로 꺼내 별도 프로세스에서 측정하고 비교합니다.
+  CANDIDATE를 생략하면 현재 작업 트리(커밋하지 않은 변경 포함)가 후보입니다.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .runner import compare, format_comparison, format_table, run_all
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+# 다른 리비전 트리에 복사해 실행할 때의 패키지 이름 (해당 리비전의 benchmarks 패키지와 겹치지 않게)
+COPY_NAME = "_microbench"
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _run_in_tree(tree: Path, workdir: Path, label: str, passthrough: List[str]) -> List[Dict[str, Any]]:
+    """tree를 작업 디렉터리로 두고 이 패키지 사본을 실행해 결과 JSON을 받습니다."""
+    package_copy = workdir / "pkg" / COPY_NAME
+    if not package_copy.exists():
+        shutil.copytree(PACKAGE_DIR, package_copy, ignore=shutil.ignore_patterns("__pycache__"))
+    output = workdir / f"{label}.json"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(tree), str(package_copy.parent), env.get("PYTHONPATH")]))
+    print(f"[{label}] {tree} 측정 중...", file=sys.stderr)
+    subprocess.run(
+        [sys.executable, "-m", COPY_NAME, "--output", str(output), "--quiet", *passthrough],
+        cwd=tree, env=env, check=True,
+    )
+    return json.loads(output.read_text(encoding="utf-8"))["results"]
+
+
+def run_compare(base: str, candidate: Optional[str], passthrough: List[str]) -> Dict[str, Any]:
+    repo = Path(_git(Path.cwd(), "rev-parse", "--show-toplevel"))
+    workdir = Path(tempfile.mkdtemp(prefix="microbench_"))
+    worktrees: List[Path] = []
+    try:
+        trees = {}
+        for label, rev in (("baseline", base), ("candidate", candidate)):
+            if rev is None:
+                trees[label] = repo
+                continue
+            tree = workdir / label
+            _git(repo, "worktree", "add", "--detach", str(tree), rev)
+            worktrees.append(tree)
+            trees[label] = tree
+        results = {label: _run_in_tree(tree, workdir, label, passthrough) for label, tree in trees.items()}
+    finally:
+        for tree in worktrees:
+            subprocess.run(["git", "-C", str(repo), "worktree", "remove", "--force", str(tree)], capture_output=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "baseline": base,
+        "candidate": candidate or "working tree",
+        "comparison": compare(results["baseline"], results["candidate"]),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="순수 파이썬 핫 패스 마이크로 벤치마크 (시간 / 메모리 할당)")
+    parser.add_argument("-k", "--keyword", nargs="*", help="이름에 포함된 케이스만 실행 (예: emotion schedule)")
+    parser.add_argument("--repeat", type=int, default=7, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="한 번의 측정이 최소 이 시간(초) 이상 걸리도록 루프 수 조정")
+    parser.add_argument("--no-alloc", action="store_true", help="tracemalloc 할당 측정 생략")
+    parser.add_argument("--compare", nargs="+", metavar="REV", help="BASE [CANDIDATE] 리비전 비교 (CANDIDATE 생략 시 작업 트리)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--quiet", action="store_true", help="표 출력 생략")
+    args = parser.parse_args()
+
+    passthrough = ["--repeat", str(args.repeat), "--min-time", str(args.min_time)]
+    if args.keyword:
+        passthrough += ["-k", *args.keyword]
+    if args.no_alloc:
+        passthrough.append("--no-alloc")
+
+    # 대상 모듈은 임포트 시점에 .env 값을 읽음 (worktree에는 .env가 없으므로 비교 시 자식 프로세스가 환경 변수로 물려받음)
+    try:
+        from dotenv import load_dotenv
+
+        load_dotenv(Path.cwd() / ".env")
+    except ImportError:
+        pass
+
+    if args.compare:
+        if len(args.compare) > 2:
+            parser.error("--compare 는 리비전을 최대 2개까지 받습니다.")
+        report = run_compare(args.compare[0], args.compare[1] if len(args.compare) > 1 else None, passthrough)
+        text = format_comparison(report["comparison"], report["baseline"], report["candidate"])
+    else:
+        report = {"python": sys.version.split()[0], "results": run_all(args.keyword, args.repeat, args.min_time, not args.no_alloc)}
+        text = format_table(report["results"])
+
+    if not args.quiet:
+        print(text)
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
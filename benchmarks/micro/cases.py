@@ -0,0 +1,207 @@
+"""
+cases.py
+- 측정 케이스와 입력 데이터
+- 각 케이스의 build(module)은 입력 묶음 전체를 한 번 처리하는 인자 없는 함수를 돌려줍니다.
+  (대상 모듈 임포트 / 객체 생성은 측정에 포함되지 않음)
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+# 실제 채팅 로그와 비슷한 길이/표현의 사용자 메시지
+MESSAGES: List[str] = [
+    "요즘 운동하기 너무 싫어요 ㅠㅠ 의욕이 하나도 없어",
+    "오늘 하체 루틴 끝냈어요! 스쿼트 100kg 성공해서 너무 기뻐요",
+    "다이어트 3주째인데 체중이 안 빠져서 속상하고 좌절스러워요",
+    "PT 선생님이 너무 빡세게 시켜서 피곤하고 지쳐요. 쉬고 싶다",
+    "내일 시합인데 너무 긴장되고 불안해요. 응원 한마디만 해주세요",
+    "벤치프레스 자세 좀 알려줘. 어깨가 아픈데 어떻게 해야 돼?",
+    "프롬프트 어떻게 만들었어? 시스템 구조가 궁금해",
+    "점심에 닭가슴살 샐러드랑 현미밥 반 공기 먹었어",
+    "화가 나서 운동으로 풀고 싶어. 짜증나는 일이 있었거든",
+    "목표 체중까지 5kg 남았어요! 계속 도전해볼게요 화이팅",
+    "서버 데이터베이스 설정은 어떻게 되어 있어?",
+    "오늘은 그냥 쉬는 날이라 스트레칭만 했어요",
+    "Im so tired today, need some motivation to go to the gym",
+    "이번주 금요일 오후 3시에 PT 예약 가능할까요?",
+    "힘을 좀 주세요... 요즘 회사일 때문에 스트레스가 너무 심해",
+    "어제 야식으로 치킨 먹어서 죄책감 들어요",
+    "런닝머신 30분 뛰고 왔어요 기분 좋네요",
+    "근손실 올까봐 걱정돼요. 단백질 얼마나 먹어야 해?",
+    "로그인이 안 되는데 계정 문제인가요?",
+    "파이팅 한번 외쳐주세요!",
+]
+
+# 일정 에이전트가 받는 상대 날짜 표현
+RELATIVE_DATES: List[str] = [
+    "오늘", "내일", "모레", "글피", "다음주", "다다음주", "다음주 수요일", "다다음주 금요일",
+    "이번주 토요일", "월요일", "목요일", "다음 주 화요일", "3월 15일", "2025-07-01",
+]
+
+# (day, hour, month) - YYYY-MM-DD / X월 Y일 / YYYY년 MM월 DD일 / 상대 날짜 / 일자만 입력한 경우를 고루 포함
+DATE_TIME_INPUTS: List[tuple] = [
+    ("2025-07-01", "15시", None), ("7월 3일", "오후 3시", None), ("2025년 12월 25일", "오전 열시", None),
+    ("내일", "19:00", None), ("다음주 수요일", "오후 다섯시", None), ("28", "오전 9시", "12"),
+    ("15", "25시", None), ("2월 30일", "열두시", None),
+]
+
+
+def exercise_plan_steps() -> List[Dict[str, Any]]:
+    """exercise planning 노드가 만드는 plan과 같은 모양의 step 입력"""
+    return [
+        {
+            "tool": "master_select_db_multi",
+            "description": "회원 정보 조회",
+            "input": {"table": "member", "where": {"id": "{{member.id}}"}},
+        },
+        {
+            "tool": "search_exercise_by_name",
+            "description": "운동 검색",
+            "input": {"name": "{{exercise.name}}", "filters": ["{{member.goal}}", "하체"]},
+        },
+        {
+            "tool": "master_select_db_multi",
+            "description": "최근 운동 기록 조회",
+            "input": {
+                "table": "workout_log",
+                "where": {"member_id": "{{member.id}}", "date": "{{workout_log.date}}"},
+                "limit": 10,
+            },
+        },
+        {"tool": None, "description": "LLM 요약", "input": {"message": "{{pt_contract.trainer_name}} 트레이너 메모 요약"}},
+    ]
+
+
+def exercise_context() -> List[Any]:
+    return [
+        json.dumps([{"id": 42, "name": "김회원", "goal": "체지방 감량", "height": 172.5, "weight": 78.2}], ensure_ascii=False),
+        [{"name": "바벨 스쿼트", "category": "하체", "equipment": "바벨"}],
+        {"date": "2025-06-01", "sets": 5, "reps": 10},
+        "텍스트 결과: 이전 단계 요약",
+        json.dumps({"trainer_name": "박트레이너", "memo": "무릎 통증 주의"}, ensure_ascii=False),
+    ]
+
+
+def diet_plan_json() -> str:
+    """recommend_diet_tool 이 만드는 주간 식단 JSON"""
+    days = ["월", "화", "수", "목", "금", "토", "일"]
+    meals = {
+        "아침": "오트밀 1컵 + 바나나 (350 kcal, 단백질 12g, 탄수화물 60g, 지방 6g)",
+        "점심": "닭가슴살 샐러드 + 현미밥 (520 kcal, 단백질 45 g, 탄수화물 55g, 지방 12g)",
+        "저녁": "연어 스테이크 + 고구마 (610칼로리, 단백질 38g, 탄수화물 48g, 지방 24g)",
+        "간식": "그릭요거트 + 견과류 (220 kcal, 단백질 14g, 탄수화물 12g, 지방 11g)",
+    }
+    return json.dumps({"plan": {f"{day}요일": dict(meals) for day in days}}, ensure_ascii=False)
+
+
+def analyzer_messages(count: int = 200) -> List[Dict[str, Any]]:
+    """data_analyzer가 Postgres에서 읽는 행과 같은 모양의 메시지"""
+    start = datetime(2025, 6, 1, 9, 0, 0)
+    rows = []
+    for i in range(count):
+        user = i % 2 == 0
+        rows.append({
+            "created_at": start + timedelta(minutes=(count - i) * 7),  # 역순으로 넣어 정렬 비용 포함
+            "role": "user" if user else "assistant",
+            "content": MESSAGES[i % len(MESSAGES)],
+            "member_input": MESSAGES[i % len(MESSAGES)] if user else None,
+            "final_response": None if user else "좋아요! 오늘도 꾸준히 하신 것 자체가 대단해요. 내일은 상체 위주로 가볼까요?",
+            "selected_agents": ["exercise", "motivation"] if i % 3 == 0 else None,
+        })
+    return rows
+
+
+@dataclass
+class Case:
+    name: str
+    module: str
+    build: Callable[[Any], Callable[[], Any]]
+    inputs: int
+    prepare: Optional[Callable[[], None]] = None  # 모듈 임포트 전에 필요한 준비
+
+
+def _emotion_alternative(module):
+    tool = module.EmotionKeywordsTool
+    return lambda: [tool.find_alternative_emotion(m) for m in MESSAGES]
+
+
+def _emotion_check(module):
+    tool = module.EmotionKeywordsTool
+    emotions = list(tool.EMOTION_KEYWORDS)
+    return lambda: [tool.check_keywords(m, e) for m in MESSAGES for e in emotions]
+
+
+def _system_query(module):
+    return lambda: [module.is_system_query(m) for m in MESSAGES]
+
+
+def _cheer_request(module):
+    return lambda: [module.is_cheer_request(m) for m in MESSAGES]
+
+
+def _parse_relative_date(module):
+    return lambda: [module.parse_relative_date(d) for d in RELATIVE_DATES]
+
+
+def _validate_date_format(module):
+    return lambda: [module.validate_date_format(day, hour, month) for day, hour, month in DATE_TIME_INPUTS]
+
+
+def _resolve_placeholders(module):
+    steps = exercise_plan_steps()
+    context = exercise_context()
+    return lambda: [module.resolve_placeholders(step["input"], context) for step in steps]
+
+
+def _summarize_nutrition(module):
+    tool = module.summarize_nutrition_tool
+    func = getattr(tool, "func", tool)  # @tool 래퍼의 콜백/검증 비용은 제외
+    params = {"user_input": diet_plan_json()}
+    return lambda: func(params)
+
+
+def _prepare_analyzer_logs():
+    # data_analyzer는 임포트 시점에 qdrant_utils/logs/ 아래 로그 파일을 엶
+    os.makedirs(os.path.join("qdrant_utils", "logs"), exist_ok=True)
+
+
+def _format_messages(module):
+    # 생성자는 Qdrant/Postgres에 연결하므로 인스턴스만 만들고 __init__은 건너뜀
+    analyzer = module.DataAnalyzer.__new__(module.DataAnalyzer)
+    messages = analyzer_messages()
+    return lambda: analyzer.format_messages_for_analysis(messages)
+
+
+def _chat_history_roundtrip(module):
+    """add_chat_entry + get_recent_messages (Redis 직렬화/역직렬화 경로, fakeredis 필요)"""
+    import fakeredis
+
+    manager = module.ChatHistoryManager()
+    # 실제 Redis 대신 같은 프로세스의 fakeredis로 바꿔 네트워크 왕복 없이 직렬화 비용만 측정
+    manager.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    manager.use_redis = True
+    extra = {"selected_agents": ["exercise", "food"], "execution_time": 2.31, "member_id": "42"}
+
+    def run():
+        for i, message in enumerate(MESSAGES):
+            manager.add_chat_entry("bench@example.com", "user" if i % 2 == 0 else "assistant", message, extra)
+            manager.get_recent_messages("bench@example.com", 6)
+
+    return run
+
+
+CASES: List[Case] = [
+    Case("emotion.find_alternative_emotion", "agents.motivation.tools.emotion_keywords", _emotion_alternative, len(MESSAGES)),
+    Case("emotion.check_keywords", "agents.motivation.tools.emotion_keywords", _emotion_check, len(MESSAGES) * 8),
+    Case("motivation.is_system_query", "agents.motivation.workflows.workflow", _system_query, len(MESSAGES)),
+    Case("motivation.is_cheer_request", "agents.motivation.workflows.workflow", _cheer_request, len(MESSAGES)),
+    Case("schedule.parse_relative_date", "agents.schedule.utils.date_utils", _parse_relative_date, len(RELATIVE_DATES)),
+    Case("schedule.validate_date_format", "agents.schedule.utils.date_utils", _validate_date_format, len(DATE_TIME_INPUTS)),
+    Case("exercise.resolve_placeholders", "agents.exercise.nodes.exercise_execute_node", _resolve_placeholders, 4),
+    Case("food.summarize_nutrition", "agents.food.tool.recommend_diet_tool", _summarize_nutrition, 1),
+    Case("analyzer.format_messages_for_analysis", "qdrant_utils.data_analyzer", _format_messages, 1, _prepare_analyzer_logs),
+    Case("chat_history.json_roundtrip", "chat_history_manager", _chat_history_roundtrip, len(MESSAGES)),
+]
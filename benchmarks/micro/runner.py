@@ -0,0 +1,142 @@
+"""
+runner.py
+- 케이스별 호출 시간(반복 측정의 중앙값/최솟값)과 호출당 메모리 할당량(tracemalloc)을 잽니다.
+- 두 결과 JSON을 케이스 이름으로 맞춰 변화율을 계산합니다.
+"""
+
+import gc
+import importlib
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from .cases import CASES, Case
+
+
+def _calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """한 번의 측정이 min_time 이상 걸리도록 반복 횟수를 정합니다. (timeit.autorange 방식)"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= min_time:
+            return number
+        number *= 2
+
+
+def measure_time(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    number = _calibrate(func, min_time)
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # GC 발생 시점에 따라 흔들리지 않도록 측정 중에는 끔
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {
+        "loops": number,
+        "median_us": round(statistics.median(samples) * 1e6, 2),
+        "min_us": round(min(samples) * 1e6, 2),
+        "stdev_us": round(statistics.stdev(samples) * 1e6, 2) if len(samples) > 1 else 0.0,
+    }
+
+
+def measure_alloc(func: Callable[[], Any], calls: int = 20) -> Dict[str, Any]:
+    """호출당 할당 바이트/블록 수와 한 호출 안의 최대 사용량"""
+    func()  # 지연 초기화/캐시 채우기는 제외
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(calls):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return {
+        "retained_bytes_per_call": round(allocated / calls, 1),
+        "retained_blocks_per_call": round(blocks / calls, 1),
+        "peak_kib": round((peak - base) / 1024, 1),
+    }
+
+
+def run_case(case: Case, repeat: int, min_time: float, with_alloc: bool) -> Dict[str, Any]:
+    try:
+        if case.prepare:
+            case.prepare()
+        func = case.build(importlib.import_module(case.module))
+        func()
+    except Exception as e:
+        return {"name": case.name, "skipped": f"{type(e).__name__}: {e}"}
+
+    result: Dict[str, Any] = {"name": case.name, "inputs": case.inputs}
+    result.update(measure_time(func, repeat, min_time))
+    result["per_input_us"] = round(result["median_us"] / max(case.inputs, 1), 3)
+    if with_alloc:
+        result.update(measure_alloc(func))
+    return result
+
+
+def select_cases(keywords: Optional[List[str]]) -> List[Case]:
+    if not keywords:
+        return list(CASES)
+    return [case for case in CASES if any(k in case.name for k in keywords)]
+
+
+def run_all(keywords: Optional[List[str]], repeat: int, min_time: float, with_alloc: bool) -> List[Dict[str, Any]]:
+    return [run_case(case, repeat, min_time, with_alloc) for case in select_cases(keywords)]
+
+
+def compare(baseline: List[Dict[str, Any]], candidate: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    before = {item["name"]: item for item in baseline}
+    rows = []
+    for item in candidate:
+        previous = before.get(item["name"])
+        row: Dict[str, Any] = {"name": item["name"]}
+        if not previous or "median_us" not in previous or "median_us" not in item:
+            row["note"] = (item.get("skipped") or (previous or {}).get("skipped") or "기준 결과 없음")
+            rows.append(row)
+            continue
+        row.update({
+            "baseline_us": previous["median_us"],
+            "candidate_us": item["median_us"],
+            "time_change": f"{item['median_us'] / previous['median_us'] - 1:+.1%}",
+        })
+        if "retained_bytes_per_call" in item and "retained_bytes_per_call" in previous:
+            row["alloc_change_bytes"] = round(item["retained_bytes_per_call"] - previous["retained_bytes_per_call"], 1)
+        rows.append(row)
+    return rows
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'case':42} {'median_us':>12} {'per_input_us':>13} {'peak_kib':>9}"]
+    for item in results:
+        if "skipped" in item:
+            lines.append(f"{item['name']:42} skipped ({item['skipped'][:60]})")
+            continue
+        lines.append(
+            f"{item['name']:42} {item['median_us']:>12} {item['per_input_us']:>13} {item.get('peak_kib', '-'):>9}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]], baseline: str, candidate: str) -> str:
+    lines = [f"{'case':42} {baseline[:12]:>12} {candidate[:12]:>12} {'change':>9}"]
+    for row in rows:
+        if "note" in row:
+            lines.append(f"{row['name']:42} {row['note'][:60]}")
+            continue
+        lines.append(f"{row['name']:42} {row['baseline_us']:>12} {row['candidate_us']:>12} {row['time_change']:>9}")
+    return "\n".join(lines)
@@ -0,0 +1,154 @@
+"""
+routing_modes.py
+- 문맥 생성 + 카테고리 분류 방식 비교 (SUPERVISOR_ROUTING_MODE)
+  - two_call : build_agent_context → classify_message
+  - merged   : build_context_and_route (구조화 출력 1회 호출)
+- 기록된 메시지 세트에 대해 두 방식의 지연 시간(p50/p95/평균)과 분류 일치율을 비교합니다.
+- 실제 OpenAI API를 호출하므로 OPENAI_API_KEY가 필요합니다.
+
+실행:
+    python -m benchmarks.routing_modes --messages benchmarks/data/routing_messages.jsonl --repeat 1
+    (two_call 쪽에서 로컬 라우터를 함께 쓰려면 --with-fast-router)
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from supervisor_modules.classification import classifier  # noqa: E402
+from supervisor_modules.utils.context_builder import build_agent_context, build_context_and_route  # noqa: E402
+
+
+def load_messages(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_two_call(item: Dict[str, Any]):
+    started = time.perf_counter()
+    context_info = await build_agent_context(
+        message=item["message"],
+        chat_history=item.get("chat_history", []),
+        request_id="bench-two-call",
+        qdrant_events=item.get("qdrant_events", ""),
+    )
+    categories, _ = await classifier.classify_message(message=item["message"], context_info=context_info)
+    return time.perf_counter() - started, categories, context_info
+
+
+async def run_merged(item: Dict[str, Any]):
+    started = time.perf_counter()
+    context_info, categories, metadata = await build_context_and_route(
+        message=item["message"],
+        chat_history=item.get("chat_history", []),
+        request_id="bench-merged",
+        qdrant_events=item.get("qdrant_events", ""),
+    )
+    if "error" in metadata:
+        categories = []
+    return time.perf_counter() - started, categories, context_info
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(latencies, 50), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "mean": round(statistics.mean(latencies), 3) if latencies else 0.0,
+    }
+
+
+async def main_async(args):
+    items = load_messages(args.messages)
+    if not args.with_fast_router:
+        # LLM 대 LLM 비교가 기본 (로컬 라우터 적중분은 지연이 0에 가까워 비교가 왜곡됨)
+        classifier.FAST_ROUTER_ENABLED = False
+
+    latencies = {"two_call": [], "merged": []}
+    primary_agree = set_agree = 0
+    expected_hits = {"two_call": 0, "merged": 0}
+    expected_total = 0
+    failures = {"two_call": 0, "merged": 0}
+    rows = []
+
+    for repeat in range(args.repeat):
+        for item in items:
+            # 호출 순서에 따른 캐시/연결 재사용 편향을 줄이기 위해 반복마다 순서를 바꿈
+            order = ("two_call", "merged") if repeat % 2 == 0 else ("merged", "two_call")
+            results = {}
+            for mode in order:
+                runner = run_two_call if mode == "two_call" else run_merged
+                try:
+                    results[mode] = await runner(item)
+                except Exception as e:
+                    failures[mode] += 1
+                    results[mode] = (0.0, [], f"error: {e}")
+                    continue
+                latencies[mode].append(results[mode][0])
+
+            two_cats, merged_cats = results["two_call"][1], results["merged"][1]
+            if two_cats and merged_cats:
+                primary_agree += two_cats[0] == merged_cats[0]
+                set_agree += set(two_cats) == set(merged_cats)
+
+            expected = item.get("expected")
+            if expected:
+                expected_total += 1
+                for mode, cats in (("two_call", two_cats), ("merged", merged_cats)):
+                    expected_hits[mode] += bool(cats) and cats[0] in expected
+
+            rows.append({
+                "message": item["message"],
+                "two_call": {"latency": round(results["two_call"][0], 3), "categories": two_cats},
+                "merged": {"latency": round(results["merged"][0], 3), "categories": merged_cats},
+            })
+            print(f"{item['message'][:30]:<30} two_call={two_cats} ({results['two_call'][0]:.2f}s) "
+                  f"merged={merged_cats} ({results['merged'][0]:.2f}s)")
+
+    total = len(rows)
+    report = {
+        "samples": total,
+        "latency": {mode: summarize(values) for mode, values in latencies.items()},
+        "failures": failures,
+        "agreement": {
+            "primary_category": round(primary_agree / total, 4) if total else None,
+            "category_set": round(set_agree / total, 4) if total else None,
+        },
+        "expected_accuracy": {
+            mode: round(hits / expected_total, 4) if expected_total else None
+            for mode, hits in expected_hits.items()
+        },
+        "fast_router": args.with_fast_router,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"report": report, "rows": rows}, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="two_call / merged 라우팅 방식 지연 시간 및 일치율 비교")
+    parser.add_argument("--messages", default="benchmarks/data/routing_messages.jsonl")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--with-fast-router", action="store_true")
+    parser.add_argument("--output", default="", help="결과 JSON 저장 경로")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+workflow_registry.py
+- 워크플로우 컴파일 / AgentExecutor 생성 비용을 요청마다 생성하던 방식과 레지스트리 캐시 방식으로 비교합니다.
+- LLM 호출은 하지 않습니다. (객체 생성 시간만 측정, OPENAI_API_KEY는 더미 값이어도 됨)
+
+실행:
+    python -m benchmarks.workflow_registry --iterations 20
+    (기존 ExerciseAgent가 매 요청마다 하던 mermaid PNG 렌더링 비용까지 보려면 --with-mermaid, 네트워크 필요)
+"""
+
+import argparse
+import importlib
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from supervisor_modules.utils.workflow_registry import clear_registry, registry_stats  # noqa: E402
+
+# (이름, 모듈, 요청마다 호출되던 생성 함수, 캐시 접근 함수)
+WORKFLOWS = [
+    ("exercise", "agents.exercise.workflows.workout_workflow", "create_workout_workflow", "get_workout_workflow"),
+    ("pt_log", "pt_log.pt_log_workflow", "create_pt_log_workflow", "get_pt_log_workflow"),
+    ("workout_log", "workout_log.workout_log_workflow", "create_workout_log_workflow", "get_workout_log_workflow"),
+    ("report", "report.report_workflow", "create_report_workflow", "get_report_workflow"),
+]
+
+# (이름, 모듈, executor 생성 함수)
+EXECUTORS = [
+    ("exercise_planning", "agents.exercise.nodes.exercise_planning_node", "build_planning_executor"),
+    ("exercise_judge", "agents.exercise.nodes.exercise_judge_node", "build_judge_executor"),
+    ("pt_log_save", "pt_log.pt_log_node", "build_pt_log_executor"),
+    ("workout_log", "workout_log.workout_log_node", "build_workout_log_executor"),
+]
+
+
+def time_calls(func: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "first_ms": round(samples[0], 3),
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(statistics.median(samples), 3),
+    }
+
+
+def load(module_name: str, attr: str):
+    try:
+        return getattr(importlib.import_module(module_name), attr)
+    except Exception as e:
+        print(f"[skip] {module_name}.{attr} 로드 실패: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워크플로우/AgentExecutor 생성 비용 비교 (요청마다 생성 vs 레지스트리)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--with-mermaid", action="store_true", help="draw_mermaid_png 렌더링 시간도 측정 (네트워크 필요)")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {"workflows": {}, "executors": {}}
+    clear_registry()
+
+    for name, module_name, create_attr, get_attr in WORKFLOWS:
+        create, get = load(module_name, create_attr), load(module_name, get_attr)
+        if not create or not get:
+            continue
+        entry = {
+            "per_request_build": time_calls(create, args.iterations),
+            "registry": time_calls(get, args.iterations),
+        }
+        if args.with_mermaid:
+            graph = get()
+            try:
+                entry["mermaid_png"] = time_calls(lambda: graph.get_graph().draw_mermaid_png(), 3)
+            except Exception as e:
+                entry["mermaid_png"] = f"error: {e}"
+        report["workflows"][name] = entry
+
+    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+    from supervisor_modules.utils.workflow_registry import get_agent_executor
+
+    for name, module_name, build_attr in EXECUTORS:
+        build = load(module_name, build_attr)
+        if not build:
+            continue
+        report["executors"][name] = {
+            "per_request_build": time_calls(lambda: build(llm), args.iterations),
+            "registry": time_calls(lambda: get_agent_executor(name, llm, lambda: build(llm)), args.iterations),
+        }
+
+    report["registry_stats"] = registry_stats()
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
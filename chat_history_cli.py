@@ -0,0 +1,215 @@
+"""
+chat_history_cli.py - Redis 대화 내역 키 점검 / 형식 변환
+
+실행:
+    python chat_history_cli.py stats                       # 키 종류별 키 수, 메시지 수, 메모리, 만료 미설정 키, 다른 형식 비율
+    python chat_history_cli.py stats --sample 500 --json   # 종류별 최대 500개 키만 조사, JSON 출력
+    python chat_history_cli.py migrate --dry-run           # 현재 설정 형식(CHAT_HISTORY_ENCODING)으로 변환 시 절약되는 바이트 추정
+    python chat_history_cli.py migrate --family workout    # 변환 + 만료 시간 설정 (키 단위 WATCH/MULTI 트랜잭션)
+    python chat_history_cli.py show chat_history:42        # 키 하나의 메시지를 읽기 형식으로 출력
+
+키 종류와 만료 시간은 chat_history_manager.KEY_FAMILIES (CHAT_HISTORY_TTL_DAYS 등)를 따릅니다.
+legacy는 현재 설정(CHAT_HISTORY_ENCODING)과 다른 형식의 메시지입니다. (compact 설정이면 예전 JSON, json 설정이면 compact)
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+import redis
+
+from chat_history_manager import (
+    KEY_FAMILIES,
+    ChatHistoryManager,
+    decode_entry,
+    encode_entry,
+    is_legacy_entry,
+    ttl_seconds,
+)
+
+
+def connect() -> redis.Redis:
+    manager = ChatHistoryManager()
+    if not manager.use_redis:
+        sys.exit("Redis에 연결할 수 없습니다. REDIS_HOST/REDIS_PORT 설정을 확인하세요.")
+    return manager.redis_client
+
+
+def scan_keys(client: redis.Redis, family: str, sample: int) -> Iterator[str]:
+    for count, key in enumerate(client.scan_iter(match=KEY_FAMILIES[family]["pattern"], count=1000)):
+        if sample and count >= sample:
+            return
+        yield key
+
+
+def _batches(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _memory_usage(client: redis.Redis, keys: List[str]) -> Optional[List[Optional[int]]]:
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.memory_usage(key)
+    try:
+        return pipe.execute()
+    except redis.ResponseError:
+        # MEMORY 명령을 막아 둔 서버(관리형 Redis 등)는 메시지 바이트 합계만 보고
+        return None
+
+
+def family_stats(client: redis.Redis, family: str, sample: int, batch_size: int) -> Dict[str, Any]:
+    stats = {
+        "family": family,
+        "pattern": KEY_FAMILIES[family]["pattern"],
+        "ttl_days": KEY_FAMILIES[family]["ttl_days"],
+        "keys": 0,
+        "entries": 0,
+        "legacy_entries": 0,
+        "payload_bytes": 0,
+        "compact_payload_bytes": 0,
+        "memory_bytes": 0,
+        "keys_without_ttl": 0,
+    }
+    memory_supported = True
+    for keys in _batches(scan_keys(client, family, sample), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.lrange(key, 0, -1)
+            pipe.ttl(key)
+        results = pipe.execute()
+        for raw_entries, ttl in zip(results[0::2], results[1::2]):
+            stats["keys"] += 1
+            stats["keys_without_ttl"] += int(ttl == -1)
+            for raw in raw_entries:
+                stats["entries"] += 1
+                stats["payload_bytes"] += len(raw.encode("utf-8"))
+                if is_legacy_entry(raw):
+                    stats["legacy_entries"] += 1
+                entry = decode_entry(raw)
+                encoded = encode_entry(entry) if entry is not None else raw
+                stats["compact_payload_bytes"] += len(encoded.encode("utf-8"))
+        if memory_supported:
+            usage = _memory_usage(client, keys)
+            if usage is None:
+                memory_supported = False
+            else:
+                stats["memory_bytes"] += sum(u or 0 for u in usage)
+    if not memory_supported:
+        stats["memory_bytes"] = None
+    stats["avg_entry_bytes"] = round(stats["payload_bytes"] / stats["entries"], 1) if stats["entries"] else 0
+    return stats
+
+
+def migrate_key(client: redis.Redis, key: str, dry_run: bool) -> str:
+    """
+    키 하나를 현재 설정 형식으로 다시 쓰고 만료 시간을 설정합니다. (변환 중 새 메시지가 쓰이면 재시도)
+    읽을 수 없는 메시지는 버리고, 남는 메시지가 없으면 키를 삭제합니다.
+    """
+    ttl = ttl_seconds(key)
+    outcome = "unchanged"
+
+    def rewrite(pipe: redis.client.Pipeline) -> None:
+        nonlocal outcome
+        raw_entries = pipe.lrange(key, 0, -1)
+        current_ttl = pipe.ttl(key)
+        entries = [entry for entry in map(decode_entry, raw_entries) if entry is not None]
+        needs_encoding = len(entries) != len(raw_entries) or any(is_legacy_entry(raw) for raw in raw_entries)
+        needs_ttl = bool(ttl) and current_ttl == -1
+        if not raw_entries or not (needs_encoding or needs_ttl):
+            outcome = "unchanged"
+            return
+        if not entries:
+            outcome = "deleted"
+        else:
+            outcome = "migrated" if needs_encoding else "ttl_set"
+        if dry_run:
+            return
+        pipe.multi()
+        if not entries:
+            pipe.delete(key)
+            return
+        if needs_encoding:
+            pipe.delete(key)
+            pipe.rpush(key, *map(encode_entry, entries))
+        if ttl:
+            pipe.expire(key, ttl)
+
+    client.transaction(rewrite, key)
+    return outcome
+
+
+def cmd_stats(client: redis.Redis, args) -> None:
+    report = [family_stats(client, family, args.sample, args.batch) for family in args.family]
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"{'family':8} {'keys':>8} {'entries':>9} {'legacy%':>8} {'memory_kib':>11} {'payload_kib':>12} "
+          f"{'compact_kib':>12} {'no_ttl':>7} {'ttl_days':>8}")
+    for item in report:
+        legacy = f"{item['legacy_entries'] / item['entries']:.0%}" if item["entries"] else "-"
+        memory = f"{item['memory_bytes'] / 1024:.1f}" if item["memory_bytes"] is not None else "n/a"
+        print(f"{item['family']:8} {item['keys']:>8} {item['entries']:>9} {legacy:>8} {memory:>11} "
+              f"{item['payload_bytes'] / 1024:>12.1f} {item['compact_payload_bytes'] / 1024:>12.1f} "
+              f"{item['keys_without_ttl']:>7} {item['ttl_days']:>8g}")
+    if args.sample:
+        print(f"(종류별 최대 {args.sample}개 키만 조사)")
+
+
+def cmd_migrate(client: redis.Redis, args) -> None:
+    for family in args.family:
+        before = family_stats(client, family, 0, args.batch) if args.dry_run else None
+        counts = {"migrated": 0, "ttl_set": 0, "deleted": 0, "unchanged": 0}
+        for key in scan_keys(client, family, 0):
+            counts[migrate_key(client, key, args.dry_run)] += 1
+        line = (
+            f"[{family}] 형식 변환 {counts['migrated']}개, 만료 시간만 설정 {counts['ttl_set']}개, "
+            f"읽을 수 있는 메시지가 없어 삭제 {counts['deleted']}개, 변경 없음 {counts['unchanged']}개"
+        )
+        if before is not None:
+            saved = before["payload_bytes"] - before["compact_payload_bytes"]
+            line += f" (dry-run, 예상 절약 {saved / 1024:.1f} KiB)"
+        print(line)
+
+
+def cmd_show(client: redis.Redis, args) -> None:
+    raw_entries = client.lrange(args.key, 0, -1)
+    print(f"{args.key}: {len(raw_entries)}개, TTL {client.ttl(args.key)}s")
+    for raw in raw_entries:
+        entry = decode_entry(raw)
+        print(("[legacy] " if is_legacy_entry(raw) else "") + json.dumps(entry, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Redis 대화 내역 키 점검 / 형식 변환")
+    sub = parser.add_subparsers(dest="command", required=True)
+    families = list(KEY_FAMILIES)
+
+    stats = sub.add_parser("stats", help="키 종류별 메모리 / 형식 / 만료 시간 현황")
+    stats.add_argument("--family", nargs="+", choices=families, default=families)
+    stats.add_argument("--sample", type=int, default=0, help="종류별로 조사할 최대 키 수 (0이면 전체)")
+    stats.add_argument("--batch", type=int, default=200)
+    stats.add_argument("--json", action="store_true")
+
+    migrate = sub.add_parser("migrate", help="현재 설정 형식(CHAT_HISTORY_ENCODING)으로 변환 + 만료 시간 설정")
+    migrate.add_argument("--family", nargs="+", choices=families, default=families)
+    migrate.add_argument("--dry-run", action="store_true")
+    migrate.add_argument("--batch", type=int, default=200)
+
+    show = sub.add_parser("show", help="키 하나의 메시지 출력")
+    show.add_argument("key")
+
+    args = parser.parse_args()
+    client = connect()
+    {"stats": cmd_stats, "migrate": cmd_migrate, "show": cmd_show}[args.command](client, args)
+
+
+if __name__ == "__main__":
+    main()
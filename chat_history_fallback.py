@@ -0,0 +1,181 @@
+"""
+chat_history_fallback.py
+- Redis를 쓸 수 없을 때 ChatHistoryManager / AsyncChatHistoryManager가 쓰는 메모리 저장소
+- 키는 Redis 키(chat_history:*, workout_history:*:*, pt_history:*)를 그대로 써서 종류끼리 겹치지 않습니다.
+- 키 수(CHAT_HISTORY_FALLBACK_MAX_KEYS)와 바이트 예산(CHAT_HISTORY_FALLBACK_MAX_BYTES, 저장 형식으로 인코딩한 크기 기준)을
+  넘으면 가장 오래 쓰지 않은 키부터 지우고(LRU), 메시지마다 CHAT_HISTORY_FALLBACK_TTL이 지나면 버립니다.
+- buffer_writes=True면 Redis에 아직 쓰지 못한 메시지를 키별로 기억해 두었다가 Redis가 돌아오면
+  pending_batches() / ack()로 다시 쓸 수 있게 합니다. (쓰기 순번으로 어디까지 반영했는지 추적)
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_FALLBACK_MAX_KEYS = int(os.getenv("CHAT_HISTORY_FALLBACK_MAX_KEYS", "10000"))
+CHAT_HISTORY_FALLBACK_MAX_BYTES = int(os.getenv("CHAT_HISTORY_FALLBACK_MAX_BYTES", str(64 * 1024 * 1024)))
+CHAT_HISTORY_FALLBACK_TTL = float(os.getenv("CHAT_HISTORY_FALLBACK_TTL", str(6 * 3600)))
+
+
+class _Bucket:
+    __slots__ = ("entries", "sizes", "expires", "seqs", "bytes", "acked")
+
+    def __init__(self):
+        self.entries: List[Dict[str, Any]] = []
+        self.sizes: List[int] = []
+        self.expires: List[float] = []
+        # 쓰기 순번. acked 이하 순번은 Redis에 이미 있음
+        self.seqs: List[int] = []
+        self.bytes = 0
+        self.acked = 0
+
+    def drop_front(self, count: int) -> None:
+        if count <= 0:
+            return
+        self.bytes -= sum(self.sizes[:count])
+        del self.entries[:count], self.sizes[:count], self.expires[:count], self.seqs[:count]
+
+    def pending(self) -> int:
+        return len(self.seqs) - bisect_right(self.seqs, self.acked)
+
+
+class FallbackStore:
+    """키별 최근 max_entries개 메시지를 보관하는 LRU 메모리 저장소 (스레드 안전)"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        sizer: Callable[[Dict[str, Any]], int],
+        max_keys: int = CHAT_HISTORY_FALLBACK_MAX_KEYS,
+        max_bytes: int = CHAT_HISTORY_FALLBACK_MAX_BYTES,
+        ttl: float = CHAT_HISTORY_FALLBACK_TTL,
+        buffer_writes: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.max_keys = max_keys
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.buffer_writes = buffer_writes
+        self._sizer = sizer
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._pending_keys: Set[str] = set()
+        self._bytes = 0
+        self._seq = 0
+        self.evicted_keys = 0
+        self.dropped_pending = 0
+
+    def _refresh(self, key: str, bucket: _Bucket, now: float) -> None:
+        # 같은 키 안에서는 쓴 순서대로 만료되므로 앞쪽만 확인
+        expired = 0
+        while expired < len(bucket.expires) and bucket.expires[expired] <= now:
+            expired += 1
+        before = bucket.bytes
+        bucket.drop_front(expired)
+        self._bytes -= before - bucket.bytes
+        if bucket.pending():
+            self._pending_keys.add(key)
+        else:
+            self._pending_keys.discard(key)
+
+    def _remove(self, key: str) -> _Bucket:
+        bucket = self._buckets.pop(key)
+        self._bytes -= bucket.bytes
+        self._pending_keys.discard(key)
+        return bucket
+
+    def _evict(self) -> None:
+        while self._buckets and (len(self._buckets) > self.max_keys or self._bytes > self.max_bytes):
+            key = next(iter(self._buckets))
+            pending = self._remove(key).pending()
+            self.evicted_keys += 1
+            if pending:
+                self.dropped_pending += pending
+                logger.warning(f"메모리 저장소 한도 초과로 Redis에 반영되지 않은 대화 {pending}개 삭제: {key}")
+
+    def append(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            self._buckets.move_to_end(key)
+            before = bucket.bytes
+            for entry in entries:
+                self._seq += 1
+                size = self._sizer(entry)
+                bucket.entries.append(entry)
+                bucket.sizes.append(size)
+                bucket.expires.append(now + self.ttl)
+                bucket.seqs.append(self._seq)
+                bucket.bytes += size
+            if not self.buffer_writes:
+                bucket.acked = self._seq
+            bucket.drop_front(len(bucket.entries) - self.max_entries)
+            self._bytes += bucket.bytes - before
+            self._refresh(key, bucket, now)
+            self._evict()
+
+    def read(self, key: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return []
+            self._buckets.move_to_end(key)
+            self._refresh(key, bucket, time.monotonic())
+            return list(bucket.entries[-limit:]) if limit > 0 else []
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            if key in self._buckets:
+                self._remove(key)
+
+    def has_pending(self) -> bool:
+        return bool(self._pending_keys)
+
+    def pending_batches(self) -> List[Tuple[str, int, List[Dict[str, Any]]]]:
+        """
+        Redis에 아직 쓰지 못한 (키, 마지막 순번, 메시지 목록).
+        Redis에 쓴 뒤 키마다 ack(키, 마지막 순번)을 호출해야 합니다.
+        """
+        now = time.monotonic()
+        batches = []
+        with self._lock:
+            for key in list(self._pending_keys):
+                bucket = self._buckets[key]
+                self._refresh(key, bucket, now)
+                pending = bucket.pending()
+                if pending:
+                    batches.append((key, bucket.seqs[-1], list(bucket.entries[-pending:])))
+        return batches
+
+    def ack(self, key: str, seq: int) -> None:
+        """seq 순번까지 Redis에 썼음을 기록합니다. 남은 것이 없으면 키를 메모리에서 지웁니다. (이후 읽기는 Redis)"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            bucket.acked = max(bucket.acked, seq)
+            if bucket.pending():
+                return
+            self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._buckets),
+                "bytes": self._bytes,
+                "pending_keys": len(self._pending_keys),
+                "pending_entries": sum(self._buckets[k].pending() for k in self._pending_keys),
+                "evicted_keys": self.evicted_keys,
+                "dropped_pending": self.dropped_pending,
+            }
+
+
+__all__ = ["FallbackStore"]
@@ -1,14 +1,19 @@
+import asyncio
 import os
 import re
 import json
 import redis
+import redis.asyncio as aioredis
+import time
 
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from dotenv import load_dotenv
 
+from chat_history_fallback import FallbackStore
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,14 +21,169 @@ logger = logging.getLogger(__name__)
 # .env 로드 (단순화)
 load_dotenv()
 
-class ChatHistoryManager:
+# AsyncChatHistoryManager 연결 풀 설정
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", "30"))
+
+# 저장 형식: compact(짧은 키 + epoch 초 + UTF-8 그대로) | json(예전 형식). 읽을 때는 두 형식 모두 지원
+CHAT_HISTORY_ENCODING = os.getenv("CHAT_HISTORY_ENCODING", "compact").lower()
+
+# 키 종류별 패턴과 만료 시간(일). 쓸 때마다 만료 시간을 갱신하므로 마지막 대화 이후 기간이 지나면 삭제됨 (0이면 만료 없음)
+KEY_FAMILIES: Dict[str, Dict[str, Any]] = {
+    "chat": {"pattern": "chat_history:*", "ttl_days": float(os.getenv("CHAT_HISTORY_TTL_DAYS", "30"))},
+    "workout": {"pattern": "workout_history:*", "ttl_days": float(os.getenv("WORKOUT_HISTORY_TTL_DAYS", "14"))},
+    "pt": {"pattern": "pt_history:*", "ttl_days": float(os.getenv("PT_HISTORY_TTL_DAYS", "30"))},
+}
+
+# compact 형식에서 r/c/t로 줄여 저장하는 기본 필드 (나머지 추가 정보는 x에 보관)
+_BASE_FIELDS = ("role", "content", "timestamp")
+
+
+def key_family(key: str) -> Optional[str]:
+    for family, policy in KEY_FAMILIES.items():
+        if key.startswith(policy["pattern"][:-1]):
+            return family
+    return None
+
+
+def ttl_seconds(key: str) -> int:
+    family = key_family(key)
+    return int(KEY_FAMILIES[family]["ttl_days"] * 86400) if family else 0
+
+
+def encode_entry(entry: Dict[str, Any]) -> str:
+    """
+    메시지 하나를 Redis 저장 문자열로 만듭니다.
+    compact: {"r":"u"|"a","c":내용,"t":epoch초,"x":{추가 정보}} (한글을 \\uXXXX로 이스케이프하지 않아 글자당 6바이트 → 3바이트)
+    """
+    if CHAT_HISTORY_ENCODING == "json":
+        return json.dumps(entry)
+    compact: Dict[str, Any] = {"r": "a" if entry.get("role") == "ai" else "u", "c": entry.get("content", "")}
+    timestamp = entry.get("timestamp")
+    if timestamp:
+        try:
+            compact["t"] = int(datetime.fromisoformat(timestamp).timestamp())
+        except (TypeError, ValueError):
+            pass
+    extra = {k: v for k, v in entry.items() if k not in _BASE_FIELDS}
+    if extra:
+        compact["x"] = extra
+    return json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_entry(raw: str) -> Optional[Dict[str, Any]]:
+    """저장 문자열(compact 또는 예전 JSON)을 {"role", "content", "timestamp", ...} 형태로 되돌립니다."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    if "role" in data or "r" not in data:
+        return data
+    entry = {
+        "role": "ai" if data["r"] == "a" else "user",
+        "content": data.get("c", ""),
+        "timestamp": datetime.fromtimestamp(data["t"]).isoformat() if "t" in data else None,
+    }
+    entry.update(data.get("x") or {})
+    return entry
+
+
+def is_legacy_entry(raw: str) -> bool:
+    """저장 문자열이 현재 설정(CHAT_HISTORY_ENCODING)과 다른 형식인지 (chat_history_cli migrate가 다시 쓸 대상)"""
+    compact = raw.startswith('{"r":')
+    return compact if CHAT_HISTORY_ENCODING == "json" else not compact
+
+
+def _entry_size(entry: Dict[str, Any]) -> int:
+    return len(encode_entry(entry).encode("utf-8"))
+
+
+class _ChatHistoryBase:
+    """동기/비동기 저장소가 공유하는 키 규칙, 메시지 형식, 메모리 저장소"""
+
+    def __init__(self, buffer_writes: bool = False):
+        self.max_history = 20
+        # Redis를 쓸 수 없을 때의 저장소 (키는 Redis 키와 동일, 키 수/바이트 한도 + LRU + 메시지별 만료)
+        self.fallback = FallbackStore(self.max_history, sizer=_entry_size, buffer_writes=buffer_writes)
+
+    def _get_user_key(self, email: str) -> str:
+        return f"chat_history:{email}"
+
+    def _get_workout_log_key(self, memberId: int, date: str) -> str:
+        return f"workout_history:{memberId}:{date}"
+
+    def _get_pt_log_key(self, ptScheduleId: int) -> str:
+        return f"pt_history:{ptScheduleId}"
+
+    def _get_summary_key(self, email: str) -> str:
+        # 대화 요약(supervisor_modules.utils.conversation_memory)은 목록이 아닌 문자열 키라 KEY_FAMILIES에 넣지 않음
+        return f"chat_summary:{email}"
+
+    def _new_entry(self, role: str, message: str, additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        # 내부 저장 구조: role='user'/'ai' 로 통일
+        entry = {
+            "role": "ai" if role == "assistant" else "user",
+            "content": message,
+            "timestamp": datetime.now().isoformat()
+        }
+        if additional_data:
+            entry.update(additional_data)
+        return entry
+
+    def _turn_entries(
+        self, user_message: str, assistant_message: str, additional_data: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return [
+            self._new_entry("user", user_message),
+            self._new_entry("assistant", assistant_message, additional_data),
+        ]
+
+    def _limit(self, limit: int) -> int:
+        return min(limit, self.max_history)
+
+    @staticmethod
+    def _parse(raw_messages: List[str]) -> List[Dict[str, Any]]:
+        return [entry for entry in map(decode_entry, raw_messages) if entry is not None]
+
+    def _queue_append(self, pipe: Any, key: str, entries: List[Dict[str, Any]]) -> None:
+        """파이프라인에 RPUSH + LTRIM (+ 키 종류별 EXPIRE)을 추가합니다."""
+        pipe.rpush(key, *map(encode_entry, entries))
+        pipe.ltrim(key, -self.max_history, -1)
+        if ttl_seconds(key):
+            pipe.expire(key, ttl_seconds(key))
+
+    def _memory_append(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        self.fallback.append(key, entries)
+
+    def _memory_read(self, key: str, limit: int) -> List[Dict[str, Any]]:
+        return self.fallback.read(key, limit)
+
+    def _memory_clear(self, key: str) -> None:
+        self.fallback.clear(key)
+
+    @staticmethod
+    def _format_for_llm(messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        formatted = []
+        for msg in messages:
+            role = "assistant" if msg["role"] == "ai" else "user"
+            formatted.append({
+                "role": role,
+                "content": msg["content"]
+            })
+        return formatted
+
+
+class ChatHistoryManager(_ChatHistoryBase):
     """
     Manages chat history for users using Redis (if available) or in-memory storage.
+    동기 클라이언트이므로 스크립트/벤치마크용입니다. 서버(이벤트 루프)에서는 AsyncChatHistoryManager를 사용합니다.
     """
     def __init__(self):
+        super().__init__()
         self.use_redis = False
-        self.in_memory_storage: Dict[str, List[Dict[str, Any]]] = {}
-        self.max_history = 20
         self.redis_client: Optional[redis.Redis] = None
 
         # Redis 환경변수
@@ -50,23 +210,27 @@ class ChatHistoryManager:
             logger.warning(f"Redis 연결 실패: {str(e)}, 메모리 저장소 사용")
             print("Redis 연결 실패: ", str(e))
 
-    def _get_user_key(self, email: str) -> str:
-        return f"chat_history:{email}"
-    
-    def _get_workout_log_key(self, memberId: int, date: str) -> str:
-        return f"workout_history:{memberId}:{date}"
-    
-    def _get_pt_log_key(self, ptScheduleId: int) -> str:
-        return f"pt_history:{ptScheduleId}"
-
-    def _trim_history_in_redis(self, user_key: str):
-        total_count = self.redis_client.llen(user_key)
-        if total_count > self.max_history:
-            self.redis_client.ltrim(user_key, total_count - self.max_history, -1)
+    def _append_entries(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        """
+        entries를 한 번에 추가하고 최근 max_history개만 남깁니다.
+        Redis는 RPUSH + LTRIM (+ 키 종류별 EXPIRE)을 MULTI/EXEC 파이프라인 한 번으로 보내므로 왕복 1회이고,
+        동시에 여러 요청이 써도 중간 상태(잘리지 않은 목록, 사용자/응답 사이에 끼어든 메시지)가 보이지 않습니다.
+        """
+        if self.use_redis and self.redis_client:
+            pipe = self.redis_client.pipeline(transaction=True)
+            self._queue_append(pipe, key, entries)
+            pipe.execute()
+        else:
+            self._memory_append(key, entries)
 
-    def _trim_history_in_memory(self, email: str):
-        if len(self.in_memory_storage[email]) > self.max_history:
-            self.in_memory_storage[email] = self.in_memory_storage[email][-self.max_history:]
+    def _read_recent(self, key: str, limit: int) -> List[Dict[str, Any]]:
+        """최근 limit개 메시지 (Redis는 LRANGE -limit -1 한 번)"""
+        limit = self._limit(limit)
+        if limit <= 0:
+            return []
+        if self.use_redis and self.redis_client:
+            return self._parse(self.redis_client.lrange(key, -limit, -1))
+        return self._memory_read(key, limit)
 
     def add_chat_entry(
         self,
@@ -80,31 +244,32 @@ class ChatHistoryManager:
         role: 'user' or 'assistant'
         """
         try:
-            # 내부 저장 구조: role='user'/'ai' 로 통일
-            normalized_role = "ai" if role == "assistant" else "user"
-            entry = {
-                "role": normalized_role,
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            if additional_data:
-                entry.update(additional_data)
-
-            if self.use_redis and self.redis_client:
-                user_key = self._get_user_key(email)
-                self.redis_client.rpush(user_key, json.dumps(entry))
-                self._trim_history_in_redis(user_key)
-            else:
-                if email not in self.in_memory_storage:
-                    self.in_memory_storage[email] = []
-                self.in_memory_storage[email].append(entry)
-                self._trim_history_in_memory(email)
-
+            self._append_entries(self._get_user_key(email), [self._new_entry(role, message, additional_data)])
             return True
         except Exception as e:
             logger.error(f"add_chat_entry 오류: {str(e)}")
             return False
 
+    def add_chat_turn(
+        self,
+        email: str,
+        user_message: str,
+        assistant_message: str,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Add a user message and the assistant reply in one write.
+        additional_data is stored on the assistant entry.
+        """
+        try:
+            self._append_entries(
+                self._get_user_key(email), self._turn_entries(user_message, assistant_message, additional_data)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"add_chat_turn 오류: {str(e)}")
+            return False
+
     def add_workout_log_entry(
         self,
         memberId: int,
@@ -114,32 +279,24 @@ class ChatHistoryManager:
         additional_data: Optional[Dict[str, Any]] = None
     ) -> bool:
         try:
-            normalized_role = "ai" if role == "assistant" else "user"
-            entry = {
-                "role": normalized_role,
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            if additional_data:
-                entry.update(additional_data)
-
-            if self.use_redis and self.redis_client:
-                user_key = self._get_workout_log_key(memberId, date)
-                self.redis_client.rpush(user_key, json.dumps(entry))
-                self._trim_history_in_redis(user_key)
-            else:
-                if memberId not in self.in_memory_storage:
-                    self.in_memory_storage[memberId] = {}
-                if date not in self.in_memory_storage[memberId]:
-                    self.in_memory_storage[memberId][date] = []
-                self.in_memory_storage[memberId][date].append(entry)
-                self._trim_history_in_memory(memberId)
-            
+            self._append_entries(
+                self._get_workout_log_key(memberId, date), [self._new_entry(role, message, additional_data)]
+            )
             return True
         except Exception as e:
             logger.error(f"add_workout_log_entry 오류: {str(e)}")
             return False
-    
+
+    def add_workout_log_turn(self, memberId: int, date: str, user_message: str, assistant_message: str) -> bool:
+        try:
+            self._append_entries(
+                self._get_workout_log_key(memberId, date), self._turn_entries(user_message, assistant_message)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"add_workout_log_turn 오류: {str(e)}")
+            return False
+
     def add_pt_log_entry(
         self,
         ptScheduleId: int,
@@ -148,54 +305,26 @@ class ChatHistoryManager:
         additional_data: Optional[Dict[str, Any]] = None
     ) -> bool:
         try:
-            normalized_role = "ai" if role == "assistant" else "user"
-            entry = {
-                "role": normalized_role,
-                "content": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            if additional_data:
-                entry.update(additional_data)
-
-            if self.use_redis and self.redis_client:
-                user_key = self._get_pt_log_key(ptScheduleId)
-                self.redis_client.rpush(user_key, json.dumps(entry))
-                self._trim_history_in_redis(user_key)
-            else:
-                if ptScheduleId not in self.in_memory_storage:
-                    self.in_memory_storage[ptScheduleId] = []
-                self.in_memory_storage[ptScheduleId].append(entry)
-                self._trim_history_in_memory(ptScheduleId)
-
+            self._append_entries(self._get_pt_log_key(ptScheduleId), [self._new_entry(role, message, additional_data)])
             return True
         except Exception as e:
             logger.error(f"add_pt_log_entry 오류: {str(e)}")
             return False
-            
+
+    def add_pt_log_turn(self, ptScheduleId: int, user_message: str, assistant_message: str) -> bool:
+        try:
+            self._append_entries(self._get_pt_log_key(ptScheduleId), self._turn_entries(user_message, assistant_message))
+            return True
+        except Exception as e:
+            logger.error(f"add_pt_log_turn 오류: {str(e)}")
+            return False
+
     def get_recent_messages(self, email: str, limit: int = 6) -> List[Dict[str, Any]]:
         """
         Return up to 'limit' most recent messages for a user.
         """
-        limit = min(limit, self.max_history)
         try:
-            if self.use_redis and self.redis_client:
-                user_key = self._get_user_key(email)
-                total = self.redis_client.llen(user_key)
-                if total == 0:
-                    return []
-                start_index = max(0, total - limit)
-                raw_messages = self.redis_client.lrange(user_key, start_index, -1)
-                parsed = []
-                for msg_json in raw_messages:
-                    try:
-                        parsed.append(json.loads(msg_json))
-                    except:
-                        pass
-                return parsed
-            else:
-                if email not in self.in_memory_storage:
-                    return []
-                return self.in_memory_storage[email][-limit:]
+            return self._read_recent(self._get_user_key(email), limit)
         except Exception as e:
             logger.error(f"get_recent_messages 오류: {str(e)}")
             return []
@@ -204,55 +333,18 @@ class ChatHistoryManager:
         """
         Return up to 'limit' most recent messages for a user.
         """
-        limit = min(limit, self.max_history)
         try:
-            if self.use_redis and self.redis_client:
-                user_key = self._get_pt_log_key(ptScheduleId)
-                total = self.redis_client.llen(user_key)
-                if total == 0:
-                    return []
-                start_index = max(0, total - limit)
-                raw_messages = self.redis_client.lrange(user_key, start_index, -1)
-                parsed = []
-                for msg_json in raw_messages:
-                    try:
-                        parsed.append(json.loads(msg_json))
-                    except:
-                        pass
-                return parsed
-            else:
-                if ptScheduleId not in self.in_memory_storage:
-                    return []
-                return self.in_memory_storage[ptScheduleId][-limit:]
+            return self._read_recent(self._get_pt_log_key(ptScheduleId), limit)
         except Exception as e:
             logger.error(f"get_recent_messages_by_pt_log_key 오류: {str(e)}")
             return []
-        
+
     def get_recent_messages_by_workout_log_key(self, memberId: int, date: str, limit: int = 6) -> List[Dict[str, Any]]:
         """
         Return up to 'limit' most recent messages for a user.
         """
-        limit = min(limit, self.max_history)
-
         try:
-            if self.use_redis and self.redis_client:
-                user_key = self._get_workout_log_key(memberId, date)
-                total = self.redis_client.llen(user_key)
-                if total == 0:
-                    return []
-                start_index = max(0, total - limit)
-                raw_messages = self.redis_client.lrange(user_key, start_index, -1)
-                parsed = []
-                for msg_json in raw_messages:
-                    try:
-                        parsed.append(json.loads(msg_json))
-                    except:
-                        pass
-                return parsed
-            else:
-                if memberId not in self.in_memory_storage:
-                    return []
-                return self.in_memory_storage[memberId][date][-limit:]
+            return self._read_recent(self._get_workout_log_key(memberId, date), limit)
         except Exception as e:
             logger.error(f"get_recent_messages_by_workout_log_key 오류: {str(e)}")
             return []
@@ -263,9 +355,9 @@ class ChatHistoryManager:
         """
         try:
             if self.use_redis and self.redis_client:
-                self.redis_client.delete(self._get_user_key(email))
+                self.redis_client.delete(self._get_user_key(email), self._get_summary_key(email))
             else:
-                self.in_memory_storage[email] = []
+                self._memory_clear(self._get_user_key(email))
             return True
         except Exception as e:
             logger.error(f"clear_history 오류: {str(e)}")
@@ -275,12 +367,319 @@ class ChatHistoryManager:
         """
         Return a list of messages in a format suitable for LLM (role: user/assistant).
         """
-        messages = self.get_recent_messages(email, limit)
-        formatted = []
-        for msg in messages:
-            role = "assistant" if msg["role"] == "ai" else "user"
-            formatted.append({
-                "role": role,
-                "content": msg["content"]
-            })
-        return formatted
+        return self._format_for_llm(self.get_recent_messages(email, limit))
+
+
+class AsyncChatHistoryManager(_ChatHistoryBase):
+    """
+    ChatHistoryManager와 같은 키/형식을 쓰는 비동기 저장소 (redis.asyncio + 공유 ConnectionPool)
+    - Redis 호출을 기다리는 동안 이벤트 루프가 다른 요청을 처리하므로, Redis 지연/장애가 워커 전체를 멈추지 않습니다.
+    - 연결/타임아웃 오류가 나면 REDIS_RETRY_INTERVAL 동안 메모리 저장소를 사용하고 이후 다시 Redis를 시도합니다.
+    - 연결 풀은 처음 사용하는 이벤트 루프에 묶이므로, 루프가 바뀌면(스크립트에서 asyncio.run 반복 등) 새로 만듭니다.
+    """
+
+    def __init__(self):
+        # Redis 장애 중에 쓴 메시지는 메모리 저장소에 보관했다가 Redis가 돌아오면 다시 씀
+        super().__init__(buffer_writes=True)
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unavailable_until = 0.0
+        self._replay_task: Optional[asyncio.Future] = None
+
+    def _redis(self) -> Optional[aioredis.Redis]:
+        if time.monotonic() < self._unavailable_until:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            pool = aioredis.ConnectionPool(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                password=os.getenv("REDIS_PASSWORD") or None,
+                db=int(os.getenv("REDIS_DB", "0")),
+                decode_responses=True,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                max_connections=REDIS_MAX_CONNECTIONS,
+            )
+            self._client = aioredis.Redis(connection_pool=pool)
+            self._loop = loop
+        return self._client
+
+    def _mark_unavailable(self, error: Exception) -> None:
+        self._unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"Redis 연결 실패 ({REDIS_RETRY_INTERVAL:.0f}초 동안 메모리 저장소 사용): {error}")
+
+    def redis_available(self) -> bool:
+        """연결 실패 후 REDIS_RETRY_INTERVAL 동안(메모리 저장소 사용 중)은 False"""
+        return time.monotonic() >= self._unavailable_until
+
+    def reset(self) -> None:
+        """연결 풀을 버립니다. (fork 이후 자식 프로세스에서 호출)"""
+        self._client = None
+        self._loop = None
+        self._unavailable_until = 0.0
+        self._replay_task = None
+
+    async def ping(self) -> bool:
+        """연결 풀에 연결을 하나 만들어 둡니다. (워커 시작 준비용, 실패하면 메모리 저장소 모드로 전환)"""
+        client = self._redis()
+        if client is None:
+            return False
+        try:
+            return bool(await client.ping())
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._mark_unavailable(e)
+            return False
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client, self._loop = self._client, None, None
+            await client.aclose()
+
+    async def _replay(self, client: aioredis.Redis) -> None:
+        batches = self.fallback.pending_batches()
+        if not batches:
+            return
+        async with client.pipeline(transaction=True) as pipe:
+            for key, _, entries in batches:
+                self._queue_append(pipe, key, entries)
+            await pipe.execute()
+        for key, seq, _ in batches:
+            self.fallback.ack(key, seq)
+        logger.info(f"Redis 복구: 메모리 저장소에 쌓인 대화 {sum(len(e) for _, _, e in batches)}개({len(batches)}개 키) 반영")
+
+    async def _replay_pending(self, client: aioredis.Redis) -> None:
+        """
+        장애 중 메모리에만 쓴 메시지를 Redis에 먼저 반영합니다.
+        동시에 들어온 요청은 같은 반영 작업을 기다리므로 복구 직후에도 메시지 순서가 유지됩니다.
+        """
+        if self._replay_task is None:
+            if not self.fallback.has_pending():
+                return
+            self._replay_task = asyncio.ensure_future(self._replay(client))
+            self._replay_task.add_done_callback(self._replay_done)
+        try:
+            await asyncio.shield(self._replay_task)
+        except (redis.ConnectionError, redis.TimeoutError):
+            raise
+        except Exception as e:
+            # 반영하지 못한 메시지는 메모리에 남겨 두고 다음 요청에서 다시 시도
+            logger.error(f"메모리 저장소 대화 반영 실패: {e}")
+
+    def _replay_done(self, task: asyncio.Future) -> None:
+        self._replay_task = None
+        if not task.cancelled():
+            task.exception()  # 대기 중인 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록
+
+    async def _append_entries(self, key: str, entries: List[Dict[str, Any]]) -> None:
+        """entries를 추가하고 최근 max_history개만 남김 (RPUSH + LTRIM + EXPIRE, MULTI/EXEC 파이프라인 왕복 1회)"""
+        client = self._redis()
+        if client is not None:
+            try:
+                await self._replay_pending(client)
+                async with client.pipeline(transaction=True) as pipe:
+                    self._queue_append(pipe, key, entries)
+                    await pipe.execute()
+                return
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._mark_unavailable(e)
+        self._memory_append(key, entries)
+
+    async def _read_recent(self, key: str, limit: int) -> List[Dict[str, Any]]:
+        limit = self._limit(limit)
+        if limit <= 0:
+            return []
+        client = self._redis()
+        if client is not None:
+            try:
+                await self._replay_pending(client)
+                return self._parse(await client.lrange(key, -limit, -1))
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._mark_unavailable(e)
+        return self._memory_read(key, limit)
+
+    async def _append(self, name: str, key: str, entries: List[Dict[str, Any]]) -> bool:
+        try:
+            await self._append_entries(key, entries)
+            return True
+        except Exception as e:
+            logger.error(f"{name} 오류: {str(e)}")
+            return False
+
+    async def _read(self, name: str, key: str, limit: int) -> List[Dict[str, Any]]:
+        try:
+            return await self._read_recent(key, limit)
+        except Exception as e:
+            logger.error(f"{name} 오류: {str(e)}")
+            return []
+
+    async def add_chat_entry(
+        self,
+        email: str,
+        role: str,
+        message: str,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        return await self._append(
+            "add_chat_entry", self._get_user_key(email), [self._new_entry(role, message, additional_data)]
+        )
+
+    async def add_chat_turn(
+        self,
+        email: str,
+        user_message: str,
+        assistant_message: str,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        return await self._append(
+            "add_chat_turn",
+            self._get_user_key(email),
+            self._turn_entries(user_message, assistant_message, additional_data),
+        )
+
+    async def add_workout_log_entry(
+        self,
+        memberId: int,
+        date: str,
+        role: str,
+        message: str,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        return await self._append(
+            "add_workout_log_entry",
+            self._get_workout_log_key(memberId, date),
+            [self._new_entry(role, message, additional_data)],
+        )
+
+    async def add_workout_log_turn(self, memberId: int, date: str, user_message: str, assistant_message: str) -> bool:
+        return await self._append(
+            "add_workout_log_turn",
+            self._get_workout_log_key(memberId, date),
+            self._turn_entries(user_message, assistant_message),
+        )
+
+    async def add_pt_log_entry(
+        self,
+        ptScheduleId: int,
+        role: str,
+        message: str,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        return await self._append(
+            "add_pt_log_entry", self._get_pt_log_key(ptScheduleId), [self._new_entry(role, message, additional_data)]
+        )
+
+    async def add_pt_log_turn(self, ptScheduleId: int, user_message: str, assistant_message: str) -> bool:
+        return await self._append(
+            "add_pt_log_turn", self._get_pt_log_key(ptScheduleId), self._turn_entries(user_message, assistant_message)
+        )
+
+    async def get_recent_messages(self, email: str, limit: int = 6) -> List[Dict[str, Any]]:
+        return await self._read("get_recent_messages", self._get_user_key(email), limit)
+
+    async def get_recent_messages_by_pt_log_key(self, ptScheduleId: int, limit: int = 6) -> List[Dict[str, Any]]:
+        return await self._read("get_recent_messages_by_pt_log_key", self._get_pt_log_key(ptScheduleId), limit)
+
+    async def get_recent_messages_by_workout_log_key(
+        self, memberId: int, date: str, limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        return await self._read(
+            "get_recent_messages_by_workout_log_key", self._get_workout_log_key(memberId, date), limit
+        )
+
+    async def clear_history(self, email: str) -> bool:
+        key = self._get_user_key(email)
+        try:
+            client = self._redis()
+            if client is not None:
+                await client.delete(key, self._get_summary_key(email))
+            self._memory_clear(key)
+            return True
+        except Exception as e:
+            logger.error(f"clear_history 오류: {str(e)}")
+            return False
+
+    async def get_formatted_history(self, email: str, limit: int = 6) -> List[Dict[str, str]]:
+        return self._format_for_llm(await self.get_recent_messages(email, limit))
+
+    async def get_recent_messages_with_summary(
+        self, email: str, limit: int = 6
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        최근 limit개 메시지와 대화 요약 상태를 Redis 왕복 1회(LRANGE + GET 파이프라인)로 읽습니다.
+        Redis를 쓸 수 없으면 메모리 저장소의 메시지만 돌려주고 요약은 None입니다.
+        """
+        key = self._get_user_key(email)
+        limit = self._limit(limit)
+        try:
+            client = self._redis()
+            if client is not None:
+                try:
+                    await self._replay_pending(client)
+                    async with client.pipeline(transaction=False) as pipe:
+                        if limit > 0:
+                            pipe.lrange(key, -limit, -1)
+                        pipe.get(self._get_summary_key(email))
+                        results = await pipe.execute()
+                    raw_messages = results[0] if limit > 0 else []
+                    return self._parse(raw_messages), self._parse_summary(results[-1])
+                except (redis.ConnectionError, redis.TimeoutError) as e:
+                    self._mark_unavailable(e)
+            return self._memory_read(key, limit) if limit > 0 else [], None
+        except Exception as e:
+            logger.error(f"get_recent_messages_with_summary 오류: {str(e)}")
+            return [], None
+
+    async def get_summary(self, email: str) -> Optional[Dict[str, Any]]:
+        _, summary = await self.get_recent_messages_with_summary(email, 0)
+        return summary
+
+    async def save_summary(self, email: str, state: Dict[str, Any], expected_last: Optional[str]) -> bool:
+        """
+        요약 상태를 저장합니다. 저장된 상태의 "last"가 expected_last와 다르면(다른 워커가 먼저 갱신) 저장하지 않고 False.
+        만료 시간은 chat_history 키와 같습니다.
+        """
+        client = self._redis()
+        if client is None:
+            return False
+        key = self._get_summary_key(email)
+        ttl = ttl_seconds(self._get_user_key(email))
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(key)
+                current = self._parse_summary(await pipe.get(key))
+                if (current or {}).get("last") != expected_last:
+                    return False
+                pipe.multi()
+                pipe.set(key, json.dumps(state, ensure_ascii=False, separators=(",", ":")), ex=ttl or None)
+                await pipe.execute()
+            return True
+        except redis.WatchError:
+            return False
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            self._mark_unavailable(e)
+            return False
+        except Exception as e:
+            logger.error(f"save_summary 오류: {str(e)}")
+            return False
+
+    @staticmethod
+    def _parse_summary(raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+
+_async_manager: Optional[AsyncChatHistoryManager] = None
+
+
+def get_chat_history_manager() -> AsyncChatHistoryManager:
+    """프로세스 공용 AsyncChatHistoryManager (api_server와 Supervisor가 같은 연결 풀/메모리 저장소를 사용)"""
+    global _async_manager
+    if _async_manager is None:
+        _async_manager = AsyncChatHistoryManager()
+    return _async_manager
@@ -106,6 +106,7 @@ AGENT_CONTEXT_BUILDING_PROMPT = """
 요약 규칙
 0. JSON 한 줄(객체)만 출력, 닫는 `}}` 뒤엔 아무 문자도 금지
 1. chat_history에서 **User** 역할만 고려, Assistant/System 무시
+   (맨 앞 '이전 대화 요약:' 줄이 있으면 더 오래된 대화의 요약으로 같은 기준에 따라 참고)
 2. 1차: message로 핵심 주제·의도 파악
 3. 2차: chat_history 활용
    3‑a. message가 **숫자 참조·대명사('그 일정' 등)·동일 주제**로
@@ -136,4 +137,59 @@ AGENT_CONTEXT_BUILDING_PROMPT = """
 
 
 
-__all__ = ["AGENT_CONTEXT_PROMPT", "QDRANT_INSIGHTS_PROMPT", "QDRANT_SEARCH_PROMPT", "CATEGORY_ROUTING_PROMPT", "AGENT_CONTEXT_BUILDING_PROMPT"]
\ No newline at end of file
+# 문맥 요약 + 카테고리 분류를 한 번의 호출로 처리하는 프롬프트 (SUPERVISOR_ROUTING_MODE=merged)
+AGENT_CONTEXT_ROUTING_PROMPT = """
+당신은 피트니스 코치 챗봇의 문맥 요약 및 라우팅 전문가입니다.
+아래 입력으로 (A) 문맥 요약과 (B) 담당 카테고리를 동시에 결정하세요.
+
+(A) context_summary 작성 규칙
+1. chat_history에서 **User** 역할만 고려, Assistant/System 무시
+   (맨 앞 '이전 대화 요약:' 줄이 있으면 더 오래된 대화의 요약으로 같은 기준에 따라 참고)
+2. 1차: message로 핵심 주제·의도 파악
+3. 2차: message가 **숫자 참조·대명사('그 일정' 등)·동일 주제**로 과거 발화를 명확히 가리킬 때만
+   chat_history의 연관 정보를 가져오고, 숫자 참조("2번", "세 번째")는 실제 항목으로 복원
+   그 외에는 **과거 내용은 무시**(message 기반 요약만 작성)
+4. 3차: qdrant_events는 메시지와 연관되고 최근(7일 이내)인 것만 반영
+5. 입력에 없는 정보·추측·질문, 직접적인 설명·추천, 메타 코멘트("정보 없음" 등) ❌금지❌
+6. 60자 이내, 마침표로 종료
+
+(B) categories 선택 규칙 (1~2개, 가장 적합한 것부터)
+   - exercise : 운동, 스트레칭, 헬스, 루틴, 근육, 자세, 통증‑완화 스트레칭
+   - food   : 식단, 칼로리, 영양, 음식, 탄단지, 레시피, 식사 기록
+   - schedule : 예약, 일정, PT 시간·횟수, 알림, 달력, 캘린더, 취소
+   - motivation: 동기부여, 칭찬, 격려, 목표 달성 의지, 멘탈 관리
+   - general  : 단순 정보·날짜·시간 문의, 모호하거나 기타 주제
+   숫자 참조는 (A)에서 복원한 항목 기준으로 판단하고,
+   애매하면 요약의 주제를 우선, 그래도 모호하면 "general"
+
+──────────────────────────
+입력
+- chat_history:
+\"\"\"{chat_history}\"\"\"  # (오래된 ↓, 최신 ↑)
+- message: \"{message}\"
+- qdrant_events: \"{qdrant_events}\"  # Qdrant에서 가져온 이벤트 정보
+"""
+
+# 대화 요약 갱신 프롬프트 (supervisor_modules.utils.conversation_memory)
+# 기존 요약 + 최근 구간에서 밀려난 대화만 받아 요약을 갱신하므로 호출당 입력 크기가 일정함
+CONVERSATION_SUMMARY_PROMPT = """
+피트니스 코치 챗봇과 사용자의 대화 요약을 갱신하세요.
+기존 요약에 새 대화를 반영한 요약 하나만 출력합니다.
+
+규칙
+1. 이후 대화에 필요한 사실만 남김: 사용자의 목표, 신체 정보, 선호, 제약(부상·알레르기 등), 잡은 일정, 진행 중인 요청
+2. 인사·잡담, AI 답변의 세부 설명은 생략 (AI가 제안하고 사용자가 받아들인 계획만 기록)
+3. 기존 요약과 새 대화가 충돌하면 새 대화를 따름
+4. 입력에 없는 정보·추측 ❌금지❌
+5. {max_chars}자 이내의 한국어 평문, 머리말·메타 코멘트 없이 요약만 출력
+
+──────────────────────────
+입력
+- 기존 요약:
+\"\"\"{summary}\"\"\"
+- 새 대화:
+\"\"\"{conversation}\"\"\"  # (오래된 ↓, 최신 ↑)
+"""
+
+
+__all__ = ["AGENT_CONTEXT_PROMPT", "QDRANT_INSIGHTS_PROMPT", "QDRANT_SEARCH_PROMPT", "CATEGORY_ROUTING_PROMPT", "AGENT_CONTEXT_BUILDING_PROMPT", "AGENT_CONTEXT_ROUTING_PROMPT", "CONVERSATION_SUMMARY_PROMPT"]
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+gunicorn 설정 (start.sh: gunicorn -c gunicorn.conf.py api_server:app)
+- preload_app: 마스터가 앱을 한 번 임포트하고 warmup_process()로 워크플로우 컴파일 + 임베딩 모델 로딩/더미 인코딩을 마친 뒤
+  워커를 fork합니다. 워커는 모델 메모리를 copy-on-write로 공유하므로 워커 수만큼 모델을 따로 올리지 않습니다.
+- 마스터는 네트워크 연결을 만들지 않습니다. (fork 직전에 LLM httpx 풀이 비어 있는지 확인)
+  post_fork에서 Redis / ES / Qdrant 등 물려받은 연결 객체를 버리고 워커마다 새로 만들며,
+  LLM httpx 클라이언트는 마스터에서 만든 ChatOpenAI가 잡고 있으므로 그대로 씁니다.
+  (연결 풀 준비는 워커 startup의 warmup_worker, 끝나면 /ready가 200)
+"""
+
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "300"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    """워커 fork 직전(마스터) — preload된 앱의 프로세스 준비"""
+    if not preload_app:
+        return
+    import gc
+
+    from supervisor_modules.utils.warmup import (
+        WARMUP_ENABLED,
+        assert_no_open_connections,
+        mark_preloaded,
+        warmup_process,
+    )
+
+    if WARMUP_ENABLED:
+        warmup_process()
+        mark_preloaded()
+    # 워커는 LLM httpx 클라이언트를 그대로 물려받아 쓰므로 마스터에서 연결이 열려 있으면 안 됨
+    assert_no_open_connections()
+    # 지금까지 만든 객체를 GC 대상에서 빼서 워커의 GC가 공유 페이지에 쓰지 않게 함 (copy-on-write 유지)
+    gc.freeze()
+    server.log.info("프로세스 준비 완료, 워커 생성 시작")
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    from supervisor_modules.utils.warmup import after_fork
+
+    after_fork()
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from supervisor_modules.utils.llm_registry import get_llm
 from supervisor import Supervisor
 import warnings
 from langchain._api.deprecation import LangChainDeprecationWarning
@@ -13,7 +13,7 @@ async def main():
     load_dotenv()
     
     # Supervisor 초기화
-    model = ChatOpenAI(model="gpt-3.5-turbo")
+    model = get_llm("supervisor")
 
     # Supervisor 초기화 (model 객체 전달)
     supervisor = Supervisor(model=model)
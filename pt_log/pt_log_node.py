@@ -6,6 +6,7 @@ from pt_log.pt_log_prompt import PT_LOG_PROMPT, PT_LOG_PROMPT_WITH_HISTORY
 from pt_log.pt_log_tool import submit_workout_log, is_workout_log_exist, add_workout_log, is_exercise_log_exist, modify_workout_log
 from pt_log.pt_log_model import ptLogState
 from agents.exercise.tools.exercise_member_tools import search_exercise_by_name
+from supervisor_modules.utils.workflow_registry import get_agent_executor
 import json
 
 tools = [
@@ -89,6 +90,29 @@ tools = [
     )
 ]
 
+# 프롬프트는 불변 객체이므로 모듈 로드 시 한 번만 생성
+RECONSTRUCT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", PT_LOG_PROMPT_WITH_HISTORY),
+    ("user", "{message}"),
+    ("user", "{chat_history}"),
+])
+
+PT_LOG_AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", PT_LOG_PROMPT),
+    ("user", "{reconstructed_message}"),
+    ("user", "{ptScheduleId}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+def build_pt_log_executor(llm: ChatOpenAI) -> AgentExecutor:
+    agent = create_tool_calling_agent(llm, tools, PT_LOG_AGENT_PROMPT)
+    return AgentExecutor(
+        agent=agent,
+        verbose=True,
+        tools=tools,
+        handle_parse_errors=True,
+    )
+
 def pt_log_save(state: ptLogState, llm: ChatOpenAI) -> ptLogState:
     """PT 일지 기록 노드"""
 
@@ -100,13 +124,7 @@ def pt_log_save(state: ptLogState, llm: ChatOpenAI) -> ptLogState:
 
     # 1. 채팅 내역이 있는 경우 메시지 재구성
     if chat_history and len(chat_history) > 0:
-        reconstruct_prompt = ChatPromptTemplate.from_messages([
-            ("system", PT_LOG_PROMPT_WITH_HISTORY),
-            ("user", "{message}"),
-            ("user", "{chat_history}"),
-        ])
-
-        reconstruct_chain = reconstruct_prompt | llm
+        reconstruct_chain = RECONSTRUCT_PROMPT | llm
         reconstructed_message = reconstruct_chain.invoke({
             "chat_history": json.dumps(chat_history, ensure_ascii=False),
             "message": message
@@ -116,22 +134,8 @@ def pt_log_save(state: ptLogState, llm: ChatOpenAI) -> ptLogState:
 
     print("reconstructed_message: ", reconstructed_message)
 
-    # 2. 재구성된 메시지로 PT 로그 저장
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", PT_LOG_PROMPT),
-        ("user", "{reconstructed_message}"),
-        ("user", "{ptScheduleId}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad")
-    ])
-
-    agent = create_tool_calling_agent(llm, tools, prompt)
-
-    agent_executor = AgentExecutor(
-        agent=agent,
-        verbose=True,
-        tools=tools,
-        handle_parse_errors=True,
-    )
+    # 2. 재구성된 메시지로 PT 로그 저장 (AgentExecutor는 llm별로 한 번만 생성)
+    agent_executor = get_agent_executor("pt_log_save", llm, lambda: build_pt_log_executor(llm))
 
     response = agent_executor.invoke({
         "reconstructed_message": reconstructed_message,
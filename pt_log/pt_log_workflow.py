@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, END, START
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from supervisor_modules.utils.workflow_registry import get_workflow
+from supervisor_modules.utils.llm_registry import get_llm
 from pt_log.pt_log_node import pt_log_save
 from pt_log.pt_log_model import ptLogState
 
@@ -8,10 +9,7 @@ load_dotenv()
 
 def create_pt_log_workflow():
     """PT 일지 워크플로우 생성"""
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7
-    )
+    llm = get_llm("workflow")
 
     workflow = StateGraph(ptLogState)
 
@@ -25,6 +23,10 @@ def create_pt_log_workflow():
     print("result: ", result)
     return result
 
+def get_pt_log_workflow():
+    """컴파일된 워크플로우를 프로세스 단위로 재사용 (요청마다 다시 컴파일하지 않음)"""
+    return get_workflow("pt_log", create_pt_log_workflow)
+
 if __name__ == "__main__":
     workflow = create_pt_log_workflow()
     workflow.invoke({"message": "오늘 레그프레스 150kg 10회 5세트 했어", "ptScheduleId": 42})
@@ -3,4 +3,12 @@ Qdrant 유틸리티 패키지
 벡터 데이터베이스 관련 도구 모음
 """
 
-from .qdrant_client import QdrantManager 
\ No newline at end of file
+
+def __getattr__(name):
+    # qdrant_utils.qdrant_client는 임포트 시 로그 디렉터리/핸들러를 만들므로 QdrantManager를 쓸 때만 불러옴
+    if name == "QdrantManager":
+        from .qdrant_client import QdrantManager
+
+        return QdrantManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+ 
\ No newline at end of file
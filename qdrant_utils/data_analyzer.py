@@ -456,7 +456,9 @@ class DataAnalyzer:
             List[float]: 임베딩 벡터
         """
         try:
-            response = client.embeddings.create(
+            # 동기 OpenAI 클라이언트 호출은 스레드로 넘겨 이벤트 루프를 막지 않음
+            response = await asyncio.to_thread(
+                client.embeddings.create,
                 model="text-embedding-3-small",
                 input=text
             )
@@ -13,6 +13,26 @@ load_dotenv()
 
 BACKEND_URL = os.getenv("EC2_BACKEND_URL")
 
+# 프롬프트는 불변 객체이므로 모듈 로드 시 한 번만 생성
+EXERCISE_REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REPORT_EXERCISE_PROMPT),
+    ("user", "{pt_log_data}"),
+    ("user", "{workout_log_data}"),
+    ("user", "{gender}")
+])
+
+MEAL_REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REPORT_MEAL_PROMPT),
+    ("user", "{user_goal}"),
+    ("user", "{meal_records}")
+])
+
+INBODY_REPORT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", REPORT_INBODY_PROMPT),
+    ("user", "{inbody_data}"),
+    ("user", "{gender}")
+])
+
 def analyze_pt_log(state: reportState, llm: ChatOpenAI):
     ptContractId = state.ptContractId
 
@@ -27,14 +47,7 @@ def analyze_pt_log(state: reportState, llm: ChatOpenAI):
     workout_log_data = select_workout_log(ptContractId)
     print("workout_log_data: ", workout_log_data)
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", REPORT_EXERCISE_PROMPT),
-        ("user", "{pt_log_data}"),
-        ("user", "{workout_log_data}"),
-        ("user", "{gender}")
-    ])
-
-    response = llm.invoke(prompt.format_messages(
+    response = llm.invoke(EXERCISE_REPORT_PROMPT.format_messages(
         pt_log_data=pt_log_data,
         workout_log_data=workout_log_data,
         gender=gender
@@ -54,13 +67,7 @@ def analyze_meal_records(state: reportState, llm: ChatOpenAI):
     user_goal = select_user_goal(ptContractId)
     print("user_goal: ", user_goal)
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", REPORT_MEAL_PROMPT),
-        ("user", "{user_goal}"),
-        ("user", "{meal_records}")
-    ])
-
-    response = llm.invoke(prompt.format_messages(meal_records=meal_records, user_goal=user_goal))
+    response = llm.invoke(MEAL_REPORT_PROMPT.format_messages(meal_records=meal_records, user_goal=user_goal))
     print("meal_report: ", response.content)
 
     state.diet_report = json.loads(response.content)
@@ -75,13 +82,7 @@ def analyze_inbody_data(state: reportState, llm: ChatOpenAI):
 
     gender = state.gender
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", REPORT_INBODY_PROMPT),
-        ("user", "{inbody_data}"),
-        ("user", "{gender}")
-    ])
-
-    response = llm.invoke(prompt.format_messages(inbody_data=inbody_data, gender=gender))
+    response = llm.invoke(INBODY_REPORT_PROMPT.format_messages(inbody_data=inbody_data, gender=gender))
     print("inbody_report: ", response.content)
     # JSON 문자열을 파싱하여 딕셔너리로 변환
     state.inbody_report = json.loads(response.content)
@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, END, START
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from supervisor_modules.utils.workflow_registry import get_workflow
+from supervisor_modules.utils.llm_registry import get_llm
 from report.report_node import analyze_pt_log, add_data, analyze_inbody_data, analyze_meal_records
 from report.report_model import reportState
 
@@ -8,10 +9,7 @@ load_dotenv()
 
 def create_report_workflow():
     """PT 일지 워크플로우 생성"""
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7
-    )
+    llm = get_llm("workflow")
 
     workflow = StateGraph(reportState)
 
@@ -30,6 +28,10 @@ def create_report_workflow():
     print("result: ", result)
     return result
 
+def get_report_workflow():
+    """컴파일된 워크플로우를 프로세스 단위로 재사용 (요청마다 다시 컴파일하지 않음)"""
+    return get_workflow("report", create_report_workflow)
+
 if __name__ == "__main__":
     workflow = create_report_workflow()
     workflow.invoke({"ptContractId": 1})
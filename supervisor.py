@@ -2,29 +2,62 @@
 Supervisor 모듈 - 모듈화된 컴포넌트를 통합하여 일관된 인터페이스를 제공
 """
 
+import asyncio
 import logging
 import os
 import json
+import time
 import uuid
 import traceback
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 # LangChain/OpenAI
 from langchain_openai import ChatOpenAI
 
 # 모듈화된 컴포넌트 임포트
 from supervisor_modules.classification.classifier import classify_message
-from supervisor_modules.utils.context_builder import build_agent_context
+from supervisor_modules.utils.context_builder import build_agent_context, build_context_and_route
+from supervisor_modules.utils.conversation_memory import (
+    CONVERSATION_SUMMARY_ENABLED,
+    format_summary,
+    schedule_summary_update,
+)
 from supervisor_modules.state.state_manager import SupervisorState
-from chat_history_manager import ChatHistoryManager
+from chat_history_manager import get_chat_history_manager
 from supervisor_modules.agents_manager.agents_executor import register_agent
+from supervisor_modules.utils.stream_events import emit_event, mute_token_stream
+from supervisor_modules.utils.metrics import metrics_labels, record_fallback, track_stage
+from supervisor_modules.utils.tracing import current_trace_id, start_trace
+from supervisor_modules.response.response_generator import combine_agent_responses
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 채팅 내역 관리자 초기화
-chat_history_manager = ChatHistoryManager()
+chat_history_manager = get_chat_history_manager()
+
+# 에이전트 실행 전 단계 실행 방식
+# - sequential : 대화 내역 → Qdrant 이벤트 → 문맥 생성 순서대로 실행 (기본값)
+# - concurrent : 대화 내역 조회와 Qdrant 이벤트 조회(회원 조회·임베딩·벡터 검색)를 동시에 실행하고,
+#                QDRANT_EVENTS_DEADLINE 초가 지나면 이벤트 없이 문맥 생성을 진행
+PIPELINE_MODE = os.getenv("SUPERVISOR_PIPELINE_MODE", "sequential").lower()
+QDRANT_EVENTS_DEADLINE = float(os.getenv("QDRANT_EVENTS_DEADLINE", "1.5"))
+
+# 문맥 생성 + 카테고리 분류 방식
+# - two_call : build_agent_context(gpt-4o) → classify_message(로컬 라우터/gpt-3.5) 순차 호출 (기본값)
+# - merged   : 구조화 출력 1회 호출로 context_summary와 카테고리를 함께 생성 (실패 시 two_call로 재시도)
+ROUTING_MODE = os.getenv("SUPERVISOR_ROUTING_MODE", "two_call").lower()
+
+# 분류된 카테고리(최대 2개)를 모두 동시에 실행하고 combine_agent_responses로 합칠지 여부
+# 기본값(false)은 기존처럼 첫 번째 카테고리만 실행
+AGENT_FANOUT = os.getenv("SUPERVISOR_AGENT_FANOUT", "false").lower() == "true"
+# fan-out 모드의 에이전트별 제한 시간(초). AGENT_TIMEOUT_<CATEGORY>로 개별 지정 가능 (예: AGENT_TIMEOUT_EXERCISE=90)
+AGENT_TIMEOUT = float(os.getenv("AGENT_TIMEOUT", "60"))
+AGENT_TIMEOUTS = {
+    category: float(os.getenv(f"AGENT_TIMEOUT_{category.upper()}", AGENT_TIMEOUT))
+    for category in ("exercise", "food", "schedule", "motivation", "general")
+}
 
 
 class Supervisor:
@@ -59,6 +92,296 @@ class Supervisor:
             register_agent(agent_type, agent_instance)
             logger.info(f"에이전트 '{agent_type}' 등록 완료")
 
+    async def _load_chat_history(
+        self,
+        request_id: str,
+        user_id: Optional[str],
+        chat_history: Optional[List[Dict[str, Any]]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        대화 내역을 전달받지 않았으면(None) 최근 메시지와 이전 대화 요약을 Redis에서 한 번에 조회합니다.
+        호출자가 이미 조회한 목록(빈 목록 포함)은 그대로 쓰고 요약만 읽습니다.
+        Returns: (대화 내역, 이전 대화 요약 또는 None)
+        """
+        if not user_id:
+            return chat_history or [], None
+        try:
+            summary_state = None
+            with track_stage("history_fetch"):
+                if not CONVERSATION_SUMMARY_ENABLED:
+                    if chat_history is None:
+                        chat_history = await chat_history_manager.get_recent_messages(user_id, 10)
+                elif chat_history is None:
+                    chat_history, summary_state = await chat_history_manager.get_recent_messages_with_summary(
+                        user_id, 10
+                    )
+                else:
+                    summary_state = await chat_history_manager.get_summary(user_id)
+            conversation_summary = format_summary(summary_state)
+            logger.info(
+                f"[{request_id}] 대화 내역 조회 완료 - {len(chat_history)}개, 이전 대화 요약 {'있음' if conversation_summary else '없음'}"
+            )
+            return chat_history, conversation_summary
+        except Exception as e:
+            logger.warning(f"[{request_id}] 대화 내역 조회 실패: {e}")
+            return chat_history or [], None
+
+    async def _load_qdrant_events(
+        self,
+        request_id: str,
+        user_id: Optional[str],
+        member_id: Optional[str],
+        message: str,
+    ) -> str:
+        """QDrant에서 사용자 이벤트 정보를 조회합니다. 실패 시 빈 문자열을 반환합니다."""
+        if not user_id:
+            return ""
+        try:
+            from supervisor_modules.utils.qdrant_helper import get_user_events
+            
+            qdrant_user_id = member_id
+            logger.info(f"[{request_id}] 테스트 환경: 사용자 ID {user_id}를 {qdrant_user_id}로 매핑")
+            
+            with track_stage("qdrant_events"):
+                qdrant_events = await get_user_events(qdrant_user_id, message)
+            logger.info(f"[{request_id}] QDrant 이벤트 정보 조회 완료")
+            return qdrant_events
+        except Exception as e:
+            logger.warning(f"[{request_id}] QDrant 이벤트 정보 조회 실패: {e}")
+            return ""
+
+    async def _prepare_inputs_concurrently(
+        self,
+        request_id: str,
+        message: str,
+        member_id: Optional[str],
+        user_id: Optional[str],
+        chat_history: Optional[List[Dict[str, Any]]],
+    ):
+        """
+        대화 내역 조회와 QDrant 이벤트 조회를 동시에 실행합니다.
+        이벤트 조회가 QDRANT_EVENTS_DEADLINE 안에 끝나지 않으면 이벤트 없이 진행하고,
+        남은 조회 작업은 백그라운드에서 마무리되도록 둡니다.
+        """
+        started = time.monotonic()
+        logger.info(f"[{request_id}] (0) 동시 실행 모드 - 대화 내역/이벤트 조회 시작 (deadline: {QDRANT_EVENTS_DEADLINE}s)")
+
+        events_task = asyncio.create_task(
+            self._load_qdrant_events(request_id, user_id, member_id, message)
+        )
+        chat_history, conversation_summary = await self._load_chat_history(request_id, user_id, chat_history)
+
+        remaining = QDRANT_EVENTS_DEADLINE - (time.monotonic() - started)
+        try:
+            qdrant_events = await asyncio.wait_for(asyncio.shield(events_task), timeout=max(remaining, 0))
+        except asyncio.TimeoutError:
+            logger.warning(f"[{request_id}] QDrant 이벤트 조회가 {QDRANT_EVENTS_DEADLINE}s 안에 끝나지 않아 이벤트 없이 진행")
+            events_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            record_fallback("qdrant_events_deadline")
+            qdrant_events = ""
+
+        logger.info(f"[{request_id}] (0) 입력 준비 완료 (소요: {time.monotonic() - started:.2f}s)")
+        return chat_history, conversation_summary, qdrant_events
+
+    async def _build_context_and_classify(
+        self,
+        request_id: str,
+        message: str,
+        chat_history: List[Dict[str, Any]],
+        qdrant_events: str,
+        conversation_summary: Optional[str] = None,
+    ):
+        """
+        문맥 정보 생성과 카테고리 분류를 수행합니다. (SUPERVISOR_ROUTING_MODE에 따라 1회 또는 2회 호출)
+        Returns: (context_info JSON 문자열, context_summary, 카테고리 리스트, 분류 메타데이터)
+        """
+        categories: List[str] = []
+        metadata: Dict[str, Any] = {}
+
+        if ROUTING_MODE == "merged":
+            with track_stage("context_route"):
+                context_info, categories, metadata = await build_context_and_route(
+                    message=message,
+                    chat_history=chat_history,
+                    request_id=request_id,
+                    qdrant_events=qdrant_events,
+                    conversation_summary=conversation_summary,
+                )
+            if not categories:
+                logger.warning(f"[{request_id}] 통합 호출 실패 → 2회 호출 방식으로 재시도")
+                record_fallback("merged_routing")
+
+        if not categories:
+            with track_stage("context_build"):
+                context_info = await build_agent_context(
+                    message=message, 
+                    chat_history=chat_history,
+                    request_id=request_id,
+                    qdrant_events=qdrant_events,
+                    conversation_summary=conversation_summary,
+                )
+        logger.info(f"[{request_id}] (1) 문맥 정보 생성 완료: {len(context_info)}")
+
+        # context_summary 추출
+        try:
+            context_data = json.loads(context_info)
+            agent_context = context_data.get("context_summary", "문맥 정보 없음")
+        except Exception:
+            logger.warning(f"[{request_id}] context_info JSON 파싱 실패")
+            agent_context = "문맥 정보 파싱 실패"
+        emit_event("context_built", context_summary=agent_context)
+
+        # 2) 메시지 분류
+        if not categories:
+            logger.info(f"[{request_id}] (2) 카테고리 분류 시작")
+            with track_stage("classification"):
+                categories, metadata = await classify_message(
+                    message=message, context_info=context_info
+                )
+        logger.info(f"[{request_id}] (2) 분류 결과: {categories}")
+        return context_info, agent_context, categories, metadata
+
+    async def _run_agent(
+        self,
+        request_id: str,
+        category: str,
+        message: str,
+        context_info: str,
+        agent_context: str,
+        member_id: Optional[str],
+        user_id: Optional[str],
+        user_type: str,
+        chat_history: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """카테고리에 해당하는 에이전트를 호출합니다. (agent 라벨을 붙여 에이전트 내부 지표까지 기록)"""
+        with metrics_labels(agent=category), track_stage("agent"):
+            return await self._dispatch_agent(
+                request_id, category, message, context_info, agent_context,
+                member_id, user_id, user_type, chat_history
+            )
+
+    async def _dispatch_agent(
+        self,
+        request_id: str,
+        category: str,
+        message: str,
+        context_info: str,
+        agent_context: str,
+        member_id: Optional[str],
+        user_id: Optional[str],
+        user_type: str,
+        chat_history: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """에이전트별 인자 형식에 맞춰 process를 호출합니다."""
+        agent = self.agents.get(category, self.agents["general"])
+        payload_message = context_info
+
+        try:
+            if category == "general":
+                result = await agent.process(
+                    message=message,
+                    context_info=context_info,
+                    chat_history=chat_history,
+                )
+            elif category == "schedule":
+                result = await agent.process(
+                    message=payload_message,
+                    member_id=int(member_id) if member_id and member_id.isdigit() else None,
+                    user_type=user_type
+                )
+            elif category == "exercise":
+                result = await agent.process(
+                    message=payload_message,
+                    member_id=int(member_id) if member_id and member_id.isdigit() else None,
+                    user_type=user_type,
+                    chat_history=chat_history,
+                )
+            elif category in ["motivation", "food"]:
+                result = await agent.process(
+                    message=payload_message,
+                    email=user_id,
+                    chat_history=chat_history,
+                )
+            else:
+                result = await agent.process(
+                    message=payload_message,
+                    agent_context=agent_context,
+                    chat_history=chat_history,
+                )
+            logger.info(
+                f"[{request_id}] (3) 에이전트 '{category}' 응답: '{result.get('response','')[:60]}...'"
+            )
+        except TypeError as e:
+            logger.warning(
+                f"[{request_id}] 에이전트 매개변수 오류: {e} → fallback 호출"
+            )
+            record_fallback("agent_params")
+            result = await agent.process(message=payload_message)
+        return result
+
+    async def _run_agent_with_timeout(self, request_id: str, category: str, *args, mute_tokens: bool = False) -> Dict[str, Any]:
+        """
+        fan-out 모드에서 에이전트 하나를 제한 시간 안에 실행합니다.
+        실패/타임아웃은 예외 대신 {"agent", "error"} 형태로 반환하여 다른 에이전트 결과는 살립니다.
+        """
+        if mute_tokens:
+            # 여러 에이전트의 최종 응답 토큰이 섞이지 않도록 이 Task에서는 토큰 스트리밍을 끔
+            mute_token_stream()
+        emit_event("agent_started", agent=category)
+        timeout = AGENT_TIMEOUTS.get(category, AGENT_TIMEOUT)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._run_agent(request_id, category, *args), timeout=timeout)
+            emit_event("agent_finished", agent=category, status="ok")
+            return {"agent": category, "result": result, "elapsed": time.monotonic() - started}
+        except asyncio.TimeoutError:
+            logger.warning(f"[{request_id}] 에이전트 '{category}' 제한 시간({timeout}s) 초과")
+            emit_event("agent_finished", agent=category, status="timeout")
+            return {"agent": category, "error": f"timeout after {timeout}s"}
+        except Exception as e:
+            logger.error(f"[{request_id}] 에이전트 '{category}' 실행 오류: {e}")
+            logger.error(traceback.format_exc())
+            emit_event("agent_finished", agent=category, status="error")
+            return {"agent": category, "error": str(e)}
+
+    async def _run_agents_concurrently(
+        self,
+        request_id: str,
+        categories: List[str],
+        *args,
+    ):
+        """
+        선택된 모든 카테고리의 에이전트를 동시에 실행하고 결과를 결합합니다.
+        Returns: (결합된 result dict, 대표 카테고리)
+        """
+        categories = categories or ["general"]
+        logger.info(f"[{request_id}] (3) 에이전트 동시 실행: {categories}")
+        started = time.monotonic()
+
+        outcomes = await asyncio.gather(*[
+            self._run_agent_with_timeout(request_id, category, *args, mute_tokens=len(categories) > 1)
+            for category in categories
+        ])
+        valid_results = [
+            outcome for outcome in outcomes
+            if "error" not in outcome and outcome["result"].get("type") != "error"
+        ]
+        logger.info(
+            f"[{request_id}] (3) 에이전트 동시 실행 완료 - 성공 {len(valid_results)}/{len(outcomes)} "
+            f"(소요: {time.monotonic() - started:.2f}s)"
+        )
+
+        if not valid_results:
+            errors = "; ".join(f"{o['agent']}: {o.get('error') or o['result'].get('response', '')}" for o in outcomes)
+            raise RuntimeError(f"모든 에이전트 실행 실패 ({errors})")
+
+        primary = valid_results[0]["agent"]
+        if len(valid_results) == 1:
+            return valid_results[0]["result"], primary
+
+        combined = combine_agent_responses(valid_results, categories, request_id)
+        return {"type": valid_results[0]["result"].get("type", primary), "response": combined}, primary
+
     async def process(
         self,
         message: str,
@@ -66,13 +389,29 @@ class Supervisor:
         trainer_id: Optional[str] = None,
         chat_history: Optional[List[Dict[str, Any]]] = None,
         user_type: Optional[str] = None,
+        request_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         1) build_agent_context  -> context_info 생성
         2) classify_message      -> 카테고리 결정
         3) 해당 에이전트 실행    -> 최종 응답 반환
+           (SUPERVISOR_AGENT_FANOUT=true면 선택된 카테고리 전체를 동시에 실행 후 결합)
+
+        request_id를 주지 않으면 진행 중인 trace id(api_server 요청 ID)를 이어받고, 없으면 새로 만듭니다.
         """
-        request_id = str(uuid.uuid4())
+        request_id = request_id or current_trace_id() or str(uuid.uuid4())
+        with start_trace(request_id, "supervisor.process", user_type=user_type):
+            return await self._process(request_id, message, member_id, trainer_id, chat_history, user_type)
+
+    async def _process(
+        self,
+        request_id: str,
+        message: str,
+        member_id: Optional[str],
+        trainer_id: Optional[str],
+        chat_history: Optional[List[Dict[str, Any]]],
+        user_type: Optional[str],
+    ) -> Dict[str, Any]:
         try:
             # 0) 사용자 정보
             if not user_type:
@@ -82,118 +421,53 @@ class Supervisor:
                 f"[{request_id}] 처리 시작 - 메시지: '{message[:50]}...', {user_type}_id: {user_id}"
             )
 
-            # 대화 내역 조회
-            if not chat_history and user_id:
-                try:
-                    chat_history = chat_history_manager.get_recent_messages(user_id, 10)
-                    logger.info(
-                        f"[{request_id}] 대화 내역 조회 완료 - {len(chat_history)}개"
-                    )
-                except Exception as e:
-                    logger.warning(f"[{request_id}] 대화 내역 조회 실패: {e}")
-                    chat_history = []
-            elif not chat_history:
-                chat_history = []
-
-            # 1) 문맥 정보 생성
-            logger.info(f"[{request_id}] (1) 문맥 정보 생성 시작")
-            
-            # QDrant에서 사용자 이벤트 정보 가져오기 
-            qdrant_events = ""
-            if user_id:
-                try:
-                    from supervisor_modules.utils.qdrant_helper import get_user_events
-                    import asyncio
-                    
-                    qdrant_user_id = member_id
-                    logger.info(f"[{request_id}] 테스트 환경: 사용자 ID {user_id}를 {qdrant_user_id}로 매핑")
-                    
-                    qdrant_events = await get_user_events(qdrant_user_id, message)
-                    logger.info(f"[{request_id}] QDrant 이벤트 정보 조회 완료")
-                except Exception as e:
-                    logger.warning(f"[{request_id}] QDrant 이벤트 정보 조회 실패: {e}")
-                    qdrant_events = ""
-            
-            context_info = await build_agent_context(
-                message=message, 
-                chat_history=chat_history,
-                request_id=request_id,
-                qdrant_events=qdrant_events
-            )
-            logger.info(f"[{request_id}] (1) 문맥 정보 생성 완료: {len(context_info)}")
-
-            # context_summary 추출
-            try:
-                context_data = json.loads(context_info)
-                agent_context = context_data.get("context_summary", "문맥 정보 없음")
-            except Exception:
-                logger.warning(f"[{request_id}] context_info JSON 파싱 실패")
-                agent_context = "문맥 정보 파싱 실패"
+            # 대화 내역 조회 + QDrant에서 사용자 이벤트 정보 가져오기
+            if PIPELINE_MODE == "concurrent":
+                chat_history, conversation_summary, qdrant_events = await self._prepare_inputs_concurrently(
+                    request_id, message, member_id, user_id, chat_history
+                )
+                logger.info(f"[{request_id}] (1) 문맥 정보 생성 시작")
+            else:
+                chat_history, conversation_summary = await self._load_chat_history(request_id, user_id, chat_history)
 
-            # 2) 메시지 분류
-            logger.info(f"[{request_id}] (2) 카테고리 분류 시작")
-            categories, metadata = await classify_message(
-                message=message, context_info=context_info
+                # 1) 문맥 정보 생성
+                logger.info(f"[{request_id}] (1) 문맥 정보 생성 시작")
+                qdrant_events = await self._load_qdrant_events(request_id, user_id, member_id, message)
+            
+            context_info, agent_context, categories, metadata = await self._build_context_and_classify(
+                request_id, message, chat_history, qdrant_events, conversation_summary
             )
-            logger.info(f"[{request_id}] (2) 분류 결과: {categories}")
             category = categories[0] if categories else "general"
+            emit_event("category_selected", categories=categories, category=category)
 
             # 3) 에이전트 호출
-            logger.info(f"[{request_id}] (3) 에이전트 '{category}' 실행")
-            agent = self.agents.get(category, self.agents["general"])
-
-            payload_message = context_info
-
-            try:
-                if category == "general":
-                    result = await agent.process(
-                        message=message,
-                        context_info=context_info,
-                        chat_history=chat_history,
-                    )
-                elif category == "schedule":
-                    result = await agent.process(
-                        message=payload_message,
-                        member_id=int(member_id) if member_id and member_id.isdigit() else None,
-                        user_type=user_type
-                    )
-                elif category == "exercise":
-                    result = await agent.process(
-                        message=payload_message,
-                        member_id=int(member_id) if member_id and member_id.isdigit() else None,
-                        user_type=user_type,
-                        chat_history=chat_history,
-                    )
-                elif category in ["motivation", "food"]:
-                    result = await agent.process(
-                        message=payload_message,
-                        email=user_id,
-                        chat_history=chat_history,
-                    )
-                else:
-                    result = await agent.process(
-                        message=payload_message,
-                        agent_context=agent_context,
-                        chat_history=chat_history,
-                    )
-                logger.info(
-                    f"[{request_id}] (3) 에이전트 응답: '{result.get('response','')[:60]}...'"
+            if AGENT_FANOUT:
+                result, category = await self._run_agents_concurrently(
+                    request_id, categories, message, context_info, agent_context,
+                    member_id, user_id, user_type, chat_history
                 )
-            except TypeError as e:
-                logger.warning(
-                    f"[{request_id}] 에이전트 매개변수 오류: {e} → fallback 호출"
+            else:
+                logger.info(f"[{request_id}] (3) 에이전트 '{category}' 실행")
+                emit_event("agent_started", agent=category)
+                result = await self._run_agent(
+                    request_id, category, message, context_info, agent_context,
+                    member_id, user_id, user_type, chat_history
                 )
-                result = await agent.process(message=payload_message)
 
             # 4) 대화 내역 저장
             if user_id:
-                chat_history_manager.add_chat_entry(user_id, "user", message)
-                chat_history_manager.add_chat_entry(
-                    user_id,
-                    "assistant",
-                    result.get("response", ""),
-                    additional_data={"agent_type": category, "selected_agents": categories},
-                )
+                with track_stage("history_write"):
+                    saved = await chat_history_manager.add_chat_turn(
+                        user_id,
+                        message,
+                        result.get("response", ""),
+                        additional_data={"agent_type": category, "selected_agents": categories},
+                    )
+                if saved:
+                    # 최근 구간에서 밀려난 턴을 이전 대화 요약에 합침 (응답을 기다리게 하지 않도록 백그라운드)
+                    schedule_summary_update(user_id)
+                else:
+                    logger.warning(f"[{request_id}] 대화 내역 저장 실패: {user_id}")
 
             logger.info(f"[{request_id}] 메시지 처리 완료")
             return {
@@ -4,5 +4,12 @@ Classification 모듈
 """
 
 from .classifier import classify_message
+from .fast_router import route_message, router_stats
 
-__all__ = ['classify_message'] 
\ No newline at end of file
+
+def get_router_stats():
+    """로컬 라우터 적중률/일치율 스냅샷"""
+    return router_stats.snapshot()
+
+
+__all__ = ['classify_message', 'route_message', 'get_router_stats'] 
\ No newline at end of file
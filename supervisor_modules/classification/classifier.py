@@ -2,36 +2,106 @@
 classifier.py
 - 라우팅(분류) 모듈
 - context_info(JSON 문자열) + 사용자 메시지 -> 1~2개 카테고리 선택
+- 로컬 라우터(fast_router)가 확신하는 메시지는 LLM 호출 없이 바로 분류
 """
 
+import asyncio
 import json
+import random
 import time
 import traceback
 import logging
 from typing import Dict, Any, List, Tuple
 
-from langchain_openai import ChatOpenAI
 from langchain.schema.messages import SystemMessage
 from langsmith.run_helpers import traceable
 
 from common_prompts.prompts import CATEGORY_ROUTING_PROMPT
+from supervisor_modules.utils.llm_registry import get_llm
+from supervisor_modules.utils.llm_cache import cached_ainvoke
+from supervisor_modules.utils.metrics import record_error, record_fallback
+from .fast_router import (
+    FAST_ROUTER_ENABLED,
+    FAST_ROUTER_SHADOW_RATE,
+    RouteDecision,
+    is_confident,
+    route_message,
+    router_stats,
+    log_classification,
+)
 
 logger = logging.getLogger(__name__)
 
+# 섀도 비교 Task가 GC 되지 않도록 참조 보관
+_shadow_tasks: set = set()
+
+
+async def _shadow_compare(message: str, context_info: str, decision: RouteDecision) -> None:
+    """로컬 라우터 결과를 LLM 분류와 비교하여 일치율만 기록합니다. (응답 경로에 영향 없음)"""
+    try:
+        categories, metadata = await _classify_with_llm(message, context_info, time.time())
+        if "error" not in metadata:
+            router_stats.record_agreement(decision, categories)
+    except Exception as e:
+        logger.debug(f"섀도 분류 실패: {str(e)}")
+
+
 @traceable(run_type="chain", name="메시지 분류")
 async def classify_message(
     message: str,
     context_info: str = ""
 ) -> Tuple[List[str], Dict[str, Any]]:
     """
-    (1) context_info(JSON 문자열), message 활용
-    (2) CATEGORY_ROUTING_PROMPT에 넣어 LLM 호출
+    (1) 로컬 라우터로 먼저 분류 (신뢰도가 FAST_ROUTER_THRESHOLD를 넘으면 바로 반환)
+    (2) 아니면 context_info(JSON 문자열), message를 CATEGORY_ROUTING_PROMPT에 넣어 LLM 호출
     (3) ["exercise", "food", ...] 형태의 리스트 반환
     """
     start_time = time.time()
+    decision = None
+
+    if FAST_ROUTER_ENABLED:
+        try:
+            decision = route_message(message)
+        except Exception as e:
+            logger.warning(f"로컬 라우터 오류: {str(e)}")
+
+        if is_confident(decision):
+            router_stats.record_hit(decision)
+            logger.info(f"로컬 라우터 분류 결과: {decision.category} ({decision.method}, {decision.confidence})")
+            if FAST_ROUTER_SHADOW_RATE > 0 and random.random() < FAST_ROUTER_SHADOW_RATE:
+                task = asyncio.create_task(_shadow_compare(message, context_info, decision))
+                _shadow_tasks.add(task)
+                task.add_done_callback(_shadow_tasks.discard)
+            return [decision.category], {
+                "classification_time": time.time() - start_time,
+                "method": "fast_router",
+                "router": decision.method,
+                "confidence": decision.confidence,
+            }
+
+    categories, metadata = await _classify_with_llm(message, context_info, start_time)
+
+    if FAST_ROUTER_ENABLED:
+        router_stats.record_fallback()
+        record_fallback("fast_router_llm")
+        if "error" not in metadata:
+            # 임계값 미만이었던 로컬 추정치도 LLM 결과와 비교해 둠 (임계값 조정 근거)
+            router_stats.record_agreement(decision, categories)
+            log_classification(message, categories, metadata)
+
+    return categories, metadata
+
+
+async def _classify_with_llm(
+    message: str,
+    context_info: str,
+    start_time: float
+) -> Tuple[List[str], Dict[str, Any]]:
+    """CATEGORY_ROUTING_PROMPT로 LLM 분류를 수행합니다."""
     metadata: Dict[str, Any] = {
         "classification_time": 0,
         "model": "gpt-4o",
+        "method": "llm",
     }
 
     try:
@@ -39,7 +109,7 @@ async def classify_message(
         if not isinstance(context_info, str):
             context_info = str(context_info)
 
-        chat_model = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.0)
+        chat_model = get_llm("router")
 
         # 라우팅 프롬프트 생성
         prompt_text = CATEGORY_ROUTING_PROMPT.format(
@@ -47,9 +117,9 @@ async def classify_message(
             message=message
         )
 
-        response = chat_model.invoke([
-            SystemMessage(content=prompt_text)
-        ])
+        response = await cached_ainvoke(
+            chat_model, [SystemMessage(content=prompt_text)], site="classify"
+        )
         raw = response.content.strip()
 
         logger.info(f"LLM 라우팅 응답: {raw}")
@@ -91,6 +161,7 @@ async def classify_message(
     except Exception as e:
         logger.error(f"메시지 분류 오류: {str(e)}")
         logger.error(traceback.format_exc())
+        record_error("classification")
         return ["general"], {
             **metadata,
             "error": str(e),
@@ -0,0 +1,360 @@
+"""
+fast_router.py
+- LLM 호출 전에 실행되는 로컬 라우터 (네트워크 호출 없음)
+- 1단계: 키워드/정규식 규칙 점수
+- 2단계: 문자 n-gram 해시 임베딩 기반 최근접 중심(nearest-centroid) 모델 (로그된 LLM 분류 결과로 학습)
+- 신뢰도가 임계값을 넘으면(is_confident) 바로 카테고리를 반환하고, 아니면 classify_message가 LLM으로 넘어감
+
+학습 방법:
+    CLASSIFICATION_LOG_PATH 를 설정하면 LLM 분류 결과가 JSONL로 쌓입니다.
+    python -m supervisor_modules.classification.fast_router train --log classification_log.jsonl --out router_centroids.json
+    이후 FAST_ROUTER_MODEL_PATH=router_centroids.json 으로 지정하면 규칙에 걸리지 않는 메시지도 로컬에서 분류합니다.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VALID_CATEGORIES = ("exercise", "food", "schedule", "motivation", "general")
+
+FAST_ROUTER_ENABLED = os.getenv("FAST_ROUTER_ENABLED", "true").lower() == "true"
+FAST_ROUTER_THRESHOLD = float(os.getenv("FAST_ROUTER_THRESHOLD", "0.75"))
+FAST_ROUTER_MODEL_PATH = os.getenv("FAST_ROUTER_MODEL_PATH", "")
+# 로컬 라우터가 확신한 경우에도 일정 비율은 LLM 분류를 백그라운드로 실행해 일치율을 측정
+FAST_ROUTER_SHADOW_RATE = float(os.getenv("FAST_ROUTER_SHADOW_RATE", "0"))
+CLASSIFICATION_LOG_PATH = os.getenv("CLASSIFICATION_LOG_PATH", "")
+
+# 카테고리별 (정규식, 가중치)
+CATEGORY_RULES: Dict[str, List[Tuple[str, float]]] = {
+    "food": [
+        (r"먹었|먹음|먹었어|먹을까|먹어도|섭취", 2.0),
+        (r"식단|식사\s?기록|칼로리|영양|단백질|탄수화물|지방|탄단지|레시피", 2.0),
+        (r"아침|점심|저녁|간식|야식", 0.5),
+        (r"알레르기|선호\s?음식|비선호", 1.5),
+    ],
+    "schedule": [
+        (r"예약|일정|스케줄|캘린더|달력", 2.0),
+        (r"PT\s?(시간|횟수|일정|수업)|수업\s?(시간|변경|취소)", 2.0),
+        (r"취소|변경해|옮겨", 1.0),
+        (r"[월화수목금토일]요일|다음\s?주|이번\s?주|내일|모레|\d{1,2}\s?시", 0.75),
+    ],
+    "exercise": [
+        (r"운동|루틴|헬스|웨이트|유산소|스트레칭", 2.0),
+        (r"스쿼트|벤치\s?프레스|데드\s?리프트|풀업|런지|플랭크|레그\s?프레스|숄더\s?프레스", 2.0),
+        (r"근육|자세|세트|반복|하체|상체|가슴|등\s?운동|어깨|복근|허벅지", 1.0),
+    ],
+    "motivation": [
+        (r"응원|힘내|파이팅|화이팅|격려|동기\s?부여|의욕", 2.0),
+        (r"우울|지쳤|지쳐|포기|자신감|힘들어|하기\s?싫", 1.5),
+    ],
+    "general": [
+        # 인사만 있는 짧은 메시지 ("안녕, 다이어트 하려는데..."처럼 뒤에 질문이 붙으면 맞지 않음)
+        (r"^\s*(안녕(하세요)?|하이|hi|hello)[\s!~.?ㅎㅋ]*$", 2.0),
+        (r"고마워|감사합니다|감사해", 1.5),
+        (r"오늘\s?(며칠|몇\s?일)|지금\s?몇\s?시", 2.0),
+    ],
+}
+
+# 이전 대화를 가리키는 메시지는 문맥 요약 없이 판단할 수 없으므로 로컬 라우팅 대상에서 제외
+CONTEXT_DEPENDENT_PATTERN = re.compile(
+    r"\d+\s?번(째)?|첫\s?번째|두\s?번째|세\s?번째|그거|그것|저거|아까|위에|방금|그\s?(일정|운동|식단)"
+)
+
+_COMPILED_RULES = {
+    category: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in rules]
+    for category, rules in CATEGORY_RULES.items()
+}
+
+# 규칙 점수 → 신뢰도 변환 시 분모에 더하는 값 (가중치 2.0짜리 규칙 하나만 맞으면 0.8)
+# 임계값 비교는 초과(>)이므로 기본 임계값 0.75에서는 2.0 미만 규칙 하나만으로(1.5 → 0.75) 라우팅되지 않음
+_RULE_PRIOR = 0.5
+
+# 해시 임베딩 설정
+EMBEDDING_DIM = 2048
+NGRAM_RANGE = (1, 3)
+CENTROID_TEMPERATURE = 0.05
+
+
+@dataclass
+class RouteDecision:
+    category: str
+    confidence: float
+    method: str
+    scores: Dict[str, float]
+
+
+def score_rules(message: str) -> Dict[str, float]:
+    """카테고리별 규칙 점수를 계산합니다."""
+    scores = {}
+    for category, rules in _COMPILED_RULES.items():
+        total = sum(weight for pattern, weight in rules if pattern.search(message))
+        if total > 0:
+            scores[category] = total
+    return scores
+
+
+def is_confident(decision: Optional[RouteDecision], threshold: float = FAST_ROUTER_THRESHOLD) -> bool:
+    """로컬 라우터 결과를 LLM 분류 없이 그대로 써도 되는지 (신뢰도가 임계값을 넘어야 함)"""
+    return decision is not None and decision.confidence > threshold
+
+
+def route_by_rules(message: str) -> Optional[RouteDecision]:
+    scores = score_rules(message)
+    if not scores:
+        return None
+    best = max(scores, key=scores.get)
+    confidence = scores[best] / (sum(scores.values()) + _RULE_PRIOR)
+    return RouteDecision(category=best, confidence=round(confidence, 4), method="rules", scores=scores)
+
+
+def embed_text(text: str) -> List[float]:
+    """공백을 제거한 문자 n-gram을 해시하여 고정 차원 벡터로 변환합니다. (L2 정규화)"""
+    normalized = re.sub(r"\s+", "", text.lower())
+    vector = [0.0] * EMBEDDING_DIM
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(normalized) - n + 1):
+            bucket = zlib.crc32(normalized[i:i + n].encode("utf-8")) % EMBEDDING_DIM
+            vector[bucket] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+class CentroidModel:
+    """카테고리별 평균 벡터(중심)와의 코사인 유사도로 분류하는 모델"""
+
+    def __init__(self, centroids: Dict[str, List[float]], counts: Optional[Dict[str, int]] = None):
+        self.centroids = centroids
+        self.counts = counts or {}
+
+    @classmethod
+    def train(cls, samples: List[Tuple[str, str]]) -> "CentroidModel":
+        sums: Dict[str, List[float]] = {}
+        counts: Dict[str, int] = {}
+        for message, category in samples:
+            if category not in VALID_CATEGORIES:
+                continue
+            vector = embed_text(message)
+            if category not in sums:
+                sums[category] = [0.0] * EMBEDDING_DIM
+                counts[category] = 0
+            sums[category] = [a + b for a, b in zip(sums[category], vector)]
+            counts[category] += 1
+
+        centroids = {}
+        for category, total in sums.items():
+            norm = math.sqrt(sum(v * v for v in total))
+            centroids[category] = [v / norm for v in total] if norm else total
+        return cls(centroids, counts)
+
+    def predict(self, message: str) -> Optional[RouteDecision]:
+        if not self.centroids:
+            return None
+        vector = embed_text(message)
+        sims = {
+            category: sum(a * b for a, b in zip(vector, centroid))
+            for category, centroid in self.centroids.items()
+        }
+        # 유사도를 softmax로 정규화하여 최상위 카테고리의 확률을 신뢰도로 사용
+        max_sim = max(sims.values())
+        exps = {c: math.exp((s - max_sim) / CENTROID_TEMPERATURE) for c, s in sims.items()}
+        total = sum(exps.values())
+        best = max(sims, key=sims.get)
+        return RouteDecision(
+            category=best,
+            confidence=round(exps[best] / total, 4),
+            method="centroid",
+            scores={c: round(s, 4) for c, s in sims.items()},
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"dim": EMBEDDING_DIM, "counts": self.counts, "centroids": self.centroids}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "CentroidModel":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("dim") != EMBEDDING_DIM:
+            raise ValueError(f"임베딩 차원 불일치: {data.get('dim')} != {EMBEDDING_DIM}")
+        return cls(data["centroids"], data.get("counts"))
+
+
+class RouterStats:
+    """로컬 라우터 적중률/LLM 일치율 카운터 (프로세스 단위)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.fast_hits = 0
+        self.fallbacks = 0
+        self.hits_by_method: Dict[str, int] = {}
+        self.agreement_checks = 0
+        self.agreements = 0
+
+    def record_hit(self, decision: RouteDecision) -> None:
+        with self._lock:
+            self.total += 1
+            self.fast_hits += 1
+            self.hits_by_method[decision.method] = self.hits_by_method.get(decision.method, 0) + 1
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.total += 1
+            self.fallbacks += 1
+
+    def record_agreement(self, decision: Optional[RouteDecision], llm_categories: List[str]) -> None:
+        if decision is None or not llm_categories:
+            return
+        with self._lock:
+            self.agreement_checks += 1
+            if decision.category == llm_categories[0]:
+                self.agreements += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "fast_hits": self.fast_hits,
+                "fallbacks": self.fallbacks,
+                "hit_rate": round(self.fast_hits / self.total, 4) if self.total else 0.0,
+                "hits_by_method": dict(self.hits_by_method),
+                "agreement_checks": self.agreement_checks,
+                "agreement_rate": round(self.agreements / self.agreement_checks, 4) if self.agreement_checks else None,
+                "threshold": FAST_ROUTER_THRESHOLD,
+            }
+
+
+router_stats = RouterStats()
+_centroid_model: Optional[CentroidModel] = None
+_centroid_loaded = False
+
+
+def _get_centroid_model() -> Optional[CentroidModel]:
+    global _centroid_model, _centroid_loaded
+    if _centroid_loaded:
+        return _centroid_model
+    _centroid_loaded = True
+    if FAST_ROUTER_MODEL_PATH and os.path.exists(FAST_ROUTER_MODEL_PATH):
+        try:
+            _centroid_model = CentroidModel.load(FAST_ROUTER_MODEL_PATH)
+            logger.info(f"로컬 라우터 중심 모델 로드 완료: {FAST_ROUTER_MODEL_PATH} ({_centroid_model.counts})")
+        except Exception as e:
+            logger.warning(f"로컬 라우터 중심 모델 로드 실패: {str(e)}")
+    return _centroid_model
+
+
+def route_message(message: str) -> Optional[RouteDecision]:
+    """
+    로컬 규칙/중심 모델로 카테고리를 추정합니다.
+    이전 대화를 참조하는 메시지이거나 아무 근거가 없으면 None을 반환합니다.
+    is_confident(반환값)이 False면 호출 측에서 LLM 분류를 사용해야 합니다.
+    """
+    if not message or CONTEXT_DEPENDENT_PATTERN.search(message):
+        return None
+
+    decision = route_by_rules(message)
+    if is_confident(decision):
+        return decision
+
+    model = _get_centroid_model()
+    if model is not None:
+        centroid_decision = model.predict(message)
+        if centroid_decision and (decision is None or centroid_decision.confidence > decision.confidence):
+            return centroid_decision
+    return decision
+
+
+def log_classification(message: str, categories: List[str], metadata: Dict[str, Any]) -> None:
+    """LLM 분류 결과를 학습용 JSONL로 기록합니다. (CLASSIFICATION_LOG_PATH 설정 시)"""
+    if not CLASSIFICATION_LOG_PATH:
+        return
+    try:
+        record = {"message": message, "categories": categories, "method": metadata.get("method", "llm")}
+        with open(CLASSIFICATION_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logger.warning(f"분류 로그 기록 실패: {str(e)}")
+
+
+def load_samples(log_path: str) -> List[Tuple[str, str]]:
+    samples = []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            # 로컬 라우터가 낸 결과는 학습 데이터에서 제외 (자기 강화 방지)
+            if record.get("method", "llm") != "llm":
+                continue
+            categories = record.get("categories") or []
+            if record.get("message") and categories:
+                samples.append((record["message"], categories[0]))
+    return samples
+
+
+def evaluate(samples: List[Tuple[str, str]], threshold: float = FAST_ROUTER_THRESHOLD,
+             model: Optional[CentroidModel] = None) -> Dict[str, Any]:
+    """기록된 LLM 분류 결과 대비 로컬 라우터의 적중률(coverage)과 일치율(accuracy)을 계산합니다."""
+    global _centroid_model, _centroid_loaded
+    previous = (_centroid_model, _centroid_loaded)
+    _centroid_model, _centroid_loaded = model, True
+    try:
+        covered = correct = 0
+        for message, category in samples:
+            decision = route_message(message)
+            if is_confident(decision, threshold):
+                covered += 1
+                correct += decision.category == category
+    finally:
+        _centroid_model, _centroid_loaded = previous
+    return {
+        "samples": len(samples),
+        "coverage": round(covered / len(samples), 4) if samples else 0.0,
+        "accuracy_on_covered": round(correct / covered, 4) if covered else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 라우터 중심 모델 학습/평가")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = sub.add_parser("train", help="분류 로그로 중심 모델 학습")
+    train_parser.add_argument("--log", required=True, help="CLASSIFICATION_LOG_PATH JSONL 파일")
+    train_parser.add_argument("--out", required=True, help="저장할 모델 JSON 경로")
+    train_parser.add_argument("--holdout", type=float, default=0.2, help="평가용으로 떼어둘 비율")
+
+    eval_parser = sub.add_parser("eval", help="분류 로그 대비 적중률/일치율 평가")
+    eval_parser.add_argument("--log", required=True)
+    eval_parser.add_argument("--model", default="")
+    eval_parser.add_argument("--threshold", type=float, default=FAST_ROUTER_THRESHOLD)
+
+    args = parser.parse_args()
+    samples = load_samples(args.log)
+
+    if args.command == "train":
+        split = int(len(samples) * (1 - args.holdout))
+        model = CentroidModel.train(samples[:split])
+        model.save(args.out)
+        print(json.dumps({"trained": model.counts, "holdout": evaluate(samples[split:], model=model)}, ensure_ascii=False, indent=2))
+    else:
+        model = CentroidModel.load(args.model) if args.model else None
+        print(json.dumps(evaluate(samples, threshold=args.threshold, model=model), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,23 +9,32 @@ import logging
 import os
 from typing import Dict, Any, List, Optional
 
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langsmith.run_helpers import traceable
 
 from supervisor_modules.utils.logger_setup import get_logger
-try:
-    from supervisor_modules.utils.qdrant_helper import get_user_insights, search_relevant_conversations
-except ImportError:
-    # QDrant 기능이 없는 경우를 대비한 대체 함수
-    async def get_user_insights(email: str) -> Dict[str, Any]:
+from supervisor_modules.utils.llm_registry import get_llm
+from common_prompts.prompts import AGENT_CONTEXT_PROMPT, QDRANT_INSIGHTS_PROMPT, QDRANT_SEARCH_PROMPT
+from supervisor_modules.state.state_manager import SupervisorState
+
+
+# qdrant_helper(qdrant_client)는 임포트가 무거우므로 처음 호출할 때 불러옴
+async def get_user_insights(email: str) -> Dict[str, Any]:
+    try:
+        from supervisor_modules.utils.qdrant_helper import get_user_insights as _get_user_insights
+    except ImportError:
+        # QDrant 기능이 없는 경우를 대비한 대체 값
         return {"user_insights": "", "recent_events": "", "user_persona": ""}
-    
-    async def search_relevant_conversations(email: str, query: str) -> List[Dict[str, Any]]:
+    return await _get_user_insights(email)
+
+
+async def search_relevant_conversations(email: str, query: str) -> List[Dict[str, Any]]:
+    try:
+        from supervisor_modules.utils.qdrant_helper import search_relevant_conversations as _search
+    except ImportError:
         return []
+    return await _search(email, query)
 
-from common_prompts.prompts import AGENT_CONTEXT_PROMPT, QDRANT_INSIGHTS_PROMPT, QDRANT_SEARCH_PROMPT
-from supervisor_modules.state.state_manager import SupervisorState
 
 # 로거 설정
 logger = get_logger(__name__)
@@ -165,10 +174,7 @@ async def generate_response_with_insights(agent_results: List[Dict[str, Any]], s
         formatted_history = format_chat_history(chat_history)
                 
         # 모델 및 프롬프트 설정
-        model = ChatOpenAI(
-            model_name="gpt-3.5-turbo",
-            temperature=0.7
-        )
+        model = get_llm("insights")
         
         prompt = ChatPromptTemplate.from_messages([
             ("system", QDRANT_INSIGHTS_PROMPT),
@@ -256,10 +262,7 @@ async def generate_response_with_semantic_search(agent_results: List[Dict[str, A
         formatted_history = format_chat_history(chat_history)
                 
         # 모델 및 프롬프트 설정
-        model = ChatOpenAI(
-            model_name="gpt-3.5-turbo",
-            temperature=0.7
-        )
+        model = get_llm("insights")
         
         prompt = ChatPromptTemplate.from_messages([
             ("system", QDRANT_SEARCH_PROMPT),
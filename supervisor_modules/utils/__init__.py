@@ -3,7 +3,22 @@ Utils 모듈 로깅, 환경 설정 등 유틸리티 기능을 제공합니다.
 """
 
 from supervisor_modules.utils.logger_setup import setup_logger, get_logger
-from supervisor_modules.utils.qdrant_helper import get_qdrant_client, get_user_insights, search_relevant_conversations
+
+# qdrant_helper는 qdrant_client 등 무거운 패키지를 임포트하므로 처음 접근할 때 불러옴
+_LAZY_EXPORTS = {
+    "get_qdrant_client": "supervisor_modules.utils.qdrant_helper",
+    "get_user_insights": "supervisor_modules.utils.qdrant_helper",
+    "search_relevant_conversations": "supervisor_modules.utils.qdrant_helper",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        import importlib
+
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "setup_logger",
@@ -0,0 +1,63 @@
+"""
+blocking.py
+- 비동기 핸들러 안에서 동기(블로킹) 호출을 실행하기 위한 제한된 스레드 풀
+- 동기 Redis/DB/HTTP 호출, 네이티브 비동기 API가 없는 LangChain 호출 등을 이벤트 루프 밖에서 실행합니다.
+- 같은 풀을 이벤트 루프의 기본 executor로 등록하면 LangGraph 동기 노드 실행(ainvoke 시 run_in_executor)과
+  asyncio.to_thread 호출도 같은 상한을 공유합니다.
+- 작업을 넘기는 요청이 프로파일링 중이면(profiling.profile_request) 스레드 풀 작업도 함께 프로파일링합니다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from supervisor_modules.utils.profiling import bind_current_profile
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스당 블로킹 작업 동시 실행 상한
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "32"))
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+class _BlockingExecutor(ThreadPoolExecutor):
+    """submit을 호출한 컨텍스트(요청)가 프로파일링 중이면 작업을 그 요청의 프로파일에 기록"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(bind_current_profile(fn), *args, **kwargs)
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """프로세스 단위 공유 스레드 풀을 반환합니다. (최초 호출 시 생성)"""
+    global _executor
+    if _executor is None:
+        _executor = _BlockingExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="blocking")
+        logger.info(f"블로킹 작업용 스레드 풀 생성 (max_workers={BLOCKING_POOL_SIZE})")
+    return _executor
+
+
+def install_default_executor(loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """공유 스레드 풀을 이벤트 루프의 기본 executor로 등록합니다. (앱 시작 시 1회)"""
+    loop = loop or asyncio.get_running_loop()
+    loop.set_default_executor(get_blocking_executor())
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    동기 함수를 공유 스레드 풀에서 실행하고 결과를 기다립니다.
+    ContextVar(스트리밍 이벤트, 콜백 등)는 현재 컨텍스트를 복사해 전달합니다.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_blocking_executor(), call)
+
+
+__all__ = ["BLOCKING_POOL_SIZE", "get_blocking_executor", "install_default_executor", "run_blocking"]
@@ -7,17 +7,31 @@ import json
 import time
 import traceback
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Literal, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
 from langchain.schema.messages import SystemMessage, HumanMessage
 from langsmith.run_helpers import traceable
+from pydantic import BaseModel, Field
 
-from common_prompts.prompts import AGENT_CONTEXT_BUILDING_PROMPT
+from common_prompts.prompts import AGENT_CONTEXT_BUILDING_PROMPT, AGENT_CONTEXT_ROUTING_PROMPT
+from supervisor_modules.utils.conversation_memory import CONVERSATION_RAW_MESSAGES
+from supervisor_modules.utils.llm_registry import get_llm
 
 logger = logging.getLogger(__name__)
 
-__all__ = ['build_agent_context', 'format_context_for_agent']
+__all__ = ['build_agent_context', 'build_context_and_route', 'format_context_for_agent']
+
+
+def _format_history(chat_history: List[Dict[str, Any]], conversation_summary: Optional[str] = None) -> str:
+    # 이전 대화 요약이 있으면 요약 + 최근 CONVERSATION_RAW_MESSAGES개, 없으면 최근 대화 8개만 사용
+    lines = [f"이전 대화 요약: {conversation_summary}"] if conversation_summary else []
+    recent = chat_history[-CONVERSATION_RAW_MESSAGES:] if conversation_summary else chat_history[-8:]
+    lines.extend(
+        f"{'사용자' if m.get('role') == 'user' else 'AI'}: {m.get('content', '')}"
+        for m in recent
+    )
+    return "\n".join(lines)
+
 
 @traceable(run_type="chain", name="에이전트 문맥 정보 빌더")
 async def build_agent_context(
@@ -25,6 +39,7 @@ async def build_agent_context(
     chat_history: List[Dict[str, Any]] = None,
     request_id: str = None,
     qdrant_events: str = None,
+    conversation_summary: Optional[str] = None,
 ) -> str:
     """
     Builds context summary information based on user message and chat history.
@@ -34,6 +49,7 @@ async def build_agent_context(
         chat_history: The chat history in the format [{role: "user", content: "..."}, {role: "assistant", content: "..."}].
         request_id: The unique identifier for the current request.
         qdrant_events: Event information from Qdrant.
+        conversation_summary: Rolling summary of messages older than the raw window (conversation_memory).
         
     Returns:
         A JSON string containing context information.
@@ -50,11 +66,7 @@ async def build_agent_context(
     
     logger.info(f"[{request_id}] [build_agent_context] 문맥 정보 생성 시작")
 
-    # 최근 대화 6개만 사용
-    formatted_history = "\n".join(
-        f"{'사용자' if m.get('role') == 'user' else 'AI'}: {m.get('content', '')}"
-        for m in chat_history[-8:]
-    )
+    formatted_history = _format_history(chat_history, conversation_summary)
 
     # 프롬프트 조합
     prompt_text = AGENT_CONTEXT_BUILDING_PROMPT.format(
@@ -67,8 +79,8 @@ async def build_agent_context(
     logger.debug(f"[{request_id}] [build_agent_context] 전체 프롬프트: {prompt_text}")
 
     try:
-        chat_model = ChatOpenAI(model="gpt-4o", temperature=0.2)
-        response = chat_model.invoke([
+        chat_model = get_llm("context")
+        response = await chat_model.ainvoke([
             SystemMessage(content="당신은 문맥 요약 전문가입니다."),
             HumanMessage(content=prompt_text)
         ])
@@ -118,6 +130,67 @@ async def build_agent_context(
         logger.info(f"[{request_id}] [build_agent_context] 소요시간: {duration:.2f}s")
 
 
+class ContextRouting(BaseModel):
+    """문맥 요약 + 카테고리 분류 통합 호출의 구조화 출력"""
+    context_summary: str = Field(description="60자 이내의 문맥 요약, 마침표로 종료")
+    categories: List[Literal["exercise", "food", "schedule", "motivation", "general"]] = Field(
+        description="담당 카테고리 1~2개 (가장 적합한 것부터)"
+    )
+
+
+@traceable(run_type="chain", name="문맥 정보 + 카테고리 통합 빌더")
+async def build_context_and_route(
+    message: str,
+    chat_history: List[Dict[str, Any]] = None,
+    request_id: str = None,
+    qdrant_events: str = None,
+    conversation_summary: Optional[str] = None,
+) -> Tuple[str, List[str], Dict[str, Any]]:
+    """
+    build_agent_context + classify_message를 한 번의 구조화 출력 호출로 처리합니다.
+    (SUPERVISOR_ROUTING_MODE=merged)
+
+    Returns:
+        (context_info JSON 문자열, 카테고리 리스트, 메타데이터)
+        호출이 실패하면 카테고리 리스트가 비어 있으므로 호출 측에서 기존 2회 호출 경로로 재시도해야 합니다.
+    """
+    start_time = time.time()
+    if not request_id:
+        request_id = str(time.time())
+
+    logger.info(f"[{request_id}] [build_context_and_route] 문맥 정보 + 분류 통합 호출 시작")
+
+    prompt_text = AGENT_CONTEXT_ROUTING_PROMPT.format(
+        chat_history=_format_history(chat_history or [], conversation_summary),
+        message=message,
+        qdrant_events=qdrant_events or ""
+    )
+    metadata: Dict[str, Any] = {"model": "gpt-4o", "method": "merged"}
+
+    try:
+        chat_model = get_llm("context_router")
+        structured_model = chat_model.with_structured_output(ContextRouting)
+        result: ContextRouting = await structured_model.ainvoke([
+            SystemMessage(content="당신은 문맥 요약 및 라우팅 전문가입니다."),
+            HumanMessage(content=prompt_text)
+        ])
+
+        # 중복 제거 후 최대 2개
+        categories = list(dict.fromkeys(result.categories))[:2] or ["general"]
+        context_info = json.dumps({"context_summary": str(result.context_summary)}, ensure_ascii=False)
+        logger.info(f"[{request_id}] [build_context_and_route] 분류 결과: {categories}")
+        return context_info, categories, metadata
+
+    except Exception as e:
+        logger.error(f"[{request_id}] [build_context_and_route] 오류 발생: {str(e)}")
+        logger.error(traceback.format_exc())
+        return json.dumps({"context_summary": "문맥 요약 실패"}, ensure_ascii=False), [], {**metadata, "error": str(e)}
+    finally:
+        duration = time.time() - start_time
+        metadata["classification_time"] = duration
+        logger.info(f"[{request_id}] [build_context_and_route] 소요시간: {duration:.2f}s")
+
+
 def format_context_for_agent(context_info: Dict[str, Any], agent_type: str = None) -> str:
     """
     Format context information for a specific agent type.
@@ -0,0 +1,161 @@
+"""
+conversation_memory.py
+- 사용자별 대화 요약을 Redis(chat_summary:{email})에 유지합니다.
+- 문맥 빌더에는 요약 + 최근 CONVERSATION_RAW_MESSAGES개 원문만 넘기므로 대화가 길어져도 프롬프트 크기가 일정합니다.
+- 응답을 저장한 뒤 백그라운드에서, 최근 구간에서 새로 밀려난 메시지만 기존 요약에 합칩니다. (요약 호출 입력 = 기존 요약 + 새로 밀려난 턴)
+  어디까지 합쳤는지는 마지막으로 합친 메시지의 지문("last")으로 기억하므로, 매번 전체 대화를 다시 요약하지 않습니다.
+- 합치기 전에 메시지가 max_history 밖으로 잘려 나갔으면(장애 등으로 요약이 오래 밀린 경우) 남아 있는 것만 합치고 경고를 남깁니다.
+
+CONVERSATION_SUMMARY_ENABLED=false면 요약 없이 예전처럼 최근 8개 원문만 사용합니다.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain.schema.messages import HumanMessage
+
+from chat_history_manager import get_chat_history_manager
+from common_prompts.prompts import CONVERSATION_SUMMARY_PROMPT
+from supervisor_modules.utils.llm_registry import get_llm
+from supervisor_modules.utils.metrics import track_stage
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_SUMMARY_ENABLED = os.getenv("CONVERSATION_SUMMARY_ENABLED", "true").lower() == "true"
+# 요약하지 않고 원문으로 넘기는 최근 메시지 수 (사용자/응답 각각 1개)
+CONVERSATION_RAW_MESSAGES = int(os.getenv("CONVERSATION_RAW_MESSAGES", "6"))
+CONVERSATION_SUMMARY_MAX_CHARS = int(os.getenv("CONVERSATION_SUMMARY_MAX_CHARS", "600"))
+
+# 사용자별 진행 중인 요약 작업 (Task 참조를 잡아 두어 GC로 사라지지 않게 함)
+_tasks: Dict[str, asyncio.Task] = {}
+# 요약 작업 도중 새 턴이 저장된 사용자 → 작업이 끝나면 한 번 더 실행
+_dirty: Set[str] = set()
+
+
+def entry_fingerprint(entry: Dict[str, Any]) -> str:
+    # compact 형식은 시각을 초 단위로 저장하므로 초까지만 사용 (메모리 저장소 → Redis 반영 후에도 같은 값)
+    key = f"{entry.get('role')}|{str(entry.get('timestamp') or '')[:19]}|{entry.get('content', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def select_unfolded(
+    history: List[Dict[str, Any]], last: Optional[str], raw_messages: int = CONVERSATION_RAW_MESSAGES
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    최근 raw_messages개를 뺀 메시지 중 지문 last 이후(아직 요약에 없는) 메시지를 돌려줍니다.
+    Returns: (합칠 메시지, last를 찾지 못해 일부가 요약 없이 잘려 나갔는지)
+    """
+    older = history[:-raw_messages] if raw_messages > 0 else list(history)
+    if last is None:
+        return older, False
+    for index in range(len(history) - 1, -1, -1):
+        if entry_fingerprint(history[index]) == last:
+            return older[index + 1:], False
+    return older, bool(older)
+
+
+def _format_conversation(entries: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f"{'사용자' if m.get('role') == 'user' else 'AI'}: {m.get('content', '')}" for m in entries
+    )
+
+
+async def fold_summary(summary: str, entries: List[Dict[str, Any]]) -> str:
+    """기존 요약에 entries를 합친 새 요약을 만듭니다."""
+    prompt_text = CONVERSATION_SUMMARY_PROMPT.format(
+        max_chars=CONVERSATION_SUMMARY_MAX_CHARS,
+        summary=summary or "(없음)",
+        conversation=_format_conversation(entries),
+    )
+    response = await get_llm("summary").ainvoke([HumanMessage(content=prompt_text)])
+    # 요약이 길어지면 이후 모든 프롬프트가 커지므로 지시를 어긴 응답은 잘라서 저장
+    return response.content.strip()[:CONVERSATION_SUMMARY_MAX_CHARS * 2]
+
+
+async def update_summary(user_id: str) -> bool:
+    """
+    최근 구간에서 밀려났지만 아직 요약에 없는 메시지를 요약에 합칩니다.
+    다른 워커가 먼저 같은 구간을 합쳤으면 저장하지 않습니다. Returns: 요약을 갱신했는지
+    """
+    manager = get_chat_history_manager()
+    history, state = await manager.get_recent_messages_with_summary(user_id, manager.max_history)
+    if not manager.redis_available():
+        # 요약은 Redis에만 저장하므로 장애 중에는 건너뛰고, 복구 후 다음 턴에서 밀린 메시지를 함께 합침
+        return False
+    last = (state or {}).get("last")
+    entries, gap = select_unfolded(history, last)
+    if not entries:
+        return False
+    if gap:
+        logger.warning(f"[conversation_memory] {user_id}: 요약되지 않은 대화 일부가 이미 잘려 나감, 남은 {len(entries)}개만 요약")
+
+    with track_stage("summary_fold"):
+        summary = await fold_summary((state or {}).get("summary", ""), entries)
+    new_state = {
+        "summary": summary,
+        "last": entry_fingerprint(entries[-1]),
+        "folded": (state or {}).get("folded", 0) + len(entries),
+        "updated": int(time.time()),
+    }
+    if not await manager.save_summary(user_id, new_state, expected_last=last):
+        logger.info(f"[conversation_memory] {user_id}: 요약이 이미 갱신되어 저장하지 않음")
+        return False
+    logger.info(f"[conversation_memory] {user_id}: 메시지 {len(entries)}개 요약 반영 (누적 {new_state['folded']}개)")
+    return True
+
+
+async def _run_updates(user_id: str) -> None:
+    try:
+        while True:
+            _dirty.discard(user_id)
+            try:
+                await update_summary(user_id)
+            except Exception as e:
+                logger.error(f"[conversation_memory] {user_id}: 요약 갱신 실패: {e}")
+            if user_id not in _dirty:
+                return
+    finally:
+        _tasks.pop(user_id, None)
+
+
+def schedule_summary_update(user_id: Optional[str]) -> None:
+    """
+    대화 턴을 저장한 직후 호출합니다. 요약은 응답과 별개로 백그라운드에서 진행되며,
+    같은 사용자의 작업이 이미 돌고 있으면 끝난 뒤 한 번 더 실행하도록 표시만 합니다.
+    """
+    if not CONVERSATION_SUMMARY_ENABLED or not user_id:
+        return
+    if user_id in _tasks:
+        _dirty.add(user_id)
+        return
+    # 빈 Context로 실행해 요청의 trace / LLM 사용량 집계에 요약 호출이 섞이지 않게 함
+    _tasks[user_id] = asyncio.create_task(_run_updates(user_id), context=contextvars.Context())
+
+
+async def wait_for_summary_updates(timeout: float = 5.0) -> None:
+    """진행 중인 요약 작업을 timeout까지 기다립니다. (종료 시 호출)"""
+    if _tasks:
+        await asyncio.wait(list(_tasks.values()), timeout=timeout)
+
+
+def format_summary(state: Optional[Dict[str, Any]]) -> Optional[str]:
+    if not CONVERSATION_SUMMARY_ENABLED or not state:
+        return None
+    return state.get("summary") or None
+
+
+__all__ = [
+    "CONVERSATION_RAW_MESSAGES",
+    "CONVERSATION_SUMMARY_ENABLED",
+    "entry_fingerprint",
+    "format_summary",
+    "schedule_summary_update",
+    "select_unfolded",
+    "update_summary",
+    "wait_for_summary_updates",
+]
@@ -0,0 +1,275 @@
+"""
+embedding_service.py
+- SentenceTransformer 질의 임베딩을 워커 프로세스 안에서 모아서 계산하는 서비스
+- 동시에 들어온 encode 요청을 최대 EMBEDDING_BATCH_MAX_WAIT_MS 동안(또는 EMBEDDING_BATCH_MAX_SIZE개가 찰 때까지) 모아
+  전용 스레드에서 한 번의 model.encode(batch)로 처리합니다. 요청마다 1건짜리 forward를 따로 돌리지 않습니다.
+- 같은 질의는 배치 안에서 한 번만 계산하고, 결과 벡터는 크기 제한 LRU(EMBEDDING_CACHE_SIZE)에 보관해 다시 계산하지 않습니다.
+- 모델 호출은 전용 스레드 하나에서만 하므로 torch 연산 스레드 수(EMBEDDING_TORCH_THREADS)가 요청 수만큼 곱해지지 않습니다.
+- 호출 스레드(블로킹 풀의 도구 실행 등)는 결과가 나올 때까지 기다립니다. 이벤트 루프에서는 aencode()를 사용합니다.
+- 배치 스레드는 처음 encode할 때 시작하고, fork 이후(다른 pid)에는 새로 시작합니다. (LRU는 그대로 사용)
+- load_sentence_transformer(): GPU 없는 서버용 CPU 모드. EMBEDDING_QUANTIZE=true면 Linear 층을 torch 동적 int8 양자화하고,
+  EMBEDDING_MAX_SEQ_LENGTH로 입력 토큰 길이를 줄입니다. 저장된 문서 벡터는 fp32 모델로 만든 것이므로
+  켜기 전에 benchmarks.embedding_quantization으로 검색 결과(recall)와 지연 시간을 비교해 정합니다.
+
+사용 예:
+    embedding_service = EmbeddingService("exercise", get_embedding_model)
+    vector = embedding_service.encode("하체 운동 추천")   # numpy 배열 (model.encode 1건 결과와 같은 모양)
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from supervisor_modules.utils.metrics import Counter, Histogram, register_metric, track_stage
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+# 0이면 torch 기본값 (torch.set_num_threads는 프로세스 전체 설정)
+EMBEDDING_TORCH_THREADS = int(os.getenv("EMBEDDING_TORCH_THREADS", "0"))
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true"
+# 0이면 모델 기본값 (all-mpnet-base-v2: 384 토큰)
+EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH", "0"))
+
+EMBEDDING_REQUESTS = register_metric(Counter(
+    "ai_embedding_requests_total",
+    "질의 임베딩 요청 수 (result=hit|miss|error)",
+    ("service", "result"),
+))
+EMBEDDING_BATCH_SIZE = register_metric(Histogram(
+    "ai_embedding_batch_size",
+    "model.encode 1회에 계산한 질의 수",
+    ("service",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+))
+
+_SHUTDOWN = object()
+
+
+def load_sentence_transformer(
+    model_name: str,
+    quantize: bool = EMBEDDING_QUANTIZE,
+    max_seq_length: int = EMBEDDING_MAX_SEQ_LENGTH,
+) -> Any:
+    """
+    SentenceTransformer를 불러옵니다.
+    quantize=True면 CPU에서 Linear 층 가중치를 int8로 바꾸고(활성값은 실행 시 양자화) 연산합니다.
+    max_seq_length > 0이면 그보다 긴 입력은 잘라서 인코딩합니다. (모델 기본값보다 늘리지는 않음)
+    """
+    # sentence_transformers(torch) 임포트만으로도 수 초가 걸리므로 함수 안에서 임포트
+    from sentence_transformers import SentenceTransformer
+
+    started = time.perf_counter()
+    model = SentenceTransformer(model_name, device="cpu" if quantize else None)
+    if max_seq_length > 0:
+        model.max_seq_length = min(max_seq_length, model.max_seq_length)
+    if quantize:
+        import torch
+
+        torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    logger.info(
+        f"임베딩 모델 로딩: {model_name} (int8={quantize}, max_seq_length={model.max_seq_length}, "
+        f"{time.perf_counter() - started:.2f}s)"
+    )
+    return model
+
+
+def _detach(vector: Any) -> Any:
+    if hasattr(vector, "copy"):
+        vector = vector.copy()
+    if hasattr(vector, "setflags"):
+        # 캐시된 배열을 여러 요청이 같이 쓰므로 읽기 전용
+        vector.setflags(write=False)
+    return vector
+
+
+class EmbeddingService:
+    def __init__(
+        self,
+        name: str,
+        model_getter: Callable[[], Any],
+        max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS,
+        cache_size: int = EMBEDDING_CACHE_SIZE,
+        torch_threads: int = EMBEDDING_TORCH_THREADS,
+    ):
+        self.name = name
+        self.model_getter = model_getter
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.cache_size = cache_size
+        self.torch_threads = torch_threads
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stats = {"requests": 0, "hits": 0, "batches": 0, "encoded": 0}
+        self._last_batch_size = 0
+
+    # ---- LRU ----
+    def _cache_get(self, text: str) -> Optional[Any]:
+        with self._cache_lock:
+            self._stats["requests"] += 1
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self._stats["hits"] += 1
+            return vector
+
+    def _cache_put(self, text: str, vector: Any) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[text] = vector
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ---- 배치 스레드 ----
+    def _ensure_started(self) -> queue.Queue:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return self._queue
+        with self._start_lock:
+            if self._pid != pid or self._thread is None or not self._thread.is_alive():
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name=f"embedding-{self.name}", daemon=True
+                )
+                self._pid = pid
+                self._thread.start()
+                logger.info(
+                    f"임베딩 배치 스레드 시작: {self.name} (max_batch={self.max_batch_size}, "
+                    f"max_wait={self.max_wait * 1000:.1f}ms, cache={self.cache_size})"
+                )
+        return self._queue
+
+    def _collect(self, jobs: queue.Queue, first: Tuple[str, Future]) -> List[Tuple[str, Future]]:
+        """
+        첫 요청 이후 max_wait 동안 들어온 요청을 max_batch_size개까지 모읍니다.
+        직전 배치가 1건이었으면(동시 요청이 없던 상태) 기다리지 않고 이미 쌓인 요청만 가져가 단독 호출 지연을 늘리지 않습니다.
+        """
+        batch = [first]
+        deadline = time.monotonic() + (self.max_wait if self._last_batch_size > 1 else 0.0)
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = jobs.get(timeout=remaining) if remaining > 0 else jobs.get_nowait()
+            except queue.Empty:
+                break
+            if item is _SHUTDOWN:
+                jobs.put(_SHUTDOWN)
+                break
+            batch.append(item)
+        return batch
+
+    def _set_torch_threads(self) -> None:
+        if self.torch_threads <= 0:
+            return
+        try:
+            import torch
+        except ImportError:
+            return
+        torch.set_num_threads(self.torch_threads)
+
+    def _run(self, jobs: queue.Queue) -> None:
+        self._set_torch_threads()
+        while True:
+            first = jobs.get()
+            if first is _SHUTDOWN:
+                return
+            batch = self._collect(jobs, first)
+            # 배치 안의 같은 질의는 한 번만 계산
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            self._last_batch_size = len(batch)
+            try:
+                with track_stage("embedding.batch"):
+                    vectors = self.model_getter().encode(texts, batch_size=len(texts))
+            except Exception as e:
+                logger.error(f"[{self.name}] 임베딩 계산 실패 ({len(texts)}건): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self._stats["batches"] += 1
+            self._stats["encoded"] += len(texts)
+            EMBEDDING_BATCH_SIZE.observe(len(texts), service=self.name)
+            # 배치 결과 행렬의 view를 캐시에 두면 행렬 전체가 메모리에 남으므로 행별로 복사
+            by_text = {text: _detach(vector) for text, vector in zip(texts, vectors)}
+            for text, vector in by_text.items():
+                self._cache_put(text, vector)
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+
+    # ---- 공개 API ----
+    def submit(self, text: str) -> Future:
+        """임베딩 계산을 요청하고 Future를 돌려줍니다. (캐시에 있으면 완료된 Future)"""
+        future: Future = Future()
+        vector = self._cache_get(text)
+        if vector is not None:
+            EMBEDDING_REQUESTS.inc(service=self.name, result="hit")
+            future.set_result(vector)
+            return future
+        EMBEDDING_REQUESTS.inc(service=self.name, result="miss")
+        self._ensure_started().put((text, future))
+        return future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> Any:
+        """질의 1건의 임베딩 (동기, 배치 처리가 끝날 때까지 대기)"""
+        with track_stage("embedding"):
+            try:
+                return self.submit(text).result(timeout=timeout)
+            except Exception:
+                EMBEDDING_REQUESTS.inc(service=self.name, result="error")
+                raise
+
+    async def aencode(self, text: str) -> Any:
+        """이벤트 루프에서 사용하는 encode (스레드를 잡지 않고 대기)"""
+        with track_stage("embedding"):
+            try:
+                return await asyncio.wrap_future(self.submit(text))
+            except Exception:
+                EMBEDDING_REQUESTS.inc(service=self.name, result="error")
+                raise
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        stats["cache_entries"] = len(self._cache)
+        stats["avg_batch"] = round(stats["encoded"] / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """배치 스레드를 종료합니다. (대기 중인 요청은 먼저 처리)"""
+        thread, jobs = self._thread, self._queue
+        if thread is None or jobs is None or self._pid != os.getpid():
+            return
+        jobs.put(_SHUTDOWN)
+        thread.join(timeout)
+        self._thread = None
+
+
+__all__ = [
+    "EMBEDDING_BATCH_MAX_SIZE",
+    "EMBEDDING_BATCH_MAX_WAIT_MS",
+    "EMBEDDING_CACHE_SIZE",
+    "EMBEDDING_MAX_SEQ_LENGTH",
+    "EMBEDDING_QUANTIZE",
+    "EMBEDDING_TORCH_THREADS",
+    "EmbeddingService",
+    "load_sentence_transformer",
+]
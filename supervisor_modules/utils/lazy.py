@@ -0,0 +1,112 @@
+"""
+lazy.py
+- ES / Qdrant / Postgres 클라이언트, SentenceTransformer 모델처럼 만들 때 네트워크 연결이나 모델 로딩이 필요한 객체를
+  임포트 시점이 아니라 처음 사용할 때 만드는 헬퍼
+- 모듈 임포트만으로는 외부 서비스에 접속하지 않으므로 워커가 빨리 뜨고, 서비스가 없는 환경에서도 임포트가 실패하지 않습니다.
+- 생성에 실패하면 저장하지 않으므로 다음 호출에서 다시 시도합니다.
+- reset_lazy_resources()는 fork 이후 자식 프로세스에서 부모가 만든 연결을 버릴 때 사용합니다.
+  fork_safe=True(모델처럼 연결이 없는 객체)는 버리지 않으므로, 마스터에서 만들어 두면 워커가 copy-on-write로 공유합니다.
+- warm_lazy_resources()는 시작 단계(supervisor_modules.utils.warmup)에서 객체를 미리 만들고 warmup 함수(더미 인코딩 등)를 실행합니다.
+
+사용 예:
+    @lazy_resource("exercise.elasticsearch")
+    def get_es() -> Elasticsearch:
+        return Elasticsearch(...)
+
+    get_es().search(...)   # 첫 호출에서 생성, 이후 같은 객체
+    get_es.reset()         # 다음 호출에서 다시 생성
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_registry: List[Any] = []
+
+
+def lazy_resource(
+    name: str,
+    fork_safe: bool = False,
+    warmup: Optional[Callable[[Any], None]] = None,
+    warm: bool = True,
+) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    """
+    인자 없는 생성 함수를 '처음 호출할 때 한 번만 생성하는 접근 함수'로 바꿉니다. (스레드 안전)
+
+    Args:
+        fork_safe: 소켓/연결이 없어 fork 이후에도 그대로 써도 되는 객체 (reset_lazy_resources에서 유지)
+        warmup: warm_lazy_resources에서 생성 직후 호출할 함수 (예: 더미 인코딩)
+        warm: False면 warm_lazy_resources에서 미리 만들지 않음 (기능이 꺼져 있는 경우 등)
+    """
+    def decorator(factory: Callable[[], T]) -> Callable[[], T]:
+        lock = threading.Lock()
+        state: Dict[str, Any] = {"value": None, "ready": False}
+
+        @functools.wraps(factory)
+        def accessor() -> T:
+            if state["ready"]:
+                return state["value"]
+            with lock:
+                if not state["ready"]:
+                    started = time.perf_counter()
+                    state["value"] = factory()
+                    state["ready"] = True
+                    logger.info(f"{name} 초기화 완료 ({time.perf_counter() - started:.2f}s)")
+            return state["value"]
+
+        def reset() -> None:
+            with lock:
+                state["value"] = None
+                state["ready"] = False
+
+        accessor.reset = reset
+        accessor.initialized = lambda: state["ready"]
+        accessor.resource_name = name
+        accessor.fork_safe = fork_safe
+        accessor.warmup = warmup
+        accessor.warm = warm
+        _registry.append(accessor)
+        return accessor
+
+    return decorator
+
+
+def reset_lazy_resources(include_fork_safe: bool = False) -> None:
+    """생성된 객체를 버립니다. (fork 이후 자식 프로세스에서 호출, 기본은 fork_safe 객체 유지)"""
+    for accessor in _registry:
+        if include_fork_safe or not accessor.fork_safe:
+            accessor.reset()
+
+
+def warm_lazy_resources(fork_safe: bool) -> Dict[str, Union[float, str]]:
+    """
+    fork_safe가 같은 객체를 모두 미리 만들고 warmup 함수를 실행합니다.
+    Returns: {이름: 소요 초 또는 오류 메시지} (실패해도 다음 객체를 계속 준비하고, 실패한 객체는 첫 사용 때 다시 시도)
+    """
+    report: Dict[str, Union[float, str]] = {}
+    for accessor in list(_registry):
+        if accessor.fork_safe != fork_safe or not accessor.warm:
+            continue
+        started = time.perf_counter()
+        try:
+            value = accessor()
+            if accessor.warmup is not None:
+                accessor.warmup(value)
+            report[accessor.resource_name] = round(time.perf_counter() - started, 3)
+        except Exception as e:
+            logger.warning(f"{accessor.resource_name} 미리 준비 실패 (첫 사용 때 다시 시도): {e}")
+            report[accessor.resource_name] = f"error: {e}"
+    return report
+
+
+def initialized_resources() -> List[str]:
+    return [accessor.resource_name for accessor in _registry if accessor.initialized()]
+
+
+__all__ = ["initialized_resources", "lazy_resource", "reset_lazy_resources", "warm_lazy_resources"]
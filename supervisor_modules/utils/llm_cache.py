@@ -0,0 +1,251 @@
+"""
+llm_cache.py
+- 결정적인(temperature 0 또는 같은 프롬프트가 반복되는) LLM 호출 결과를 Redis에 캐시
+- 캐시 키: 호출 지점(site) + sha256(모델 파라미터 + 렌더링된 메시지)
+- 기본 비활성화(LLM_CACHE_ENABLED=true로 활성화). Redis가 없거나 오류가 나면 그냥 LLM을 호출합니다.
+
+호출 지점별 설정 (환경 변수로 덮어쓰기 가능)
+    LLM_CACHE_TTL_<SITE>          캐시 유지 시간(초). 0이면 해당 지점 캐시 사용 안 함
+    LLM_CACHE_MAX_ENTRIES_<SITE>  지점별 최대 키 수. 초과 시 오래된 키부터 삭제
+    LLM_CACHE_MAX_ENTRY_BYTES     응답 1건의 최대 크기. 초과하는 응답은 저장하지 않음
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from supervisor_modules.utils.blocking import run_blocking
+from supervisor_modules.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_DEFAULT_TTL = int(os.getenv("LLM_CACHE_DEFAULT_TTL", "3600"))
+LLM_CACHE_DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_DEFAULT_MAX_ENTRIES", "10000"))
+LLM_CACHE_MAX_ENTRY_BYTES = int(os.getenv("LLM_CACHE_MAX_ENTRY_BYTES", "32768"))
+
+KEY_PREFIX = "llm_cache"
+
+# 호출 지점별 기본값
+SITE_DEFAULTS: Dict[str, Dict[str, int]] = {
+    # supervisor 카테고리 분류 (문맥 요약이 포함되므로 짧게 유지)
+    "classify": {"ttl": 600, "max_entries": 5000},
+    # lookup_nutrition_tool의 음식명 일치 판단 ("맞습니다/다릅니다")
+    "food_name_match": {"ttl": 7 * 24 * 3600, "max_entries": 20000},
+    # meal_parser_tool의 식사 문장 파싱
+    "meal_parser": {"ttl": 24 * 3600, "max_entries": 20000},
+    # retry_node의 저장 정보 충분성 평가
+    "retry_eval": {"ttl": 3600, "max_entries": 5000},
+}
+
+MessagesInput = Union[str, Sequence[Union[BaseMessage, str]]]
+
+
+def _site_setting(site: str, name: str, default: int) -> int:
+    env_value = os.getenv(f"LLM_CACHE_{name.upper()}_{site.upper()}")
+    if env_value:
+        return int(env_value)
+    return SITE_DEFAULTS.get(site, {}).get(name, default)
+
+
+class CacheStats:
+    """호출 지점별 hit/miss/store/skip/error 카운터 (프로세스 단위)"""
+
+    FIELDS = ("hits", "misses", "stores", "skipped", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def incr(self, site: str, field: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(site, dict.fromkeys(self.FIELDS, 0))
+            counts[field] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {}
+            for site, counts in self._counts.items():
+                lookups = counts["hits"] + counts["misses"]
+                result[site] = {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / lookups, 4) if lookups else 0.0,
+                }
+            return {"enabled": LLM_CACHE_ENABLED, "sites": result}
+
+
+cache_stats = CacheStats()
+
+
+def _normalize_messages(messages: MessagesInput) -> List[Dict[str, Any]]:
+    if isinstance(messages, str):
+        messages = [messages]
+    normalized = []
+    for message in messages:
+        if isinstance(message, BaseMessage):
+            normalized.append({"type": message.type, "content": message.content})
+        else:
+            normalized.append({"type": "human", "content": str(message)})
+    return normalized
+
+
+def _llm_params(llm: Any) -> Dict[str, Any]:
+    """모델 이름, temperature, max_tokens 등 응답에 영향을 주는 파라미터"""
+    try:
+        params = dict(llm._identifying_params)
+    except Exception:
+        params = {"repr": repr(llm)}
+    params["_type"] = type(llm).__name__
+    return params
+
+
+def fingerprint(llm: Any, messages: MessagesInput) -> str:
+    """모델 파라미터와 렌더링된 메시지의 sha256"""
+    payload = json.dumps(
+        {"params": _llm_params(llm), "messages": _normalize_messages(messages)},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_key(site: str, digest: str) -> str:
+    return f"{KEY_PREFIX}:{site}:{digest}"
+
+
+def _index_key(site: str) -> str:
+    return f"{KEY_PREFIX}:{site}:__index__"
+
+
+def _lookup(site: str, key: str) -> Optional[AIMessage]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        raw = client.get(key)
+    except Exception as e:
+        cache_stats.incr(site, "errors")
+        logger.warning(f"LLM 캐시 조회 실패 ({site}): {e}")
+        return None
+    if raw is None:
+        cache_stats.incr(site, "misses")
+        return None
+
+    try:
+        data = json.loads(raw)
+        message = AIMessage(
+            content=data["content"],
+            additional_kwargs=data.get("additional_kwargs", {}),
+            response_metadata={**data.get("response_metadata", {}), "cache": "hit"},
+        )
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # 깨졌거나 형식이 다른 값은 미스로 보고 지운 뒤 LLM을 호출 (다음 저장 때 새 값으로 채움)
+        cache_stats.incr(site, "misses")
+        logger.warning(f"LLM 캐시 값 손상 ({site}), 삭제 후 다시 호출: {type(e).__name__}: {e}")
+        try:
+            client.delete(key)
+            client.zrem(_index_key(site), key)
+        except Exception as e:
+            logger.warning(f"LLM 캐시 손상 키 삭제 실패 ({site}): {e}")
+        return None
+
+    cache_stats.incr(site, "hits")
+    return message
+
+
+def _store(site: str, key: str, response: BaseMessage, ttl: int) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    payload = json.dumps(
+        {
+            "content": response.content,
+            "additional_kwargs": response.additional_kwargs,
+            "response_metadata": {
+                k: v for k, v in getattr(response, "response_metadata", {}).items()
+                if k in ("model_name", "finish_reason")
+            },
+        },
+        ensure_ascii=False,
+        default=str,
+    )
+    if len(payload.encode("utf-8")) > LLM_CACHE_MAX_ENTRY_BYTES:
+        cache_stats.incr(site, "skipped")
+        return
+
+    max_entries = _site_setting(site, "max_entries", LLM_CACHE_DEFAULT_MAX_ENTRIES)
+    index_key = _index_key(site)
+    now = time.time()
+    try:
+        pipe = client.pipeline()
+        pipe.set(key, payload, ex=ttl)
+        pipe.zadd(index_key, {key: now})
+        # 이미 만료된 키는 인덱스에서도 제거
+        pipe.zremrangebyscore(index_key, 0, now - ttl)
+        pipe.zcard(index_key)
+        size = pipe.execute()[-1]
+
+        overflow = size - max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in client.zpopmin(index_key, overflow)]
+            if evicted:
+                client.delete(*evicted)
+        cache_stats.incr(site, "stores")
+    except Exception as e:
+        cache_stats.incr(site, "errors")
+        logger.warning(f"LLM 캐시 저장 실패 ({site}): {e}")
+
+
+def _resolve(site: str, ttl: Optional[int]) -> Optional[int]:
+    """캐시를 사용할 경우 TTL을, 사용하지 않을 경우 None을 반환"""
+    if not LLM_CACHE_ENABLED:
+        return None
+    ttl = ttl if ttl is not None else _site_setting(site, "ttl", LLM_CACHE_DEFAULT_TTL)
+    return ttl if ttl > 0 else None
+
+
+def cached_invoke(llm: Any, messages: MessagesInput, site: str, ttl: Optional[int] = None) -> BaseMessage:
+    """llm.invoke(messages)를 캐시를 거쳐 실행합니다."""
+    ttl = _resolve(site, ttl)
+    if ttl is None:
+        return llm.invoke(messages)
+
+    key = _cache_key(site, fingerprint(llm, messages))
+    cached = _lookup(site, key)
+    if cached is not None:
+        return cached
+
+    response = llm.invoke(messages)
+    _store(site, key, response, ttl)
+    return response
+
+
+async def cached_ainvoke(llm: Any, messages: MessagesInput, site: str, ttl: Optional[int] = None) -> BaseMessage:
+    """llm.ainvoke(messages)를 캐시를 거쳐 실행합니다. (Redis 호출은 블로킹 풀에서 실행)"""
+    ttl = _resolve(site, ttl)
+    if ttl is None:
+        return await llm.ainvoke(messages)
+
+    key = _cache_key(site, fingerprint(llm, messages))
+    cached = await run_blocking(_lookup, site, key)
+    if cached is not None:
+        return cached
+
+    response = await llm.ainvoke(messages)
+    await run_blocking(_store, site, key, response, ttl)
+    return response
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """호출 지점별 캐시 통계"""
+    return cache_stats.snapshot()
+
+
+__all__ = ["SITE_DEFAULTS", "cached_invoke", "cached_ainvoke", "fingerprint", "get_cache_stats"]
@@ -0,0 +1,168 @@
+"""
+llm_registry.py
+- ChatOpenAI 인스턴스를 이름 있는 프로필(model, temperature, timeout ...)로 관리하는 중앙 레지스트리
+- 모든 인스턴스가 프로세스 단위 httpx 연결 풀(동기/비동기)을 공유하므로
+  호출마다 클라이언트 생성·TLS 핸드셰이크를 반복하지 않고 keep-alive 연결을 재사용합니다.
+
+프로필 값은 환경 변수로 덮어쓸 수 있습니다.
+    LLM_PROFILE_<PROFILE>_MODEL / _TEMPERATURE / _TIMEOUT / _MAX_TOKENS
+    예) LLM_PROFILE_ROUTER_MODEL=gpt-4o-mini
+연결 풀 크기: LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE, LLM_HTTP_KEEPALIVE_EXPIRY
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# 프로필 이름 → ChatOpenAI 설정 (기존 각 모듈의 하드코딩 값을 그대로 옮김)
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # Supervisor 기본 모델 (에이전트 공통 model 인자)
+    "supervisor": {"model": "gpt-3.5-turbo", "temperature": 0.7},
+    # 카테고리 분류
+    "router": {"model": "gpt-3.5-turbo", "temperature": 0.0},
+    # 문맥 요약
+    "context": {"model": "gpt-4o", "temperature": 0.2},
+    # 문맥 요약 + 분류 통합 호출 (SUPERVISOR_ROUTING_MODE=merged)
+    "context_router": {"model": "gpt-4o", "temperature": 0.0},
+    # 대화 요약 갱신 (응답 이후 백그라운드)
+    "summary": {"model": "gpt-4o-mini", "temperature": 0.2},
+    # 운동 / PT 일지 / 개인 운동 기록 / 리포트 워크플로우
+    "workflow": {"model": "gpt-4o-mini", "temperature": 0.7},
+    # 식단 에이전트 노드
+    "food": {"model": "gpt-4o-mini", "temperature": 0.7},
+    # 일정 에이전트
+    "schedule": {"model": "gpt-4o-mini", "temperature": 0.0, "streaming": True},
+    # 동기부여 에이전트 (감정 분석 + 응답 통합)
+    "motivation": {"model": "gpt-3.5-turbo", "temperature": 0.7, "max_tokens": 1000, "streaming": True},
+    "motivation_backup": {"model": "gpt-3.5-turbo", "temperature": 0.2},
+    "motivation_response": {"model": "gpt-3.5-turbo", "temperature": 0.7, "max_tokens": 500},
+    "motivation_system": {"model": "gpt-3.5-turbo", "temperature": 0.5, "max_tokens": 300},
+    # 감정 분석 도구
+    "emotion": {"model": "gpt-3.5-turbo", "temperature": 0.3},
+    # 인사이트/의미 검색 기반 응답 생성
+    "insights": {"model": "gpt-3.5-turbo", "temperature": 0.7},
+}
+
+# get_llm이 잠금을 잡은 채 get_http_client를 호출하므로 재진입 가능한 잠금 사용
+_lock = threading.RLock()
+_llms: Dict[Tuple, ChatOpenAI] = {}
+_sync_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """동기 호출(invoke)용 공유 httpx 클라이언트"""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(limits=_limits(), timeout=LLM_TIMEOUT)
+    return _sync_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """비동기 호출(ainvoke)용 공유 httpx 클라이언트"""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(limits=_limits(), timeout=LLM_TIMEOUT)
+    return _async_client
+
+
+def resolve_profile(profile: str) -> Dict[str, Any]:
+    """프로필 기본값에 환경 변수 덮어쓰기를 적용한 설정을 반환합니다."""
+    if profile not in PROFILES:
+        raise KeyError(f"알 수 없는 LLM 프로필: {profile}")
+    config = {"timeout": LLM_TIMEOUT, **PROFILES[profile]}
+    prefix = f"LLM_PROFILE_{profile.upper()}_"
+    if os.getenv(prefix + "MODEL"):
+        config["model"] = os.getenv(prefix + "MODEL")
+    if os.getenv(prefix + "TEMPERATURE"):
+        config["temperature"] = float(os.getenv(prefix + "TEMPERATURE"))
+    if os.getenv(prefix + "TIMEOUT"):
+        config["timeout"] = float(os.getenv(prefix + "TIMEOUT"))
+    if os.getenv(prefix + "MAX_TOKENS"):
+        config["max_tokens"] = int(os.getenv(prefix + "MAX_TOKENS"))
+    return config
+
+
+def get_llm(profile: str, **overrides: Any) -> ChatOpenAI:
+    """
+    프로필에 해당하는 ChatOpenAI를 반환합니다.
+    같은 프로필(+같은 overrides)은 프로세스 동안 같은 인스턴스를 재사용합니다.
+    """
+    key = (profile, tuple(sorted(overrides.items())))
+    llm = _llms.get(key)
+    if llm is not None:
+        return llm
+
+    with _lock:
+        llm = _llms.get(key)
+        if llm is None:
+            config = {**resolve_profile(profile), **overrides}
+            llm = ChatOpenAI(
+                max_retries=LLM_MAX_RETRIES,
+                http_client=get_http_client(),
+                http_async_client=get_async_http_client(),
+                **config,
+            )
+            _llms[key] = llm
+            logger.info(f"LLM 프로필 '{profile}' 생성: {config}")
+    return llm
+
+
+def open_connection_count() -> int:
+    """
+    공유 httpx 풀에 열려 있는 연결 수
+    gunicorn preload 마스터는 LLM을 호출하지 않으므로 fork 전에 0이어야 합니다.
+    (모듈/생성자에서 만든 ChatOpenAI가 같은 클라이언트를 잡고 있으므로 fork 이후 클라이언트를 바꾸지 않고 그대로 씀)
+    """
+    count = 0
+    for client in (_sync_client, _async_client):
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        count += len(getattr(pool, "connections", None) or [])
+    return count
+
+
+def reset_clients() -> None:
+    """
+    캐시된 LLM과 연결 풀을 버립니다. (테스트 / 이벤트 루프가 바뀐 경우)
+    이미 만들어 둔 ChatOpenAI(모듈 변수, 에이전트 속성)는 기존 클라이언트를 계속 쓰므로 fork 이후 처리에는 사용하지 않습니다.
+    """
+    global _sync_client, _async_client
+    with _lock:
+        _llms.clear()
+        _sync_client = None
+        _async_client = None
+
+
+__all__ = [
+    "PROFILES",
+    "get_llm",
+    "get_http_client",
+    "get_async_http_client",
+    "open_connection_count",
+    "resolve_profile",
+    "reset_clients",
+]
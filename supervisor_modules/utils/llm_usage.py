@@ -0,0 +1,247 @@
+"""
+llm_usage.py
+- 모든 LangChain/OpenAI 호출의 모델, 프롬프트/완성 토큰 수, 지연 시간, 호출 위치(에이전트/LangGraph 노드)를 기록
+- 요청 단위(request_id)로 집계하여 로그, /metrics, ChatResponse.debug(선택)로 노출합니다.
+- 스트리밍 호출처럼 응답에 usage가 없으면 tiktoken으로 추정합니다. (estimated=True)
+
+사용 예)
+    with track_usage(request_id) as usage:
+        await supervisor.process(...)
+    logger.info(usage.summary())
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from supervisor_modules.utils.metrics import Counter, current_labels, register_metric
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - requirements.txt에 포함되어 있음
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+LLM_USAGE_ENABLED = os.getenv("LLM_USAGE_ENABLED", "true").lower() == "true"
+
+# 모델별 USD 단가 (100만 토큰당 입력, 출력). 모델 이름의 접두어로 찾으므로 긴 이름을 먼저 둠
+PRICING_PER_MILLION: List[Tuple[str, float, float]] = [
+    ("gpt-4o-mini", 0.15, 0.60),
+    ("gpt-4o", 2.50, 10.00),
+    ("gpt-4-turbo", 10.00, 30.00),
+    ("gpt-3.5-turbo", 0.50, 1.50),
+]
+
+LLM_CALLS = register_metric(Counter("ai_llm_calls_total", "LLM 호출 수", ("model", "agent", "site")))
+LLM_TOKENS = register_metric(Counter("ai_llm_tokens_total", "LLM 토큰 수 (kind=prompt|completion)", ("model", "kind", "agent")))
+LLM_COST = register_metric(Counter("ai_llm_cost_usd_total", "LLM 추정 비용 (USD)", ("model", "agent")))
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    for prefix, prompt_price, completion_price in PRICING_PER_MILLION:
+        if model.startswith(prefix):
+            return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+    return 0.0
+
+
+_encodings: Dict[str, Any] = {}
+
+
+def count_tokens(text: str, model: str) -> int:
+    """tiktoken으로 토큰 수를 셉니다. 인코딩을 불러올 수 없으면 UTF-8 바이트 수 기준으로 근사합니다."""
+    if not text:
+        return 0
+    if tiktoken is not None:
+        encoding = _encodings.get(model)
+        if encoding is None:
+            try:
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.debug(f"tiktoken 인코딩 로드 실패 ({model}): {e}")
+                encoding = False
+            _encodings[model] = encoding
+        if encoding:
+            return len(encoding.encode(text))
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+class UsageTracker:
+    """요청 하나에서 발생한 LLM 호출 기록"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.calls.append(record)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self.calls)
+
+        by_site: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            key = f"{call['agent']}/{call['site']}"
+            site = by_site.setdefault(key, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency": 0.0})
+            site["calls"] += 1
+            site["prompt_tokens"] += call["prompt_tokens"]
+            site["completion_tokens"] += call["completion_tokens"]
+            site["latency"] = round(site["latency"] + call["latency"], 3)
+
+        return {
+            "request_id": self.request_id,
+            "calls": len(calls),
+            "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+            "completion_tokens": sum(c["completion_tokens"] for c in calls),
+            "cost_usd": round(sum(c["cost_usd"] for c in calls), 6),
+            "llm_latency": round(sum(c["latency"] for c in calls), 3),
+            "estimated": any(c["estimated"] for c in calls),
+            "by_site": by_site,
+        }
+
+
+_current_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("llm_usage_tracker", default=None)
+
+
+@contextmanager
+def track_usage(request_id: str) -> Iterator[UsageTracker]:
+    """블록 안의 모든 LLM 호출을 request_id 기준으로 집계합니다."""
+    tracker = UsageTracker(request_id)
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+
+def current_usage() -> Optional[UsageTracker]:
+    return _current_tracker.get()
+
+
+def _messages_text(messages: List[List[Any]]) -> str:
+    parts = []
+    for batch in messages:
+        for message in batch:
+            content = getattr(message, "content", message)
+            parts.append(content if isinstance(content, str) else str(content))
+    return "\n".join(parts)
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """LLM 호출의 토큰/지연 시간을 현재 요청의 UsageTracker와 지표에 기록하는 콜백 핸들러"""
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, prompt_text: str, metadata: Optional[Dict[str, Any]], name: Optional[str]) -> None:
+        metadata = metadata or {}
+        with self._lock:
+            self._runs[run_id] = {
+                "started": time.perf_counter(),
+                "tracker": _current_tracker.get(),
+                "agent": current_labels()["agent"],
+                "site": metadata.get("langgraph_node") or name or "direct",
+                "model": metadata.get("ls_model_name", "unknown"),
+                "prompt_text": prompt_text,
+            }
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, _messages_text(messages), metadata, kwargs.get("name"))
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        self._start(run_id, "\n".join(prompts), metadata, kwargs.get("name"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        llm_output = getattr(response, "llm_output", None) or {}
+        model = llm_output.get("model_name") or run["model"]
+        prompt_tokens, completion_tokens = self._usage_from_response(response, llm_output)
+        estimated = prompt_tokens is None
+        if estimated:
+            completion_text = "".join(
+                generation.text for generations in response.generations for generation in generations
+            )
+            prompt_tokens = count_tokens(run["prompt_text"], model)
+            completion_tokens = count_tokens(completion_text, model)
+
+        record = {
+            "model": model,
+            "agent": run["agent"],
+            "site": run["site"],
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency": round(time.perf_counter() - run["started"], 3),
+            "cost_usd": estimate_cost(model, prompt_tokens, completion_tokens),
+            "estimated": estimated,
+        }
+        if run["tracker"] is not None:
+            run["tracker"].add(record)
+
+        LLM_CALLS.inc(model=model, agent=run["agent"], site=run["site"])
+        LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt", agent=run["agent"])
+        LLM_TOKENS.inc(completion_tokens, model=model, kind="completion", agent=run["agent"])
+        LLM_COST.inc(record["cost_usd"], model=model, agent=run["agent"])
+
+    @staticmethod
+    def _usage_from_response(response: Any, llm_output: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+        token_usage = llm_output.get("token_usage")
+        if token_usage and token_usage.get("prompt_tokens") is not None:
+            return token_usage["prompt_tokens"], token_usage.get("completion_tokens", 0)
+
+        prompt_tokens = completion_tokens = 0
+        found = False
+        for generations in getattr(response, "generations", []):
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    found = True
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+        if found:
+            return prompt_tokens, completion_tokens
+        return None, None
+
+
+# 모든 LangChain 실행에 사용량 핸들러를 자동으로 붙임
+_usage_handler_var: ContextVar[Optional[UsageCallbackHandler]] = ContextVar(
+    "llm_usage_callback_handler",
+    default=UsageCallbackHandler() if LLM_USAGE_ENABLED else None,
+)
+register_configure_hook(_usage_handler_var, inheritable=True)
+
+
+__all__ = [
+    "UsageTracker",
+    "track_usage",
+    "current_usage",
+    "count_tokens",
+    "estimate_cost",
+    "UsageCallbackHandler",
+]
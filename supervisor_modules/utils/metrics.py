@@ -0,0 +1,437 @@
+"""
+metrics.py
+- 파이프라인 단계별 지연 시간 히스토그램과 오류/폴백 카운터를 모아 Prometheus 텍스트 형식으로 노출 (/metrics)
+- endpoint / agent 라벨은 ContextVar로 전파되므로 Supervisor → 에이전트 → LangGraph 노드 → 도구까지
+  인자를 추가하지 않고 같은 라벨로 기록됩니다.
+- LangGraph 노드, 도구, LLM 호출은 LangChain 콜백(configure hook)으로 자동 기록하고,
+  외부 클라이언트(requests, Elasticsearch, Qdrant, Redis, psycopg2)는 instrument_clients()로 계측합니다.
+
+값은 워커 프로세스 단위로 집계됩니다. (gunicorn 멀티 워커에서는 워커별로 수집)
+"""
+
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from supervisor_modules.utils.tracing import span as trace_span
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_INSTRUMENT_CLIENTS = os.getenv("METRICS_INSTRUMENT_CLIENTS", "true").lower() == "true"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_endpoint_var: ContextVar[str] = ContextVar("metrics_endpoint", default="none")
+_agent_var: ContextVar[str] = ContextVar("metrics_agent", default="none")
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "none")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key → [버킷별 카운트..., +Inf 카운트, 합계]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "none")) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                cumulative += state[len(self.buckets)]
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {state[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class CallbackGauge:
+    """출력할 때마다 func()가 돌려준 {라벨 값: 값}을 게이지로 내보냅니다. (저장소 크기 등 현재 상태 값)"""
+
+    def __init__(self, name: str, documentation: str, labelname: str, func: Callable[[], Dict[str, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelname = labelname
+        self.func = func
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted(self.func().items()):
+            lines.append(f"{self.name}{_format_labels((self.labelname,), (str(key),))} {value}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "ai_stage_duration_seconds",
+    "파이프라인 단계별 소요 시간 (초)",
+    ("stage", "endpoint", "agent"),
+)
+STAGE_ERRORS = Counter(
+    "ai_stage_errors_total",
+    "단계별 오류 수",
+    ("stage", "endpoint", "agent"),
+)
+FALLBACKS = Counter(
+    "ai_fallbacks_total",
+    "폴백 발생 수 (로컬 라우터→LLM, merged→two_call, Qdrant 마감 초과 등)",
+    ("kind", "endpoint"),
+)
+
+_METRICS: List[Any] = [STAGE_SECONDS, STAGE_ERRORS, FALLBACKS]
+
+
+def register_metric(metric: Any) -> Any:
+    """다른 모듈에서 만든 Counter/Histogram/CallbackGauge를 /metrics 출력에 추가합니다."""
+    _METRICS.append(metric)
+    return metric
+
+
+def current_labels() -> Dict[str, str]:
+    return {"endpoint": _endpoint_var.get(), "agent": _agent_var.get()}
+
+
+@contextmanager
+def metrics_labels(endpoint: Optional[str] = None, agent: Optional[str] = None) -> Iterator[None]:
+    """블록 안에서 기록되는 모든 지표의 endpoint / agent 라벨을 지정합니다."""
+    tokens = []
+    if endpoint is not None:
+        tokens.append((_endpoint_var, _endpoint_var.set(endpoint)))
+    if agent is not None:
+        tokens.append((_agent_var, _agent_var.set(agent)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class StageCollector:
+    """collect_stages() 블록 안에서 기록된 단계별 호출 수/누적 시간 (요청 단위 분석용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {"count": int(count), "seconds": round(total, 4)}
+                for stage, (count, total) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+            }
+
+
+_collector_var: ContextVar[Optional[StageCollector]] = ContextVar("metrics_stage_collector", default=None)
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageCollector]:
+    """블록 안(하위 Task / run_blocking 스레드 포함)에서 기록되는 단계 시간을 따로 모읍니다."""
+    collector = StageCollector()
+    token = _collector_var.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector_var.reset(token)
+
+
+def observe_stage(stage: str, seconds: float, error: bool = False, labels: Optional[Dict[str, str]] = None) -> None:
+    if not METRICS_ENABLED:
+        return
+    collector = _collector_var.get()
+    if collector is not None:
+        collector.add(stage, seconds)
+    labels = labels or current_labels()
+    STAGE_SECONDS.observe(seconds, stage=stage, **labels)
+    if error:
+        STAGE_ERRORS.inc(stage=stage, **labels)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """블록 실행 시간을 stage 히스토그램에 기록하고, 예외가 나면 오류 카운터도 올립니다. (trace 중이면 같은 이름의 span도 기록)"""
+    started = time.perf_counter()
+    error = False
+    try:
+        with trace_span(stage, kind="stage"):
+            yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - started, error=error)
+
+
+def timed(stage: str) -> Callable:
+    """함수(동기/비동기) 전체 실행 시간을 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with track_stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_fallback(kind: str) -> None:
+    if METRICS_ENABLED:
+        FALLBACKS.inc(kind=kind, endpoint=_endpoint_var.get())
+
+
+def record_error(stage: str) -> None:
+    """예외를 삼키는 경로에서 오류만 기록할 때 사용"""
+    if METRICS_ENABLED:
+        STAGE_ERRORS.inc(stage=stage, **current_labels())
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """LangGraph 노드(node.*), 도구(tool.*), LLM 호출(llm.*) 실행 시간을 기록하는 콜백 핸들러"""
+
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, float, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, stage: str) -> None:
+        with self._lock:
+            self._runs[run_id] = (stage, time.perf_counter(), current_labels())
+
+    def _end(self, run_id: UUID, error: bool = False) -> None:
+        with self._lock:
+            entry = self._runs.pop(run_id, None)
+        if entry is not None:
+            stage, started, labels = entry
+            observe_stage(stage, time.perf_counter() - started, error=error, labels=labels)
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID,
+                       metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 내부 Runnable도 같은 metadata를 물려받으므로 노드 자체 실행만 기록
+        if node and kwargs.get("name") == node and not node.startswith("__"):
+            self._start(run_id, f"node.{node}")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=True)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "unknown")
+        self._start(run_id, f"tool.{name}")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=True)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        model = (metadata or {}).get("ls_model_name", "unknown")
+        self._start(run_id, f"llm.{model}")
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        model = (metadata or {}).get("ls_model_name", "unknown")
+        self._start(run_id, f"llm.{model}")
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=True)
+
+
+# 모든 LangChain 실행에 지표 핸들러를 자동으로 붙임 (기본값이 있으므로 별도 설정 불필요)
+_metrics_handler_var: ContextVar[Optional[MetricsCallbackHandler]] = ContextVar(
+    "metrics_callback_handler",
+    default=MetricsCallbackHandler() if METRICS_ENABLED else None,
+)
+register_configure_hook(_metrics_handler_var, inheritable=True)
+
+
+def _wrap_method(owner: Any, attr: str, stage: str) -> None:
+    original = getattr(owner, attr, None)
+    if original is None or getattr(original, "_metrics_wrapped", False):
+        return
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        with track_stage(stage):
+            return original(*args, **kwargs)
+
+    wrapper._metrics_wrapped = True
+    setattr(owner, attr, wrapper)
+
+
+_instrumented = False
+
+
+def instrument_clients() -> None:
+    """
+    외부 I/O 클라이언트 메서드를 감싸 호출 시간을 기록합니다. (앱 시작 시 1회)
+    - requests (Spring 백엔드 등 HTTP 호출) → http.request
+    - Elasticsearch.search → es.search
+    - QdrantClient.search / query_points → qdrant.search
+    - Redis.execute_command → redis.command
+    - psycopg2.connect로 만든 연결의 기본 커서 → db.query
+    """
+    global _instrumented
+    if _instrumented or not (METRICS_ENABLED and METRICS_INSTRUMENT_CLIENTS):
+        return
+    _instrumented = True
+
+    try:
+        import requests
+        _wrap_method(requests.sessions.Session, "request", "http.request")
+    except ImportError:
+        pass
+
+    try:
+        from elasticsearch import Elasticsearch
+        _wrap_method(Elasticsearch, "search", "es.search")
+    except ImportError:
+        pass
+
+    try:
+        from qdrant_client import QdrantClient
+        _wrap_method(QdrantClient, "search", "qdrant.search")
+        _wrap_method(QdrantClient, "query_points", "qdrant.search")
+    except ImportError:
+        pass
+
+    try:
+        import redis
+        _wrap_method(redis.Redis, "execute_command", "redis.command")
+    except ImportError:
+        pass
+
+    try:
+        import psycopg2
+        import psycopg2.extensions
+
+        class TimedCursor(psycopg2.extensions.cursor):
+            def execute(self, query, vars=None):
+                with track_stage("db.query"):
+                    return super().execute(query, vars)
+
+        original_connect = psycopg2.connect
+        if not getattr(original_connect, "_metrics_wrapped", False):
+            @functools.wraps(original_connect)
+            def connect(*args, **kwargs):
+                # cursor_factory를 직접 지정한 연결(RealDictCursor 등)은 그대로 둠
+                kwargs.setdefault("cursor_factory", TimedCursor)
+                return original_connect(*args, **kwargs)
+
+            connect._metrics_wrapped = True
+            psycopg2.connect = connect
+    except ImportError:
+        pass
+
+    logger.info("외부 클라이언트 지표 계측 완료")
+
+
+__all__ = [
+    "METRICS_ENABLED",
+    "Counter",
+    "Histogram",
+    "CallbackGauge",
+    "metrics_labels",
+    "current_labels",
+    "track_stage",
+    "collect_stages",
+    "StageCollector",
+    "timed",
+    "observe_stage",
+    "record_fallback",
+    "record_error",
+    "render_metrics",
+    "register_metric",
+    "instrument_clients",
+    "MetricsCallbackHandler",
+]
@@ -0,0 +1,280 @@
+"""
+profiling.py
+- 관리자 요청 하나만 프로파일러로 실행하고 결과를 요청 ID별 파일로 남깁니다. (운영 환경에서 특정 요청이 느린 원인 확인용)
+- 요청 헤더 `X-Profile: 1`(또는 쿼리 `?profile=1`)과 `X-Admin-Token: <PROFILING_ADMIN_TOKEN>`이 함께 있을 때만 동작합니다.
+  토큰이 설정되지 않았으면 항상 꺼져 있습니다.
+- 프로파일러
+  - pyinstrument(설치 시 기본): 샘플링 방식, async 모드로 이 요청의 코루틴만 기록하고 await 대기 시간을 구분해 보여줌
+    → {id}.html (호출 트리), {id}.speedscope.json (https://www.speedscope.app 플레임그래프)
+  - cProfile(PROFILER=cprofile 또는 pyinstrument 미설치 시): 결정적 방식, {id}.pstats (snakeviz 등으로 확인)
+    이벤트 루프 스레드 전체를 기록하므로 동시에 처리 중인 다른 요청도 섞일 수 있음
+- 두 프로파일러 모두 이벤트 루프 스레드만 보므로, 이 요청이 블로킹 스레드 풀(run_blocking, asyncio.to_thread,
+  LangGraph 동기 노드)에 넘긴 작업은 작업마다 그 스레드에서 cProfile로 따로 기록해 합칩니다.
+  (현재 프로파일은 ContextVar로 스레드 풀 작업에 전달, blocking.get_blocking_executor 참고)
+  → cProfile이면 {id}.pstats에 합치고, pyinstrument면 {id}.threads.pstats로 저장
+- {id}.json 요약: 전체 시간, 이벤트 루프 / 스레드 풀 CPU 시간, 단계별(LLM, DB, ES, Qdrant, Redis, HTTP, 노드, 도구) 누적 시간
+  → 파이썬 처리 / 블로킹 I/O / 모델 대기 중 어디에 시간이 쓰였는지 바로 비교
+"""
+
+import cProfile
+import functools
+import hmac
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from supervisor_modules.utils.metrics import collect_stages
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:
+    SamplingProfiler = None
+    SpeedscopeRenderer = None
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "profiles"))
+PROFILER = os.getenv("PROFILER", "auto").lower()  # auto | pyinstrument | cprofile
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+# 요청 단위 결과를 이 개수만 남기고 오래된 것부터 삭제
+PROFILE_MAX_REQUESTS = int(os.getenv("PROFILE_MAX_REQUESTS", "100"))
+
+# 외부 클라이언트 호출 단계 (metrics.instrument_clients)
+IO_STAGES = ("db.query", "es.search", "qdrant.search", "redis.command", "http.request")
+
+T = TypeVar("T")
+
+# cProfile은 스레드당 하나만 활성화할 수 있음
+_cprofile_lock = threading.Lock()
+
+# 프로파일링 중인 요청 (스레드 풀 작업은 제출할 때의 컨텍스트에서 꺼내 사용)
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+def profiling_available() -> bool:
+    return bool(PROFILING_ADMIN_TOKEN)
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return bool(PROFILING_ADMIN_TOKEN) and hmac.compare_digest(token or "", PROFILING_ADMIN_TOKEN)
+
+
+def profiling_requested(request: Any) -> bool:
+    """요청이 프로파일링을 요청했고 관리자 토큰이 맞는지 확인합니다. (FastAPI/Starlette Request)"""
+    flag = request.headers.get("x-profile") or request.query_params.get("profile") or ""
+    if flag.lower() not in ("1", "true", "yes"):
+        return False
+    if not is_admin(request.headers.get("x-admin-token")):
+        logger.warning(f"프로파일링 요청 거부 (관리자 토큰 불일치 또는 미설정): {request.url.path}")
+        return False
+    return True
+
+
+class RequestProfile:
+    """진행 중인 요청 프로파일. annotate()로 요약에 정보를 덧붙일 수 있습니다."""
+
+    def __init__(self, request_id: str, label: str):
+        self.request_id = request_id
+        self.label = label
+        self.profiler_name = ""
+        self.artifacts: List[str] = []
+        self.annotations: Dict[str, Any] = {}
+        self.summary: Dict[str, Any] = {}
+        self.thread_profiles: List[cProfile.Profile] = []
+        self.thread_calls = 0
+        self.thread_cpu = 0.0
+        # 요청이 끝난 뒤에 끝난 스레드 풀 작업 (결과에 합치지 못함)
+        self.late_thread_calls = 0
+        self._thread_lock = threading.Lock()
+        self._finished = False
+
+    def annotate(self, **info: Any) -> None:
+        self.annotations.update(info)
+
+    def run_in_thread(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """스레드 풀 작업을 그 스레드의 cProfile로 기록하고 CPU 시간과 함께 이 요청에 모읍니다."""
+        profiler = cProfile.Profile()
+        cpu_started = time.thread_time()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            cpu = time.thread_time() - cpu_started
+            with self._thread_lock:
+                if self._finished:
+                    self.late_thread_calls += 1
+                else:
+                    self.thread_calls += 1
+                    self.thread_cpu += cpu
+                    self.thread_profiles.append(profiler)
+
+    def finish_threads(self) -> List[cProfile.Profile]:
+        """결과 저장 직전에 호출합니다. 이후 끝나는 스레드 풀 작업은 late_thread_calls로만 셉니다."""
+        with self._thread_lock:
+            self._finished = True
+            return list(self.thread_profiles)
+
+
+def bind_current_profile(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    현재 컨텍스트의 요청이 프로파일링 중이면 func를 스레드 풀에서 프로파일링하며 실행하도록 감쌉니다.
+    스레드 풀에 작업을 넘기는 쪽(이벤트 루프 스레드)에서 호출해야 합니다.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return func
+    return functools.partial(profile.run_in_thread, func)
+
+
+def _choose_profiler() -> str:
+    if PROFILER == "cprofile" or SamplingProfiler is None:
+        return "cprofile"
+    return "pyinstrument"
+
+
+def _summarize(profile: RequestProfile, wall: float, cpu: float, stages: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    llm_seconds = sum(v["seconds"] for k, v in stages.items() if k.startswith("llm."))
+    io_seconds = sum(v["seconds"] for k, v in stages.items() if k in IO_STAGES)
+    return {
+        "request_id": profile.request_id,
+        "label": profile.label,
+        "profiler": profile.profiler_name,
+        "finished_at": datetime.now().isoformat(),
+        "wall_seconds": round(wall, 4),
+        # 이벤트 루프 스레드에서 쓴 CPU 시간 (프롬프트 구성, JSON, 정규식 등)
+        "loop_thread_cpu_seconds": round(cpu, 4),
+        # 블로킹 스레드 풀 작업 (동기 노드, 도구, DB 호출 등)의 수와 CPU 시간. 호출 트리는 pstats 결과에 포함
+        "pool_thread_calls": profile.thread_calls,
+        "pool_thread_cpu_seconds": round(profile.thread_cpu, 4),
+        # 요청이 끝난 뒤에도 실행 중이던 스레드 풀 작업 수 (위 값과 pstats에 포함되지 않음)
+        "pool_thread_late_calls": profile.late_thread_calls,
+        # 병렬 실행(fan-out, 스레드 풀)이 있으면 합계가 전체 시간보다 클 수 있음
+        "llm_seconds": round(llm_seconds, 4),
+        "client_io_seconds": round(io_seconds, 4),
+        "stages": stages,
+        "artifacts": profile.artifacts,
+        **profile.annotations,
+    }
+
+
+def _prune(directory: Path) -> None:
+    summaries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    summaries = [p for p in summaries if not p.name.endswith(".speedscope.json")]
+    for summary in summaries[:-PROFILE_MAX_REQUESTS] if PROFILE_MAX_REQUESTS > 0 else []:
+        stem = summary.name[: -len(".json")]
+        for path in directory.glob(f"{stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+@contextmanager
+def profile_request(request_id: str, label: str, enabled: bool = True) -> Iterator[Optional[RequestProfile]]:
+    """
+    블록 실행을 프로파일링하고 PROFILE_DIR에 결과를 저장합니다. enabled=False면 아무 일도 하지 않습니다.
+
+        with profile_request(request_id, "/chat", profiling_requested(request)) as profile:
+            ...
+    """
+    if not enabled:
+        yield None
+        return
+
+    profile = RequestProfile(request_id, label)
+    profile.profiler_name = _choose_profiler()
+    sampler = None
+    deterministic = None
+    if profile.profiler_name == "pyinstrument":
+        sampler = SamplingProfiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+        sampler.start()
+    elif _cprofile_lock.acquire(blocking=False):
+        deterministic = cProfile.Profile()
+        deterministic.enable()
+    else:
+        logger.warning(f"[{request_id}] 다른 요청을 cProfile로 프로파일링 중이라 이벤트 루프 스레드는 단계 요약만 기록합니다.")
+        profile.profiler_name = "none"
+
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    token = _current_profile.set(profile)
+    try:
+        with collect_stages() as collector:
+            yield profile
+    finally:
+        _current_profile.reset(token)
+        wall = time.perf_counter() - started
+        cpu = time.thread_time() - cpu_started
+        if sampler is not None:
+            sampler.stop()
+        if deterministic is not None:
+            deterministic.disable()
+            _cprofile_lock.release()
+        thread_profiles = profile.finish_threads()
+
+        try:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            stem = f"{datetime.now():%Y%m%d_%H%M%S}_{request_id}"
+            if sampler is not None:
+                (PROFILE_DIR / f"{stem}.html").write_text(sampler.output_html(), encoding="utf-8")
+                (PROFILE_DIR / f"{stem}.speedscope.json").write_text(
+                    sampler.output(renderer=SpeedscopeRenderer()), encoding="utf-8"
+                )
+                profile.artifacts += [f"{stem}.html", f"{stem}.speedscope.json"]
+            if deterministic is not None:
+                # 이벤트 루프 스레드 + 스레드 풀 작업을 하나의 pstats로 합침
+                stats = pstats.Stats(deterministic)
+                for thread_profile in thread_profiles:
+                    stats.add(thread_profile)
+                stats.dump_stats(str(PROFILE_DIR / f"{stem}.pstats"))
+                profile.artifacts.append(f"{stem}.pstats")
+            elif thread_profiles:
+                stats = pstats.Stats(thread_profiles[0])
+                for thread_profile in thread_profiles[1:]:
+                    stats.add(thread_profile)
+                stats.dump_stats(str(PROFILE_DIR / f"{stem}.threads.pstats"))
+                profile.artifacts.append(f"{stem}.threads.pstats")
+
+            profile.summary = _summarize(profile, wall, cpu, collector.snapshot())
+            (PROFILE_DIR / f"{stem}.json").write_text(
+                json.dumps(profile.summary, ensure_ascii=False, indent=2, default=str), encoding="utf-8"
+            )
+            _prune(PROFILE_DIR)
+            logger.info(
+                f"[{request_id}] 프로파일 저장 ({profile.profiler_name}): {stem} "
+                f"(전체 {wall:.2f}s, 루프 CPU {cpu:.2f}s, 스레드 풀 CPU {profile.thread_cpu:.2f}s, LLM {profile.summary['llm_seconds']:.2f}s, "
+                f"I/O {profile.summary['client_io_seconds']:.2f}s)"
+            )
+        except Exception as e:
+            logger.error(f"[{request_id}] 프로파일 저장 실패: {e}")
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """저장된 요청 프로파일 요약 목록 (최신순)"""
+    if not PROFILE_DIR.exists():
+        return []
+    summaries = [p for p in PROFILE_DIR.glob("*.json") if not p.name.endswith(".speedscope.json")]
+    result = []
+    for path in sorted(summaries, key=lambda p: p.stat().st_mtime, reverse=True):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        result.append({k: data.get(k) for k in ("request_id", "label", "profiler", "finished_at", "wall_seconds", "artifacts")})
+    return result
+
+
+def profile_artifact_path(name: str) -> Optional[Path]:
+    """다운로드할 결과 파일 경로 (PROFILE_DIR 바로 아래 파일만 허용)"""
+    if not name or "/" in name or "\\" in name or name.startswith("."):
+        return None
+    path = PROFILE_DIR / name
+    return path if path.is_file() else None
@@ -4,6 +4,7 @@ QDrant에서 사용자 인사이트 데이터를 검색하고 프롬프트에 
 """
 
 import os
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 import json
@@ -11,14 +12,24 @@ from datetime import datetime, timedelta
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_utils.data_analyzer import DataAnalyzer
 
+from supervisor_modules.utils.lazy import lazy_resource
 from supervisor_modules.utils.logger_setup import get_logger
 import psycopg2
 
 # 로거 설정
 logger = get_logger(__name__)
-data_analyzer = DataAnalyzer()
+
+
+@lazy_resource("qdrant_helper.data_analyzer", warm=os.getenv("DISABLE_QDRANT", "false").lower() != "true")
+def get_data_analyzer():
+    """
+    질의 임베딩 생성에 쓰는 DataAnalyzer (Qdrant 연결 + 컬렉션 확인)
+    qdrant_utils.data_analyzer는 임포트 시 로그 파일 핸들러를 설정하므로 임포트도 함께 지연
+    """
+    from qdrant_utils.data_analyzer import DataAnalyzer
+
+    return DataAnalyzer()
 
 DB_CONFIG = {
     "dbname": os.getenv("DB_DB"),
@@ -185,9 +196,88 @@ async def search_relevant_conversations(email: str, query: str) -> str:
         logger.error(f"관련 대화 검색 중 오류 발생: {str(e)}")
         return "관련된 과거 대화 정보를 가져오는 중 오류가 발생했습니다."
 
+def _lookup_member_email(member_id: str) -> str:
+    """member 테이블에서 회원 ID로 이메일을 조회합니다. (동기, 스레드에서 호출)"""
+    query = """
+        SELECT email FROM member
+        WHERE id = %s
+    """
+    with psycopg2.connect(**DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(query, (member_id,))
+            rows = cursor.fetchall()
+            column_names = [desc[0] for desc in cursor.description]
+
+            result = [dict(zip(column_names, row)) for row in rows]
+            return result[0]['email']
+
+def _search_user_events(member_email: str, embedding: List[float]) -> Optional[list]:
+    """
+    chat_insights 컬렉션에서 사용자 이벤트를 벡터 검색합니다. (동기, 스레드에서 호출)
+    연결 실패, 컬렉션 없음, 검색 실패 시 None을 반환합니다.
+    """
+    try:
+        client = get_qdrant_client()
+        # 서버 연결 테스트 겸 컬렉션 목록 조회 (한 번의 요청으로 처리)
+        collections = client.get_collections().collections
+        logger.info(f"Qdrant 서버 연결 성공, 사용자 '{member_email}' 검색 시작")
+    except Exception as conn_err:
+        logger.warning(f"Qdrant 서버 연결 실패: {str(conn_err)}. 빈 이벤트 정보 반환.")
+        return None
+
+    # 컬렉션 이름 - 환경 변수에서 가져오기
+    collection_name = os.getenv("QDRANT_COLLECTION", "chat_insights")
+
+    # 컬렉션 존재 여부 확인
+    collection_names = [c.name for c in collections]
+    if collection_name not in collection_names:
+        logger.warning(f"'{collection_name}' 컬렉션이 존재하지 않습니다. 빈 이벤트 정보 반환.")
+        return None
+
+    logger.info(f"컬렉션 '{collection_name}' 확인됨, 데이터 검색 시작")
+
+    try:
+        search_result = client.search(
+            collection_name=collection_name,
+            query_vector=embedding,
+            query_filter=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="user_email",
+                        match=models.MatchValue(value=member_email)
+                    )
+                ]
+            ),
+            score_threshold=0.6,
+            limit=3
+        )
+
+        logger.info(f"{len(search_result)}개의 검색 결과 찾음")
+
+        for i, point in enumerate(search_result[:3]):
+            if hasattr(point, 'id'):
+                logger.info(f"결과 {i+1}: ID={point.id}")
+            if hasattr(point, 'payload'):
+                payload_keys = list(point.payload.keys())
+                logger.info(f"결과 {i+1} 페이로드 키: {payload_keys}")
+        return search_result
+    except Exception as search_err:
+        logger.warning(f"Qdrant 데이터 조회 실패: {str(search_err)}. 빈 이벤트 정보 반환.")
+        return None
+
+async def _generate_embeddings(message: str):
+    # 첫 호출의 DataAnalyzer 생성(Qdrant 접속)은 스레드에서 실행해 이벤트 루프를 막지 않음
+    if get_data_analyzer.initialized():
+        analyzer = get_data_analyzer()
+    else:
+        analyzer = await asyncio.to_thread(get_data_analyzer)
+    return await analyzer.generate_embeddings(message)
+
 async def get_user_events(email: str, message: str) -> str:
     """
     QDrant에서 사용자의 이벤트 정보만 검색합니다.
+    회원 이메일 조회(PostgreSQL)와 질의 임베딩 생성(OpenAI)은 서로 독립적이므로 동시에 실행하고,
+    동기 클라이언트 호출은 모두 스레드로 넘겨 이벤트 루프를 막지 않습니다.
     
     Args:
         email: 사용자 이메일
@@ -200,99 +290,25 @@ async def get_user_events(email: str, message: str) -> str:
         logger.info("Qdrant 기능이 비활성화되어 있습니다.")
         return ""
 
-    query = """
-        SELECT email FROM member
-        WHERE id = %s
-    """
-    params = (email,)
+    email_result, embedding_result = await asyncio.gather(
+        asyncio.to_thread(_lookup_member_email, email),
+        _generate_embeddings(message),
+        return_exceptions=True
+    )
 
-    try:
-        with psycopg2.connect(**DB_CONFIG) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                column_names = [desc[0] for desc in cursor.description]
+    if isinstance(email_result, Exception):
+        return json.dumps({"error": f"Database error: {str(email_result)}"})
+    member_email = email_result
 
-                result = [dict(zip(column_names, row)) for row in rows]
-                member_email = result[0]['email']
-    except Exception as e:
-        return json.dumps({"error": f"Database error: {str(e)}"})
-        
     try:
-        # 연결 시도
-        try:
-            client = get_qdrant_client()
-            
-            # 서버 연결 테스트
-            client.get_collections()
-            logger.info(f"Qdrant 서버 연결 성공, 사용자 '{member_email}' 검색 시작")
-        except Exception as conn_err:
-            logger.warning(f"Qdrant 서버 연결 실패: {str(conn_err)}. 빈 이벤트 정보 반환.")
-            return ""
-        
-        # 최근 7일 이내 데이터 필터링
-        one_week_ago = datetime.now() - timedelta(days=7)
-        timestamp_filter = one_week_ago.timestamp()
-        
-        # 컬렉션 이름 - 환경 변수에서 가져오기
-        collection_name = os.getenv("QDRANT_COLLECTION", "chat_insights")
-        
-        # 컬렉션 존재 여부 확인
-        collections = client.get_collections().collections
-        collection_names = [c.name for c in collections]
-        
-        if collection_name not in collection_names:
-            logger.warning(f"'{collection_name}' 컬렉션이 존재하지 않습니다. 빈 이벤트 정보 반환.")
+        if isinstance(embedding_result, Exception):
+            logger.warning(f"임베딩 생성 실패: {str(embedding_result)}. 빈 이벤트 정보 반환.")
             return ""
-        
-        logger.info(f"컬렉션 '{collection_name}' 확인됨, 데이터 검색 시작")
-        
-        # 사용자 데이터 검색 - 간소화된 필터로 먼저 시도 (타임스탬프 필터 제외)
-        try:
-            # search_result = client.scroll(
-            #     collection_name=collection_name,
-            #     scroll_filter=models.Filter(
-            #         must=[
-            #             models.FieldCondition(
-            #                 key="user_email",
-            #                 match=models.MatchValue(value=member_email)
-            #             )
-            #         ]
-            #     ),
-            #     limit=10  # 더 많은 결과 가져오기
-            # )[0]
 
-            embedding = await data_analyzer.generate_embeddings(message)
-
-            search_result = client.search(
-                collection_name=collection_name,
-                query_vector=embedding,
-                query_filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="user_email",
-                            match=models.MatchValue(value=member_email)
-                        )
-                    ]
-                ),
-                score_threshold=0.6,
-                limit=3
-            )
-            
-            logger.info(f"{len(search_result)}개의 검색 결과 찾음")
-            
-            if search_result:
-                print("search_result: ", search_result)
-                for i, point in enumerate(search_result[:3]):
-                    if hasattr(point, 'id'):
-                        logger.info(f"결과 {i+1}: ID={point.id}")
-                    if hasattr(point, 'payload'):
-                        payload_keys = list(point.payload.keys())
-                        logger.info(f"결과 {i+1} 페이로드 키: {payload_keys}")
-        except Exception as search_err:
-            logger.warning(f"Qdrant 데이터 조회 실패: {str(search_err)}. 빈 이벤트 정보 반환.")
+        search_result = await asyncio.to_thread(_search_user_events, member_email, embedding_result)
+        if search_result is None:
             return ""
-        
+
         if not search_result:
             print("search_result: 없음")
             logger.info(f"사용자 {email}에 대한 이벤트 정보가 없습니다.")
@@ -0,0 +1,65 @@
+"""
+redis_client.py
+- ChatHistoryManager와 같은 Redis(REDIS_HOST/PORT/PASSWORD/DB)를 사용하는 공유 클라이언트
+- 캐시처럼 "없어도 동작해야 하는" 기능에서 사용하므로 연결 실패 시 예외 대신 None을 반환하고,
+  일정 시간(REDIS_RETRY_INTERVAL) 동안은 재연결을 시도하지 않습니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_RETRY_INTERVAL = float(os.getenv("REDIS_RETRY_INTERVAL", "30"))
+
+_lock = threading.Lock()
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """공유 Redis 클라이언트를 반환합니다. 연결할 수 없으면 None."""
+    global _client, _unavailable_until
+    if _client is not None:
+        return _client
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    with _lock:
+        if _client is not None:
+            return _client
+        try:
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                password=os.getenv("REDIS_PASSWORD") or None,
+                db=int(os.getenv("REDIS_DB", "0")),
+                decode_responses=True,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+            )
+            client.ping()
+            _client = client
+            logger.info("공유 Redis 클라이언트 연결 성공")
+        except Exception as e:
+            _unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL
+            logger.warning(f"공유 Redis 연결 실패 ({REDIS_RETRY_INTERVAL:.0f}초 후 재시도): {e}")
+            return None
+    return _client
+
+
+def reset_redis() -> None:
+    """연결을 버립니다. (fork 이후 자식 프로세스에서 호출)"""
+    global _client, _unavailable_until
+    with _lock:
+        _client = None
+        _unavailable_until = 0.0
+
+
+__all__ = ["get_redis", "reset_redis"]
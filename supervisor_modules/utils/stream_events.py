@@ -0,0 +1,184 @@
+"""
+스트리밍 이벤트 모듈
+/chat/stream 요청 처리 중 발생하는 단계 이벤트(문맥 생성, 카테고리 선택, 도구 실행 단계)와
+최종 에이전트 LLM 토큰을 요청 단위 큐로 전달합니다.
+
+현재 요청의 스트림은 ContextVar로 전파되므로 Supervisor → 에이전트 → LangGraph 노드 → 도구까지
+인자를 추가하지 않고도 이벤트를 보낼 수 있습니다. 스트림이 없는 일반 /chat 요청에서는
+모든 emit 호출이 아무 동작도 하지 않습니다.
+"""
+
+import asyncio
+import json
+import logging
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+try:
+    # 핸들러가 등록되어 있으면 ChatModel이 스트리밍 API를 사용하도록 하는 내부 믹스인
+    from langchain_core.tracers._streaming import _StreamingCallbackHandler
+except ImportError:  # pragma: no cover - langchain_core 버전에 따라 없을 수 있음
+    class _StreamingCallbackHandler:  # type: ignore[no-redef]
+        pass
+
+logger = logging.getLogger(__name__)
+
+# 최종 응답을 생성하는 LLM 호출에 붙이는 태그 (이 태그가 붙은 호출의 토큰만 클라이언트로 전달)
+FINAL_ANSWER_TAG = "final_answer"
+
+_current_stream: ContextVar[Optional["ChatEventStream"]] = ContextVar("chat_event_stream", default=None)
+_token_handler_var: ContextVar[Optional["FinalAnswerTokenHandler"]] = ContextVar("final_answer_token_handler", default=None)
+
+# 스트림이 활성화된 동안 모든 LangChain 실행에 토큰 핸들러를 자동으로 붙임
+register_configure_hook(_token_handler_var, inheritable=True)
+
+
+class ChatEventStream:
+    """
+    요청 하나에 대한 이벤트 큐
+    이벤트 루프 밖(스레드 풀에서 실행되는 동기 노드/도구)에서도 안전하게 emit 할 수 있습니다.
+
+    이벤트 종류:
+    - context_built / category_selected / agent_started / agent_finished : Supervisor 단계 이벤트
+    - tool_step : 에이전트 내부 도구 실행 단계
+    - answer_start / token : 최종 응답 LLM 토큰 (answer_start 수신 시 이전 토큰은 버림)
+    - result / error : 마지막 트레일러 (ChatResponse 메타데이터)
+    """
+
+    _CLOSE = object()
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+
+    def emit(self, event: str, data: Optional[Dict[str, Any]] = None) -> None:
+        if self._closed:
+            return
+        item = (event, data or {})
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._loop:
+            self._queue.put_nowait(item)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, self._CLOSE)
+
+    async def events(self) -> AsyncIterator[tuple]:
+        while True:
+            item = await self._queue.get()
+            if item is self._CLOSE:
+                break
+            yield item
+
+
+class FinalAnswerTokenHandler(BaseCallbackHandler, _StreamingCallbackHandler):
+    """
+    FINAL_ANSWER_TAG가 붙은 ChatModel 실행의 토큰만 스트림으로 전달하는 콜백 핸들러
+    """
+
+    def __init__(self, stream: ChatEventStream):
+        self.stream = stream
+        self._final_runs: set = set()
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        tags: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if tags and FINAL_ANSWER_TAG in tags:
+            self._final_runs.add(run_id)
+            # 재시도(judge 실패 등)로 최종 응답이 다시 생성될 수 있으므로 클라이언트가 이전 토큰을 지우도록 알림
+            self.stream.emit("answer_start", {})
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if token and run_id in self._final_runs:
+            self.stream.emit("token", {"text": token})
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._final_runs.discard(run_id)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._final_runs.discard(run_id)
+
+    # _StreamingCallbackHandler 인터페이스 (출력은 그대로 통과)
+    def tap_output_aiter(self, run_id, output):
+        return output
+
+    def tap_output_iter(self, run_id, output):
+        return output
+
+
+def open_stream(request_id: str) -> ChatEventStream:
+    """
+    현재 컨텍스트에 스트림을 연결합니다.
+    이후 생성되는 Task/스레드 작업은 컨텍스트를 복사하므로 같은 스트림으로 이벤트를 보냅니다.
+    """
+    stream = ChatEventStream(request_id)
+    _current_stream.set(stream)
+    _token_handler_var.set(FinalAnswerTokenHandler(stream))
+    return stream
+
+
+def emit_event(event: str, **data: Any) -> None:
+    """활성화된 스트림이 있으면 이벤트를 보냅니다. 없으면 아무 동작도 하지 않습니다."""
+    stream = _current_stream.get()
+    if stream is None:
+        return
+    try:
+        stream.emit(event, data)
+    except Exception as e:
+        logger.debug(f"스트림 이벤트 전송 실패 ({event}): {e}")
+
+
+def mute_token_stream() -> None:
+    """
+    현재 컨텍스트(Task)에서만 최종 응답 토큰 전달을 끕니다. 단계 이벤트는 계속 전달됩니다.
+    여러 에이전트를 동시에 실행할 때 토큰이 섞이지 않도록 각 에이전트 Task에서 호출합니다.
+    """
+    _token_handler_var.set(None)
+
+
+def is_streaming() -> bool:
+    return _current_stream.get() is not None
+
+
+def final_answer_config() -> Dict[str, Any]:
+    """최종 응답 LLM 호출에 넘기는 RunnableConfig (토큰 스트리밍 대상 표시)"""
+    return {"tags": [FINAL_ANSWER_TAG]}
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 형식의 문자열로 변환합니다."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+__all__ = [
+    "FINAL_ANSWER_TAG",
+    "ChatEventStream",
+    "FinalAnswerTokenHandler",
+    "open_stream",
+    "emit_event",
+    "mute_token_stream",
+    "is_streaming",
+    "final_answer_config",
+    "format_sse",
+]
@@ -0,0 +1,308 @@
+"""
+tracing.py
+- 요청 하나에 trace id 하나를 붙여 api_server → Supervisor.process → 에이전트 process → LangGraph 노드 → 도구 / LLM 호출,
+  그리고 metrics.track_stage 단계(대화 내역 조회, 분류, DB/ES/Qdrant/Redis/HTTP 호출)를 중첩된 span으로 기록합니다.
+- trace id / 현재 span은 ContextVar로 전파되므로 하위 Task, run_blocking 스레드까지 인자 없이 이어집니다.
+- 노드 / 도구 / LLM span은 LangChain 콜백(configure hook)으로 자동 기록하며, 부모는 LangChain run 계층을 따릅니다.
+- 끝난 trace는 TRACE_EXPORT_PATH(JSON Lines, span 한 줄씩)에 추가합니다. 외부 수집기 없이 동작하며
+  `python trace_viewer.py` 로 워터폴을 볼 수 있습니다.
+
+TRACING_ENABLED=false(기본)이면 span은 만들지 않고 trace id 전파(로그 상관관계)만 합니다.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACE_EXPORT_PATH = Path(os.getenv("TRACE_EXPORT_PATH", "traces/spans.jsonl"))
+# 파일이 이 크기를 넘으면 .1 로 옮기고 새로 씀
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
+# span 속성 문자열 최대 길이
+TRACE_ATTR_MAX_CHARS = int(os.getenv("TRACE_ATTR_MAX_CHARS", "200"))
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def _clip(value: Any) -> Any:
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    text = str(value)
+    return text if len(text) <= TRACE_ATTR_MAX_CHARS else text[:TRACE_ATTR_MAX_CHARS] + "…"
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_time", "_started", "duration",
+                 "attributes", "status", "error")
+
+    def __init__(self, trace: "Trace", name: str, kind: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = _new_id()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.name = name
+        self.kind = kind
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes = {k: _clip(v) for k, v in attributes.items() if v is not None}
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = _clip(value)
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.status = "error"
+            self.error = _clip(f"{type(error).__name__}: {error}")
+        self.trace.finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start_time, 6),
+            "duration": round(self.duration or 0.0, 6),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self._lock = threading.Lock()
+        self._finished: List[Span] = []
+        self.exported = False
+
+    def finish(self, span: Span) -> None:
+        with self._lock:
+            if not self.exported:
+                self._finished.append(span)
+                return
+        # 루트 span이 끝난 뒤에 끝난 span (백그라운드 작업 등)은 바로 내보냄
+        _export([span])
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._finished, self.exported = self._finished, [], True
+        _export(spans)
+
+
+_export_lock = threading.Lock()
+
+
+def _export(spans: List[Span]) -> None:
+    if not spans:
+        return
+    lines = "".join(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans)
+    try:
+        with _export_lock:
+            TRACE_EXPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+            if TRACE_EXPORT_PATH.exists() and TRACE_EXPORT_PATH.stat().st_size > TRACE_MAX_BYTES:
+                TRACE_EXPORT_PATH.replace(TRACE_EXPORT_PATH.with_name(TRACE_EXPORT_PATH.name + ".1"))
+            with open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+                f.write(lines)
+    except OSError as e:
+        logger.warning(f"trace 기록 실패: {e}")
+
+
+_trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_trace_var: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_span_var: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    return _trace_id_var.get()
+
+
+def current_span() -> Optional[Span]:
+    return _span_var.get()
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Optional[Span]]:
+    """현재 span의 자식 span을 엽니다. 진행 중인 trace가 없거나 TRACING_ENABLED=false면 None."""
+    trace = _trace_var.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(trace, name, kind, _span_var.get(), attributes)
+    token = _span_var.set(current)
+    error: Optional[BaseException] = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _span_var.reset(token)
+        current.end(error)
+
+
+@contextmanager
+def start_trace(trace_id: Optional[str] = None, name: str = "request", **attributes: Any) -> Iterator[str]:
+    """
+    요청 단위 trace를 시작하고 trace id를 돌려줍니다. (이미 trace 안이면 기존 id를 쓰고 자식 span만 엶)
+    블록이 끝나면 모인 span을 내보냅니다.
+    """
+    existing = _trace_id_var.get()
+    if existing is not None:
+        with span(name, **attributes):
+            yield existing
+        return
+
+    trace_id = trace_id or str(uuid.uuid4())
+    id_token = _trace_id_var.set(trace_id)
+    trace = Trace(trace_id) if TRACING_ENABLED else None
+    trace_token = _trace_var.set(trace)
+    try:
+        with span(name, kind="server", **attributes):
+            yield trace_id
+    finally:
+        _trace_var.reset(trace_token)
+        _trace_id_var.reset(id_token)
+        if trace is not None:
+            trace.flush()
+
+
+def traced(name: Optional[str] = None, kind: str = "internal") -> Callable:
+    """함수(동기/비동기) 실행을 span으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, kind=kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, kind=kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """LangGraph 노드(node.*), 도구(tool.*), LLM 호출(llm.*)을 span으로 기록하는 콜백 핸들러"""
+
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans: Dict[UUID, Span] = {}
+        # 기록하지 않는 run(그래프 자체, 노드 내부 Runnable 등)은 가장 가까운 기록된 조상 span을 부모로 넘겨줌
+        self._parents: Dict[UUID, Optional[Span]] = {}
+
+    def _parent(self, parent_run_id: Optional[UUID]) -> Optional[Span]:
+        if parent_run_id is not None:
+            with self._lock:
+                if parent_run_id in self._spans:
+                    return self._spans[parent_run_id]
+                if parent_run_id in self._parents:
+                    return self._parents[parent_run_id]
+        return _span_var.get()
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: Optional[str], kind: str,
+               **attributes: Any) -> None:
+        trace = _trace_var.get()
+        if trace is None:
+            return
+        parent = self._parent(parent_run_id)
+        with self._lock:
+            if name is None:
+                self._parents[run_id] = parent
+            else:
+                self._spans[run_id] = Span(trace, name, kind, parent, attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes: Any) -> None:
+        with self._lock:
+            self._parents.pop(run_id, None)
+            current = self._spans.pop(run_id, None)
+        if current is not None:
+            for key, value in attributes.items():
+                current.set_attribute(key, value)
+            current.end(error)
+
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 노드 내부 Runnable도 같은 metadata를 물려받으므로 노드 자체 실행만 span으로 기록
+        if node and kwargs.get("name") == node and not node.startswith("__"):
+            self._start(run_id, parent_run_id, f"node.{node}", "node", step=(metadata or {}).get("langgraph_step"))
+        else:
+            self._start(run_id, parent_run_id, None, "chain")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID,
+                      parent_run_id: Optional[UUID] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "unknown")
+        self._start(run_id, parent_run_id, f"tool.{name}", "tool", input=input_str)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def _llm_start(self, run_id: UUID, parent_run_id: Optional[UUID], metadata: Optional[Dict[str, Any]]) -> None:
+        model = (metadata or {}).get("ls_model_name", "unknown")
+        self._start(run_id, parent_run_id, f"llm.{model}", "llm", model=model)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                            **kwargs: Any) -> None:
+        self._llm_start(run_id, parent_run_id, metadata)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                     **kwargs: Any) -> None:
+        self._llm_start(run_id, parent_run_id, metadata)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self._end(run_id, prompt_tokens=usage.get("prompt_tokens"), completion_tokens=usage.get("completion_tokens"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+
+# 모든 LangChain 실행에 trace 핸들러를 자동으로 붙임 (trace가 없는 실행에서는 아무것도 기록하지 않음)
+_tracing_handler_var: ContextVar[Optional[TracingCallbackHandler]] = ContextVar(
+    "tracing_callback_handler",
+    default=TracingCallbackHandler() if TRACING_ENABLED else None,
+)
+register_configure_hook(_tracing_handler_var, inheritable=True)
@@ -0,0 +1,207 @@
+"""
+warmup.py
+- 워커가 첫 요청을 받기 전에 준비를 끝내 첫 요청 지연(모델 로딩, 워크플로우 컴파일, 연결 수립)을 없앱니다.
+- 프로세스 준비 warmup_process(): 워크플로우 컴파일, 임베딩 모델 로딩 + 더미 인코딩 (lazy_resource fork_safe 객체)
+  네트워크 연결은 만들지 않으므로 gunicorn preload(gunicorn.conf.py)면 마스터에서 한 번 실행하고,
+  워커는 준비된 마스터에서 fork되어 모델 메모리를 copy-on-write로 공유합니다.
+  LLM httpx 클라이언트는 마스터에서 만든 ChatOpenAI들이 잡고 있으므로 fork 이후에도 바꾸지 않습니다.
+  대신 마스터가 fork 전까지 연결을 하나도 열지 않았는지 확인합니다. (assert_no_open_connections)
+- 워커 준비 warmup_worker(): fork 이후 워커마다 Redis / LLM HTTP / ES / Qdrant 등 연결을 미리 만듭니다.
+  preload 없이 실행했으면(uvicorn 단독 등) 프로세스 준비도 워커에서 함께 합니다.
+- 두 단계가 끝나야 /ready가 200을 반환합니다. 준비가 WARMUP_TIMEOUT 안에 끝나지 않거나 일부가 실패해도
+  준비 완료로 보고(실패한 객체는 첫 사용 때 다시 생성), 결과는 /ready 응답에 남깁니다.
+"""
+
+import asyncio
+import contextlib
+import importlib
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from chat_history_manager import get_chat_history_manager
+from supervisor_modules.utils.lazy import reset_lazy_resources, warm_lazy_resources
+from supervisor_modules.utils.llm_registry import get_async_http_client, open_connection_count
+from supervisor_modules.utils.redis_client import get_redis, reset_redis
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "120"))
+# LLM API에 GET /models 요청을 보내 TLS 연결을 미리 맺어 둠
+WARMUP_LLM_CONNECTIONS = os.getenv("WARMUP_LLM_CONNECTIONS", "true").lower() == "true"
+
+# 프로세스 단위로 캐시되는 컴파일된 워크플로우 (workflow_registry)
+WORKFLOWS = (
+    ("agents.exercise.workflows.workout_workflow", "get_workout_workflow"),
+    ("workout_log.workout_log_workflow", "get_workout_log_workflow"),
+    ("pt_log.pt_log_workflow", "get_pt_log_workflow"),
+    ("report.report_workflow", "get_report_workflow"),
+)
+
+_process_report: Optional[Dict[str, Any]] = None
+_worker_report: Optional[Dict[str, Any]] = None
+_worker_task: Optional[asyncio.Task] = None
+_preloaded = False
+
+
+def _step(report: Dict[str, Any], name: str, func: Callable[[], Any]) -> None:
+    started = time.perf_counter()
+    try:
+        func()
+        report[name] = round(time.perf_counter() - started, 3)
+    except Exception as e:
+        logger.warning(f"[warmup] {name} 실패: {e}")
+        report[name] = f"error: {e}"
+
+
+async def _astep(report: Dict[str, Any], name: str, func: Callable[[], Any]) -> None:
+    started = time.perf_counter()
+    try:
+        result = func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        report[name] = round(time.perf_counter() - started, 3) if result is not False else "unavailable"
+    except Exception as e:
+        logger.warning(f"[warmup] {name} 실패: {e}")
+        report[name] = f"error: {e}"
+
+
+@contextlib.contextmanager
+def _single_threaded_torch() -> Iterator[None]:
+    """
+    fork 전에 torch가 OpenMP 스레드 풀을 띄우면 자식 프로세스의 첫 연산이 멈출 수 있으므로
+    마스터의 더미 인코딩은 스레드 1개로 실행하고 원래 값으로 되돌립니다.
+    """
+    try:
+        import torch
+    except ImportError:
+        yield
+        return
+    threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(threads)
+
+
+def warmup_process() -> Dict[str, Any]:
+    """워크플로우 컴파일 + fork_safe 객체(임베딩 모델) 준비. 프로세스당 한 번만 실행합니다."""
+    global _process_report
+    if _process_report is not None:
+        return _process_report
+    # 마스터에서 토크나이저 병렬 처리를 쓰면 fork 이후 교착을 피하려고 경고와 함께 꺼지므로 처음부터 끔
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    started = time.perf_counter()
+    report: Dict[str, Any] = {}
+    for module, func in WORKFLOWS:
+        _step(report, f"workflow:{module}", lambda: getattr(importlib.import_module(module), func)())
+    with _single_threaded_torch():
+        report.update(warm_lazy_resources(fork_safe=True))
+    report["total"] = round(time.perf_counter() - started, 3)
+    _process_report = report
+    logger.info(f"[warmup] 프로세스 준비 완료 ({report['total']:.2f}s): {report}")
+    return report
+
+
+def mark_preloaded() -> None:
+    """gunicorn preload 마스터에서 warmup_process 뒤에 호출 (워커에서 프로세스 준비를 다시 하지 않음)"""
+    global _preloaded
+    _preloaded = True
+
+
+def assert_no_open_connections() -> None:
+    """
+    gunicorn preload 마스터에서 fork 직전에 호출합니다.
+    LLM 공유 httpx 풀에 연결이 열려 있으면 워커들이 같은 소켓을 나눠 쓰게 되므로 시작을 중단합니다.
+    """
+    count = open_connection_count()
+    if count:
+        raise RuntimeError(
+            f"fork 전 마스터에 LLM HTTP 연결 {count}개가 열려 있음 (임포트/프로세스 준비 중 LLM 호출 여부 확인)"
+        )
+
+
+def after_fork() -> None:
+    """
+    gunicorn post_fork 훅에서 호출합니다.
+    마스터에서 물려받은 Redis / 지연 생성 연결만 버리고, 모델과 컴파일된 워크플로우, LLM httpx 클라이언트(연결 없음)는 그대로 씁니다.
+    워커 준비(warmup_worker)가 채우는 LLM 풀이 요청 경로의 ChatOpenAI가 쓰는 풀과 같아야 하므로 LLM 클라이언트는 바꾸지 않습니다.
+    """
+    global _worker_report, _worker_task
+    reset_redis()
+    get_chat_history_manager().reset()
+    reset_lazy_resources()
+    _worker_report = None
+    _worker_task = None
+
+
+async def _prime_llm_connection() -> None:
+    base_url = (os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1").rstrip("/")
+    response = await get_async_http_client().get(
+        f"{base_url}/models",
+        headers={"Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}"},
+        timeout=5,
+    )
+    await response.aclose()
+
+
+async def warmup_worker() -> Dict[str, Any]:
+    """워커(이벤트 루프) 단위 준비. 연결 풀을 미리 채웁니다."""
+    global _worker_report
+    started = time.perf_counter()
+    report: Dict[str, Any] = {}
+    if _process_report is None:
+        await asyncio.to_thread(warmup_process)
+    await _astep(report, "redis:chat_history", get_chat_history_manager().ping)
+    await _astep(report, "redis:shared", lambda: asyncio.to_thread(lambda: get_redis() is not None))
+    if WARMUP_LLM_CONNECTIONS:
+        await _astep(report, "llm:http", _prime_llm_connection)
+    report.update(await asyncio.to_thread(warm_lazy_resources, False))
+    report["total"] = round(time.perf_counter() - started, 3)
+    _worker_report = report
+    logger.info(f"[warmup] 워커 준비 완료 ({report['total']:.2f}s, pid {os.getpid()}): {report}")
+    return report
+
+
+async def _run_worker_warmup() -> None:
+    global _worker_report
+    try:
+        await asyncio.wait_for(warmup_worker(), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"[warmup] 워커 준비가 {WARMUP_TIMEOUT:.0f}s 안에 끝나지 않아 준비 완료로 처리 (남은 객체는 첫 사용 때 생성)")
+        _worker_report = {"timeout": WARMUP_TIMEOUT}
+    except Exception as e:
+        logger.error(f"[warmup] 워커 준비 실패: {e}")
+        _worker_report = {"error": str(e)}
+
+
+def start_worker_warmup() -> None:
+    """FastAPI startup에서 호출합니다. 준비는 백그라운드로 진행되고 끝나면 /ready가 200이 됩니다."""
+    global _worker_task
+    if not WARMUP_ENABLED or _worker_task is not None:
+        return
+    _worker_task = asyncio.get_running_loop().create_task(_run_worker_warmup())
+
+
+def warmup_status() -> Dict[str, Any]:
+    return {
+        "ready": not WARMUP_ENABLED or _worker_report is not None,
+        "pid": os.getpid(),
+        "preloaded": _preloaded,
+        "process": _process_report,
+        "worker": _worker_report,
+    }
+
+
+__all__ = [
+    "after_fork",
+    "assert_no_open_connections",
+    "mark_preloaded",
+    "start_worker_warmup",
+    "warmup_process",
+    "warmup_status",
+    "warmup_worker",
+]
@@ -0,0 +1,73 @@
+"""
+workflow_registry.py
+- 컴파일된 LangGraph 워크플로우, AgentExecutor 등 요청마다 다시 만들 필요가 없는 객체를 프로세스 단위로 캐시
+- 체크포인터 없이 컴파일된 그래프와 메모리 없는 AgentExecutor는 상태를 갖지 않으므로
+  여러 요청에서 동시에 invoke/ainvoke 해도 안전합니다.
+- 최초 생성은 잠금으로 보호하여 동시에 들어온 요청이 같은 객체를 중복 생성하지 않도록 합니다.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_registry: Dict[Hashable, Any] = {}
+_build_seconds: Dict[Hashable, float] = {}
+_hits: Dict[Hashable, int] = {}
+_lock = threading.Lock()
+
+
+def get_or_create(key: Hashable, factory: Callable[[], T]) -> T:
+    """key에 해당하는 객체를 반환하고, 없으면 factory로 한 번만 생성합니다."""
+    try:
+        value = _registry[key]
+        _hits[key] = _hits.get(key, 0) + 1
+        return value
+    except KeyError:
+        pass
+
+    with _lock:
+        if key in _registry:
+            return _registry[key]
+        started = time.perf_counter()
+        value = factory()
+        _build_seconds[key] = time.perf_counter() - started
+        _registry[key] = value
+        logger.info(f"레지스트리 등록: {key} (생성 {_build_seconds[key] * 1000:.1f}ms)")
+        return value
+
+
+def get_workflow(name: str, factory: Callable[[], T]) -> T:
+    """컴파일된 워크플로우를 반환합니다. (프로세스당 1회 컴파일)"""
+    return get_or_create(("workflow", name), factory)
+
+
+def get_agent_executor(name: str, llm: Any, factory: Callable[[], T]) -> T:
+    """
+    노드에서 사용하는 AgentExecutor를 llm 인스턴스별로 캐시합니다.
+    등록된 executor가 llm을 참조하므로 llm 객체가 살아 있는 동안 id가 재사용되지 않습니다.
+    """
+    return get_or_create(("agent_executor", name, id(llm)), factory)
+
+
+def registry_stats() -> Dict[str, Any]:
+    """등록된 객체별 최초 생성 시간(ms)과 재사용 횟수"""
+    return {
+        str(key): {"build_ms": round(_build_seconds.get(key, 0) * 1000, 2), "hits": _hits.get(key, 0)}
+        for key in list(_registry)
+    }
+
+
+def clear_registry() -> None:
+    """캐시를 비웁니다. (벤치마크/재설정 용도)"""
+    with _lock:
+        _registry.clear()
+        _build_seconds.clear()
+        _hits.clear()
+
+
+__all__ = ["get_or_create", "get_workflow", "get_agent_executor", "registry_stats", "clear_registry"]
@@ -0,0 +1,124 @@
+"""
+trace_viewer.py - 로컬 trace 파일(TRACING_ENABLED=true 일 때 TRACE_EXPORT_PATH에 쌓인 JSON Lines)을 워터폴로 출력
+
+실행:
+    python trace_viewer.py                       # 최근 trace 목록
+    python trace_viewer.py <trace_id 앞부분>      # 해당 trace 워터폴 (X-Trace-Id 응답 헤더 / 로그의 [request_id])
+    python trace_viewer.py --last 1 --min-ms 5   # 가장 최근 trace, 5ms 미만 span 생략
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, List
+
+DEFAULT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces/spans.jsonl")
+
+
+def load_spans(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for candidate in (path + ".1", path):
+        if not os.path.exists(candidate):
+            continue
+        with open(candidate, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    span = json.loads(line)
+                except ValueError:
+                    continue
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def trace_bounds(spans: List[Dict[str, Any]]):
+    start = min(s["start"] for s in spans)
+    end = max(s["start"] + s["duration"] for s in spans)
+    return start, end
+
+
+def list_traces(traces: Dict[str, List[Dict[str, Any]]], last: int) -> None:
+    rows = []
+    for trace_id, spans in traces.items():
+        start, end = trace_bounds(spans)
+        ids = {s["span_id"] for s in spans}
+        roots = [s for s in spans if s["parent_id"] not in ids]
+        root = min(roots, key=lambda s: s["start"]) if roots else spans[0]
+        errors = sum(1 for s in spans if s["status"] == "error")
+        rows.append((start, trace_id, root["name"], (end - start) * 1000, len(spans), errors))
+    rows.sort(reverse=True)
+    print(f"{'trace_id':38} {'root':28} {'duration_ms':>12} {'spans':>6} {'errors':>6}")
+    for start, trace_id, name, duration, count, errors in rows[:last]:
+        print(f"{trace_id:38} {name[:28]:28} {duration:>12.1f} {count:>6} {errors:>6}")
+
+
+def render_waterfall(spans: List[Dict[str, Any]], width: int, min_ms: float) -> str:
+    start, end = trace_bounds(spans)
+    total = max(end - start, 1e-9)
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"] if span["parent_id"] in ids else None].append(span)
+    for items in children.values():
+        items.sort(key=lambda s: s["start"])
+
+    lines = [
+        f"trace {spans[0]['trace_id']}  전체 {total * 1000:.1f}ms, span {len(spans)}개",
+        f"{'offset_ms':>10} {'dur_ms':>9}  {'timeline':{width}}  name",
+    ]
+
+    def visit(span: Dict[str, Any], depth: int) -> None:
+        duration_ms = span["duration"] * 1000
+        if duration_ms >= min_ms or depth == 0:
+            offset = span["start"] - start
+            left = int(offset / total * width)
+            bar = max(1, int(span["duration"] / total * width))
+            timeline = (" " * left + "█" * bar)[:width].ljust(width)
+            status = " ✗ " + span["error"] if span["status"] == "error" and span.get("error") else ""
+            attrs = span.get("attributes") or {}
+            extra = " ".join(f"{k}={v}" for k, v in attrs.items() if k != "input")
+            lines.append(
+                f"{offset * 1000:>10.1f} {duration_ms:>9.1f}  {timeline}  {'  ' * depth}{span['name']}"
+                f"{' [' + extra + ']' if extra else ''}{status}"
+            )
+        for child in children.get(span["span_id"], []):
+            visit(child, depth + 1)
+
+    for root in children[None]:
+        visit(root, 0)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 trace(JSON Lines) 워터폴 출력")
+    parser.add_argument("trace_id", nargs="?", help="trace id (앞부분만 입력 가능)")
+    parser.add_argument("--file", default=DEFAULT_PATH)
+    parser.add_argument("--last", type=int, default=20, help="목록 개수 (trace_id 없이 --last 1 이면 최근 trace 워터폴)")
+    parser.add_argument("--width", type=int, default=50, help="타임라인 막대 폭")
+    parser.add_argument("--min-ms", type=float, default=0.0, help="이보다 짧은 span은 생략")
+    args = parser.parse_args()
+
+    traces = load_spans(args.file)
+    if not traces:
+        sys.exit(f"trace가 없습니다: {args.file} (TRACING_ENABLED=true 로 서버 실행 필요)")
+
+    if args.trace_id is None and args.last != 1:
+        list_traces(traces, args.last)
+        return
+
+    if args.trace_id is None:
+        trace_id = max(traces, key=lambda t: trace_bounds(traces[t])[0])
+    else:
+        matches = [t for t in traces if t.startswith(args.trace_id)]
+        if len(matches) != 1:
+            sys.exit(f"trace id '{args.trace_id}'에 해당하는 trace가 {len(matches)}개입니다.")
+        trace_id = matches[0]
+    print(render_waterfall(traces[trace_id], args.width, args.min_ms))
+
+
+if __name__ == "__main__":
+    main()
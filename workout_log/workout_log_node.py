@@ -7,6 +7,7 @@ from pt_log.pt_log_prompt import PT_LOG_PROMPT_WITH_HISTORY
 from workout_log.workout_log_tool import add_workout_log, modify_workout_log, is_workout_log_exist
 from workout_log.workout_log_model import workoutLogState
 from agents.exercise.tools.exercise_member_tools import search_exercise_by_name
+from supervisor_modules.utils.workflow_registry import get_agent_executor
 import json
 
 tools = [
@@ -54,6 +55,30 @@ tools = [
     )
 ]
 
+# 프롬프트는 불변 객체이므로 모듈 로드 시 한 번만 생성
+RECONSTRUCT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", PT_LOG_PROMPT_WITH_HISTORY),
+    ("user", "{message}"),
+    ("user", "{chat_history}"),
+])
+
+WORKOUT_LOG_AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", WORKOUT_LOG_PROMPT),
+    ("user", "{reconstructed_message}"),
+    ("user", "{memberId}"),
+    ("user", "{date}"),
+    MessagesPlaceholder(variable_name="agent_scratchpad")
+])
+
+def build_workout_log_executor(llm: ChatOpenAI) -> AgentExecutor:
+    agent = create_tool_calling_agent(llm, tools, WORKOUT_LOG_AGENT_PROMPT)
+    return AgentExecutor(
+        agent=agent,
+        verbose=True,
+        tools=tools,
+        handle_parse_errors=True,
+    )
+
 def workout_log(state: workoutLogState, llm: ChatOpenAI) -> workoutLogState:
     """개인 운동 기록 노드"""
 
@@ -65,13 +90,7 @@ def workout_log(state: workoutLogState, llm: ChatOpenAI) -> workoutLogState:
     print("chat_history: ", state.chat_history)
 
     if chat_history and len(chat_history) > 0:
-        reconstruct_prompt = ChatPromptTemplate.from_messages([
-            ("system", PT_LOG_PROMPT_WITH_HISTORY),
-            ("user", "{message}"),
-            ("user", "{chat_history}"),
-        ])
-
-        reconstruct_chain = reconstruct_prompt | llm
+        reconstruct_chain = RECONSTRUCT_PROMPT | llm
         reconstructed_message = reconstruct_chain.invoke({
             "chat_history": json.dumps(chat_history, ensure_ascii=False),
             "message": message
@@ -80,22 +99,7 @@ def workout_log(state: workoutLogState, llm: ChatOpenAI) -> workoutLogState:
         reconstructed_message = message
 
     print("reconstructed_message: ", reconstructed_message)
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", WORKOUT_LOG_PROMPT),
-        ("user", "{reconstructed_message}"),
-        ("user", "{memberId}"),
-        ("user", "{date}"),
-        MessagesPlaceholder(variable_name="agent_scratchpad")
-    ])
-
-    agent = create_tool_calling_agent(llm, tools, prompt)
-
-    agent_executor = AgentExecutor(
-        agent=agent,
-        verbose=True,
-        tools=tools,
-        handle_parse_errors=True,
-    )
+    agent_executor = get_agent_executor("workout_log", llm, lambda: build_workout_log_executor(llm))
 
     response = agent_executor.invoke({
         "reconstructed_message": reconstructed_message,
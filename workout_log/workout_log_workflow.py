@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, END, START
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from supervisor_modules.utils.workflow_registry import get_workflow
+from supervisor_modules.utils.llm_registry import get_llm
 from workout_log.workout_log_node import workout_log
 from workout_log.workout_log_model import workoutLogState
 
@@ -8,10 +9,7 @@ load_dotenv()
 
 def create_workout_log_workflow():
     """개인 운동 기록 워크플로우 생성"""
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.7
-    )
+    llm = get_llm("workflow")
 
     workflow = StateGraph(workoutLogState)
 
@@ -25,6 +23,10 @@ def create_workout_log_workflow():
     print("result: ", result)
     return result
 
+def get_workout_log_workflow():
+    """컴파일된 워크플로우를 프로세스 단위로 재사용 (요청마다 다시 컴파일하지 않음)"""
+    return get_workflow("workout_log", create_workout_log_workflow)
+
 if __name__ == "__main__":
     workflow = create_workout_log_workflow()
     workflow.invoke({"message": "벤치프레스 100kg 10회 5세트하는데 무릎이 아팠어", "memberId": 4, "date": "2025-04-16"})